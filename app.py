@@ -3,8 +3,13 @@ import chess
 import chess.svg
 from io import BytesIO
 import base64
+import time
 from chess_logic.move_eval import evaluate_move
 from chess_logic.board_utils import get_board_from_fen, apply_move_to_board
+from chess_logic.search_context import SearchContext
+from chess_logic.move_jobs import MoveJobs
+from chess_logic.eval_cache import EvalCache
+from chess_logic.opening_book import open_book
 from quantum.grover_move_selector import quantum_move_selector
 
 st.set_page_config(
@@ -151,6 +156,30 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_eval_cache():
+    """
+    On-disk cache of move selections, shared by all sessions and kept
+    across restarts (path from QUANTUM_CHESS_CACHE).
+    """
+    return EvalCache()
+
+@st.cache_resource
+def get_opening_book():
+    """
+    Memory-mapped opening book (data/opening_book.bin or QUANTUM_CHESS_BOOK),
+    or None when there is no book file.
+    """
+    return open_book()
+
+@st.cache_resource
+def get_move_jobs():
+    """
+    Background executor for AI searches, shared by all sessions so a
+    search survives reruns and finished positions are reused.
+    """
+    return MoveJobs(max_workers=2, cache=get_eval_cache(), book=get_opening_book())
+
 # Initialize session state
 if 'mode' not in st.session_state:
     st.session_state.mode = "menu"
@@ -158,6 +187,8 @@ if 'game_board' not in st.session_state:
     st.session_state.game_board = None
 if 'game_history' not in st.session_state:
     st.session_state.game_history = []
+if 'search_context' not in st.session_state:
+    st.session_state.search_context = SearchContext(depth=2)
 if 'current_board' not in st.session_state:
     st.session_state.current_board = None
 if 'original_board' not in st.session_state:
@@ -226,6 +257,7 @@ if st.session_state.mode == "menu":
                 st.session_state.mode = "play"
                 st.session_state.game_board = chess.Board()
                 st.session_state.game_history = []
+                st.session_state.search_context.reset()
                 st.rerun()
         
         with col2:
@@ -292,6 +324,7 @@ elif st.session_state.mode == "play":
         if st.button("🔄 New Game", use_container_width=True):
             st.session_state.game_board = chess.Board()
             st.session_state.game_history = []
+            st.session_state.search_context.reset()
             if hasattr(st.session_state, 'resigned'):
                 delattr(st.session_state, 'resigned')
             if hasattr(st.session_state, 'winner'):
@@ -374,6 +407,7 @@ elif st.session_state.mode == "play":
             """, unsafe_allow_html=True)
         
         col_left, col_center, col_right = st.columns([1, 2, 1])
+        ai_pending = False
         
         with col_left:
             turn_text = "White to move" if board.turn else "Black (AI) to move"
@@ -416,22 +450,28 @@ elif st.session_state.mode == "play":
                 </div>
                 """, unsafe_allow_html=True)
                 
-                with st.spinner("Quantum AI analyzing..."):
-                    legal_moves = list(board.legal_moves)
-                    if legal_moves:
-                        result = quantum_move_selector(board, legal_moves, "true_quantum_walk")
-                        if isinstance(result, tuple):
-                            ai_move, prob_map = result
-                        else:
-                            ai_move = result
-                            prob_map = {}
-                        
-                        if ai_move:
-                            move_san = board.san(ai_move)
-                            board.push(ai_move)
-                            st.session_state.game_history.append(f"Black: {move_san}")
-                            st.success(f"AI plays: {move_san}")
-                            st.rerun()
+                # The search runs in the background; reruns only poll it,
+                # after the board and history below have been drawn
+                job = get_move_jobs().submit(
+                    board, "true_quantum_walk",
+                    context=st.session_state.search_context,
+                    sampling_backend="exact"
+                )
+                if not job.done():
+                    ai_pending = True
+                else:
+                    try:
+                        ai_move, prob_map = job.result()
+                    except Exception as e:
+                        st.error(f"AI search failed: {e}")
+                        ai_move = None
+                    
+                    if ai_move and ai_move in board.legal_moves:
+                        move_san = board.san(ai_move)
+                        board.push(ai_move)
+                        st.session_state.game_history.append(f"Black: {move_san}")
+                        st.success(f"AI plays: {move_san}")
+                        st.rerun()
         
         with col_center:
             st.markdown('<div class="board-container">', unsafe_allow_html=True)
@@ -473,6 +513,10 @@ elif st.session_state.mode == "play":
                     No moves yet
                 </div>
                 """, unsafe_allow_html=True)
+        
+        if ai_pending:
+            time.sleep(0.3)
+            st.rerun()
 
 elif st.session_state.mode == "predictor":
     st.markdown('<h3 style="color: #333; text-align: center; font-weight: 600;">🔬 Position Analysis</h3>', unsafe_allow_html=True)
@@ -522,6 +566,7 @@ elif st.session_state.mode == "predictor":
                     st.session_state.original_board = None
                     st.session_state.fen_validated = False
                     st.session_state.move_history = []
+                    st.session_state.last_stats = None
                     st.session_state.original_fen = ""
                     st.session_state.new_fen = ""
                     st.session_state.show_fens = False
@@ -544,8 +589,8 @@ elif st.session_state.mode == "predictor":
             with col_method:
                 method = st.selectbox(
                     "🎯 Algorithm Method",
-                    ["QAOA (Optimization)", "True Quantum Walk (Qiskit)", "Quantum Walk (Intelligent)", "Quantum Grover (Classic)"],
-                    help="QAOA frames move selection as optimization, True Quantum Walk uses genuine Qiskit circuits, Quantum Walk explores future positions, while Grover uses immediate evaluation"
+                    ["QAOA (Optimization)", "True Quantum Walk (Qiskit)", "Continuous Quantum Walk (Spectral)", "Quantum Walk (Intelligent)", "Quantum Grover (Classic)", "Alpha-Beta (Classical)"],
+                    help="QAOA frames move selection as optimization, True Quantum Walk runs a coined walk on the move graph, Continuous Quantum Walk evolves exp(-iHt) on the graph Laplacian, Quantum Walk explores future positions, Grover uses immediate evaluation, while Alpha-Beta is a classical negamax search"
                 )
             
             with col_button:
@@ -559,17 +604,18 @@ elif st.session_state.mode == "predictor":
                                     method_type = "qaoa"
                                 elif "True Quantum Walk" in method:
                                     method_type = "true_quantum_walk"
+                                elif "Continuous Quantum Walk" in method:
+                                    method_type = "continuous_quantum_walk"
                                 elif "Walk" in method:
                                     method_type = "quantum_walk"
+                                elif "Alpha-Beta" in method:
+                                    method_type = "alphabeta"
                                 else:
                                     method_type = "grover"
-                                result = quantum_move_selector(board, legal_moves, method_type)
-                                
-                                if isinstance(result, tuple):
-                                    best_move, prob_map = result
-                                else:
-                                    best_move = result
-                                    prob_map = {}
+                                best_move, prob_map, stats = quantum_move_selector(board, legal_moves, method_type,
+                                                                                   return_stats=True,
+                                                                                   cache=get_eval_cache())
+                                st.session_state.last_stats = stats.as_dict()
                                 
                                 if best_move:
                                     st.success(f"🎯 **Quantum algorithm selected:** {board.san(best_move)}")
@@ -711,6 +757,20 @@ elif st.session_state.mode == "predictor":
                 st.write(f"**En Passant:** {en_passant_square}")
                 st.write(f"**Halfmove Clock:** {board.halfmove_clock}")
                 st.write(f"**Fullmove Number:** {board.fullmove_number}")
+                
+                stats = st.session_state.get('last_stats')
+                if stats:
+                    st.markdown("**Last Analysis**")
+                    st.write(f"**Method:** {stats['method']} ({stats['total_ms']:.1f} ms)")
+                    if stats['stages_ms']:
+                        st.table([{"Stage": name, "Time (ms)": f"{ms:.1f}"} for name, ms in stats['stages_ms'].items()])
+                    for label, key in [("Graph Nodes", 'nodes'), ("Graph Edges", 'edges'), ("Qubits", 'qubits'),
+                                       ("Circuit Depth", 'circuit_depth'), ("Shots", 'shots')]:
+                        if stats[key] is not None:
+                            st.write(f"**{label}:** {stats[key]}")
+                    st.write(f"**Fallback:** {stats['fallback'] or 'None'}")
+                    if stats['cache']:
+                        st.write(f"**Evaluation Cache:** {stats['cache']}")
         
         st.markdown("---")
         
@@ -0,0 +1 @@
+# Benchmarks for Quantum Move Predictor 
@@ -0,0 +1,170 @@
+"""
+Microbenchmark: square-scan evaluation vs the bitboard popcount fast path,
+and the per-move push/rescan material scorer vs the batch capture-delta
+scorer.
+
+    python -m benchmarks.bench_eval
+"""
+import random
+import timeit
+import chess
+from chess_logic.move_eval import evaluate_board_state, evaluate_move, PIECE_VALUES
+from chess_logic.quantum_walk_eval import QuantumWalkEvaluator
+from chess_logic.batch_eval import material_move_scores
+from quantum.quantum_walk import material_value
+
+BOARD_VALUES = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330, chess.ROOK: 500, chess.QUEEN: 900}
+
+def scan_evaluate_board_state(board, player_color):
+    """
+    The original 64-square piece_at() implementation, kept as the reference.
+    """
+    if board.is_checkmate():
+        return -10000 if board.turn == player_color else 10000
+    if board.is_stalemate() or board.is_insufficient_material():
+        return 0
+
+    score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece:
+            value = BOARD_VALUES.get(piece.piece_type, 0)
+            score += value if piece.color == player_color else -value
+
+    score += 10 * len(list(board.legal_moves))
+    if board.is_check():
+        score -= 50
+
+    for square in [chess.E4, chess.E5, chess.D4, chess.D5]:
+        piece = board.piece_at(square)
+        if piece:
+            score += 5 if piece.color == player_color else -5
+
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece and piece.piece_type == chess.PAWN and piece.color == player_color:
+            rank = chess.square_rank(square)
+            score += (rank if player_color == chess.WHITE else 7 - rank) * 10
+
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece and piece.color == player_color:
+            file = chess.square_file(square)
+            rank = chess.square_rank(square)
+            if 2 <= file <= 5 and 2 <= rank <= 5:
+                score += 5
+
+    if board.fullmove_number <= 10:
+        for square in chess.SQUARES:
+            piece = board.piece_at(square)
+            if piece and piece.color == player_color and piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
+                rank = chess.square_rank(square)
+                if (piece.color == chess.WHITE and rank > 1) or (piece.color == chess.BLACK and rank < 6):
+                    score += 10
+
+    return score
+
+def scan_material_value(board):
+    val = 0
+    for sq in chess.SQUARES:
+        p = board.piece_at(sq)
+        if p:
+            v = PIECE_VALUES.get(p.piece_type, 0)
+            val += v if p.color == board.turn else -v
+    return val
+
+def scan_evaluate_move(board, move):
+    board_copy = board.copy()
+    board_copy.push(move)
+    score = 0
+    for square in chess.SQUARES:
+        piece = board_copy.piece_at(square)
+        if piece:
+            value = PIECE_VALUES[piece.piece_type]
+            score += value if piece.color == chess.WHITE else -value
+    return -score if board.turn == chess.BLACK else score
+
+def scan_evaluate_position_quality(board):
+    material_score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece:
+            value = PIECE_VALUES[piece.piece_type]
+            material_score += value if piece.color == chess.WHITE else -value
+    mobility_score = len(list(board.legal_moves))
+    if board.turn == chess.BLACK:
+        mobility_score = -mobility_score
+    safety_score = 0
+    if board.is_check():
+        safety_score = -50
+    elif board.is_checkmate():
+        safety_score = -1000
+    return material_score + mobility_score * 0.1 + safety_score
+
+def scan_material_move_scores(board, moves):
+    """
+    The inline scorer quantum_move_selector used to repeat: play each move
+    and rescan the board. Scored for the mover here; the original summed
+    from the opponent's side.
+    """
+    scores = []
+    for m in moves:
+        board.push(m)
+        s = 0
+        for sq in board.piece_map().keys():
+            p = board.piece_at(sq)
+            if p:
+                s += {1:1,2:3,3:3,4:5,5:9,6:0}.get(p.piece_type,0) * (1 if p.color!=board.turn else -1)
+        scores.append(s)
+        board.pop()
+    return scores
+
+def sample_positions(count=200, seed=2024):
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        board = chess.Board()
+        for ply in range(rng.randint(0, 80)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        boards.append(board)
+    return boards
+
+def time_per_call(fn, args_list, repeat=5):
+    best = min(timeit.repeat(lambda: [fn(*args) for args in args_list], number=1, repeat=repeat))
+    return best / len(args_list) * 1e6
+
+def main():
+    boards = sample_positions()
+    evaluator = QuantumWalkEvaluator()
+    move_args = [(b, next(iter(b.legal_moves))) for b in boards if b.legal_moves.count()]
+
+    for board in boards:
+        for color in chess.COLORS:
+            assert evaluate_board_state(board, color) == scan_evaluate_board_state(board, color)
+        assert material_value(board) == scan_material_value(board)
+        assert evaluator.evaluate_position_quality(board) == scan_evaluate_position_quality(board)
+    for board, move in move_args:
+        assert evaluate_move(board, move) == scan_evaluate_move(board, move)
+    legal_args = [(b, list(b.legal_moves)) for b in boards]
+    for board, moves in legal_args:
+        assert material_move_scores(board, moves).tolist() == scan_material_move_scores(board, moves)
+
+    cases = [
+        ("evaluate_board_state", scan_evaluate_board_state, evaluate_board_state, [(b, b.turn) for b in boards]),
+        ("material_value", scan_material_value, material_value, [(b,) for b in boards]),
+        ("evaluate_move", scan_evaluate_move, evaluate_move, move_args),
+        ("evaluate_position_quality", scan_evaluate_position_quality, evaluator.evaluate_position_quality, [(b,) for b in boards]),
+        ("material_move_scores", scan_material_move_scores, material_move_scores, legal_args),
+    ]
+
+    print(f"{'function':<28}{'scan us':>10}{'bitboard us':>14}{'speedup':>10}")
+    for name, scan_fn, fast_fn, args_list in cases:
+        fast = time_per_call(fast_fn, args_list)
+        scan = time_per_call(scan_fn, args_list)
+        print(f"{name:<28}{scan:>10.1f}{fast:>14.1f}{scan / fast:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Cold-start benchmark: import time of the app's entry modules, measured in
+fresh interpreters with python -X importtime, and whether each one pulls
+in Qiskit.
+
+    python -m benchmarks.bench_import [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "chess_logic.move_eval",
+    "quantum.grover_move_selector",
+    "chess_logic.move_jobs",
+    "app",
+]
+
+HEAVY = ("qiskit", "qiskit_aer", "scipy", "streamlit")
+
+def parse_importtime(stderr, module):
+    """
+    Cumulative microseconds of module's own import line in -X importtime output.
+    """
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith("  "):
+            return int(parts[1])
+    return None
+
+def measure(module):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return parse_importtime(proc.stderr, module), loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'module':<32}{'median ms':>11}{'min ms':>9}  heavy imports")
+    for module in MODULES:
+        times = []
+        for _ in range(args.repeat):
+            micros, loaded = measure(module)
+            times.append(micros / 1000)
+        print(f"{module:<32}{statistics.median(times):>11.1f}{min(times):>9.1f}  {', '.join(loaded) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+End-to-end benchmark of every move selector over the fixed FEN corpus in
+benchmarks/corpus.py: p50/p95 latency, nodes per second, peak traced
+memory, and how often each method agrees with a reference method and with
+itself across repeats. Results are written as JSON and can be checked
+against a stored baseline.
+
+    python -m benchmarks.bench_selectors [--methods qaoa classical ...]
+        [--repeat N] [--output results.json] [--baseline baseline.json]
+
+With --baseline, a method whose p50/p95 latency or peak memory grew by
+more than --tolerance is reported and the exit status is 1. The stored
+baseline is benchmarks/baseline.json:
+
+    python -m benchmarks.bench_selectors --baseline benchmarks/baseline.json
+
+Every run is seeded (--seed), including the Aer simulator, so the chosen
+moves and the agreement and stability figures are reproducible.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+import chess
+import numpy as np
+from benchmarks.corpus import CORPUS, corpus_positions
+from chess_logic.quantum_walk_eval import QuantumWalkEvaluator
+from chess_logic.search_context import SearchContext
+from quantum.backends import seeded_simulator
+from quantum.grover_move_selector import quantum_move_selector
+
+SELECTOR_METHODS = ('qaoa', 'quantum_walk', 'true_quantum_walk', 'continuous_quantum_walk',
+                    'grover', 'classical', 'alphabeta')
+EVALUATOR_METHOD = 'walk_evaluator'
+METHODS = SELECTOR_METHODS + (EVALUATOR_METHOD,)
+
+DEFAULT_SEED = 1234
+DEFAULT_TOLERANCE = 0.25
+EVALUATOR_BUDGET_MS = 500
+REGRESSION_METRICS = ('p50_ms', 'p95_ms', 'peak_kib')
+
+def run_method(method, board, seed):
+    """
+    One move selection: returns (move, nodes). nodes is the size of the
+    searched move graph where the method builds one, otherwise None.
+    The Aer simulator and sampled draws are seeded too, so a run is
+    reproducible for a given seed.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    with seeded_simulator(seed):
+        if method == EVALUATOR_METHOD:
+            evaluator = QuantumWalkEvaluator()
+            move = evaluator.select_move(board, time_budget_ms=EVALUATOR_BUDGET_MS)
+            return move, evaluator.last_search['nodes']
+        context = SearchContext()
+        move, _ = quantum_move_selector(board, list(board.legal_moves), method, context=context)
+        return move, context.graph.num_nodes if context.graph is not None else None
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else None
+
+def bench_method(method, positions, repeat, seed):
+    """
+    Times method on every position repeat times, then runs it once more
+    per position under tracemalloc for the peak allocation, so tracing
+    does not slow down the timed runs. One untimed warm-up run first
+    keeps lazy imports and backend start-up out of the latencies.
+    """
+    run_method(method, chess.Board(positions[0][1]), seed)
+    latencies = []
+    nodes_total = 0
+    nodes_seconds = 0.0
+    moves = []
+    for _, fen in positions:
+        picked = []
+        for r in range(repeat):
+            board = chess.Board(fen)
+            start = time.perf_counter()
+            move, nodes = run_method(method, board, seed + r)
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed * 1000)
+            picked.append(move.uci() if move else None)
+            if nodes:
+                nodes_total += nodes
+                nodes_seconds += elapsed
+        moves.append(picked)
+
+    peak = 0
+    for _, fen in positions:
+        tracemalloc.start()
+        try:
+            run_method(method, chess.Board(fen), seed)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    stable = sum(1 for picked in moves if len(set(picked)) == 1)
+    return {
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'mean_ms': float(np.mean(latencies)),
+        'nodes_per_s': nodes_total / nodes_seconds if nodes_seconds else None,
+        'peak_kib': peak / 1024,
+        'stability': stable / len(moves),
+        'moves': {fen: Counter(picked).most_common(1)[0][0] for (_, fen), picked in zip(positions, moves)},
+    }
+
+def add_agreement(results, reference):
+    """
+    Fraction of positions where each method's most frequent move matches
+    the reference method's.
+    """
+    ref_moves = results.get(reference, {}).get('moves')
+    for stats in results.values():
+        if ref_moves is None:
+            stats['agreement'] = None
+            continue
+        same = sum(1 for fen, move in stats['moves'].items() if ref_moves.get(fen) == move)
+        stats['agreement'] = same / len(stats['moves'])
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    List of (method, metric, baseline, current) for every metric in
+    REGRESSION_METRICS that grew by more than tolerance.
+    """
+    regressions = []
+    for method, stats in results['methods'].items():
+        old = baseline.get('methods', {}).get(method)
+        if old is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            before, after = old.get(metric), stats.get(metric)
+            if before and after is not None and after > before * (1 + tolerance):
+                regressions.append((method, metric, before, after))
+    return regressions
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'python-chess': chess.__version__,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("--phases", nargs="+", choices=list(CORPUS), default=list(CORPUS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--reference", choices=METHODS, default='alphabeta',
+                        help="method the agreement figures are measured against")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    positions = corpus_positions(args.phases)
+    methods = {}
+    for method in args.methods:
+        methods[method] = bench_method(method, positions, args.repeat, args.seed)
+    add_agreement(methods, args.reference)
+
+    results = {
+        'environment': environment(),
+        'settings': {'phases': args.phases, 'positions': len(positions), 'repeat': args.repeat,
+                     'seed': args.seed, 'reference': args.reference},
+        'methods': methods,
+    }
+
+    print(f"{'method':<26}{'p50 ms':>9}{'p95 ms':>9}{'nodes/s':>10}{'peak KiB':>10}{'agree':>7}{'stable':>8}")
+    for method, stats in methods.items():
+        nps = f"{stats['nodes_per_s']:.0f}" if stats['nodes_per_s'] else "-"
+        agree = f"{stats['agreement']:.2f}" if stats['agreement'] is not None else "-"
+        print(f"{method:<26}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{nps:>10}"
+              f"{stats['peak_kib']:>10.0f}{agree:>7}{stats['stability']:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('settings', {}).get('phases') != args.phases:
+            print("Warning: the baseline was recorded on different corpus phases")
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for method, metric, before, after in regressions:
+            print(f"REGRESSION {method} {metric}: {before:.1f} -> {after:.1f}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
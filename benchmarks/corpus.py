@@ -0,0 +1,32 @@
+"""
+Fixed benchmark positions, grouped by game phase.
+"""
+import chess
+
+CORPUS = {
+    "opening": [
+        chess.STARTING_FEN,
+        "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2",
+        "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+        "rnbqkb1r/pp2pppp/3p1n2/8/3NP3/2N5/PPP2PPP/R1BQKB1R b KQkq - 2 5",
+    ],
+    "middlegame": [
+        "r1bq1rk1/pp2bppp/2n1pn2/2pp4/2PP4/2N1PN2/PP2BPPP/R1BQ1RK1 w - - 2 8",
+        "r2q1rk1/ppp2ppp/2np1n2/2b1p1B1/2B1P1b1/2NP1N2/PPP2PPP/R2Q1RK1 w - - 4 8",
+        "r1b2rk1/2q1bppp/p2ppn2/1p6/3NP3/1BN1B3/PPP2PPP/R2Q1RK1 w - - 0 11",
+        "2rq1rk1/pp1bppbp/3p1np1/4n3/3NP3/1BN1BP2/PPPQ2PP/2KR3R w - - 7 12",
+    ],
+    "endgame": [
+        "8/8/4k3/8/2K5/8/3P4/8 w - - 0 1",
+        "8/5pk1/6p1/8/8/6P1/5PK1/3R4 w - - 0 40",
+        "8/8/8/4k3/8/8/3QK3/8 w - - 0 1",
+        "6k1/5ppp/8/8/8/8/r4PPP/1R4K1 b - - 0 30",
+    ],
+}
+
+def corpus_positions(phases=None):
+    """
+    (phase, fen) pairs for the given phases, all of them by default.
+    """
+    phases = phases or list(CORPUS)
+    return [(phase, fen) for phase in phases for fen in CORPUS[phase]]
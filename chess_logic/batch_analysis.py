@@ -0,0 +1,160 @@
+"""
+Headless batch analysis: reads FEN or EPD positions, one per line, from a
+file or stdin and writes one JSON line per position with the chosen move,
+its probability map and the selector's per-stage timings.
+
+    python -m chess_logic.batch_analysis positions.epd --method true_quantum_walk \\
+        --workers 4 --output results.jsonl
+
+Lines are written as soon as each position finishes, so with more than
+one worker they can come out of input order; "index" is the 0-based
+position number in the input. Input is read lazily and at most --window
+positions are in flight at once, which keeps memory flat however long
+the input is.
+"""
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import chess
+from quantum.grover_move_selector import quantum_move_selector
+from chess_logic.eval_cache import EvalCache
+
+METHODS = ('qaoa', 'quantum_walk', 'true_quantum_walk', 'continuous_quantum_walk', 'grover', 'classical', 'alphabeta')
+
+def parse_position(text):
+    """
+    Board and EPD operations from a FEN or EPD line.
+    """
+    try:
+        return chess.Board(text), {}
+    except ValueError:
+        board = chess.Board()
+        ops = board.set_epd(text)
+        return board, ops
+
+def iter_positions(lines):
+    """
+    Yields (index, text) for every non-blank, non-comment line.
+    """
+    index = 0
+    for line in lines:
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        yield index, text
+        index += 1
+
+_caches = {}
+
+def _eval_cache(path):
+    # One EvalCache per cache file in each process
+    if path not in _caches:
+        _caches[path] = EvalCache(path)
+    return _caches[path]
+
+def analyze_position(index, text, method_type='true_quantum_walk', sampling_backend=None, cache_path=None,
+                     adaptive_shots=False, walk_engine='sparse'):
+    """
+    Analyzes one position and returns its JSON-ready result. Parse and
+    search errors are reported in the result instead of raised. Anything
+    the selectors print goes to stderr, so stdout only carries results.
+    """
+    result = {'index': index, 'input': text}
+    try:
+        board, ops = parse_position(text)
+        if 'id' in ops:
+            result['id'] = ops['id']
+        if 'bm' in ops:
+            result['bm'] = [m.uci() for m in ops['bm']]
+        cache = _eval_cache(cache_path) if cache_path else None
+        with redirect_stdout(sys.stderr):
+            move, prob_map, stats = quantum_move_selector(board, list(board.legal_moves), method_type,
+                                                          sampling_backend=sampling_backend, return_stats=True,
+                                                          cache=cache, adaptive_shots=adaptive_shots,
+                                                          walk_engine=walk_engine)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+    result['fen'] = board.fen()
+    result['move'] = move.uci() if move else None
+    result['san'] = board.san(move) if move else None
+    result['prob_map'] = {uci: float(p) for uci, p in prob_map.items()}
+    result['stats'] = stats.as_dict()
+    return result
+
+def analyze_stream(lines, output, method_type='true_quantum_walk', workers=1, window=None,
+                   sampling_backend=None, cache_path=None, adaptive_shots=False, walk_engine='sparse'):
+    """
+    Analyzes every position in lines and writes one JSON line per position
+    to output, flushing after each. workers > 1 spreads positions over a
+    process pool with at most window positions in flight (default: four
+    per worker). With cache_path, results are looked up in and stored to
+    that EvalCache database; adaptive_shots stops sampling early once the
+    leading move is clear and walk_engine selects the coined walk's engine.
+    Returns the number of positions written.
+    """
+    positions = iter_positions(lines)
+    written = 0
+
+    def emit(result):
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if workers <= 1:
+        for index, text in positions:
+            emit(analyze_position(index, text, method_type, sampling_backend, cache_path, adaptive_shots,
+                                  walk_engine))
+            written += 1
+        return written
+
+    window = window or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for index, text in positions:
+            pending.add(pool.submit(analyze_position, index, text, method_type, sampling_backend, cache_path,
+                                    adaptive_shots, walk_engine))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+                    written += 1
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                emit(future.result())
+                written += 1
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", default="-", help="FEN/EPD file, or - for stdin")
+    parser.add_argument("--method", choices=METHODS, default='true_quantum_walk')
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--window", type=int, help="positions in flight (default: 4 per worker)")
+    parser.add_argument("--sampling-backend", choices=('exact', 'sampled', 'aer'),
+                        help="amplitude sampling backend (default depends on the method)")
+    parser.add_argument("--output", default="-", help="JSONL file, or - for stdout")
+    parser.add_argument("--cache", help="SQLite evaluation cache to read and update")
+    parser.add_argument("--adaptive-shots", action="store_true",
+                        help="stop sampling once the leading move is statistically separated")
+    parser.add_argument("--walk-engine", choices=('sparse', 'qiskit'), default='sparse',
+                        help="engine of the coined walk; qiskit samples a circuit and only fits small graphs")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        count = analyze_stream(source, sink, args.method, args.workers, args.window, args.sampling_backend,
+                               args.cache, args.adaptive_shots, args.walk_engine)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"Analyzed {count} positions", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
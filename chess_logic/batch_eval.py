@@ -0,0 +1,213 @@
+import chess
+import numpy as np
+
+# Plane order: white P, N, B, R, Q, K, then black P, N, B, R, Q, K
+NUM_PLANES = 12
+PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330, chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+CENTER_SQUARES = [chess.E4, chess.E5, chess.D4, chess.D5]
+
+_SQUARE_SHIFTS = np.arange(64, dtype=np.uint64)
+
+# Move-scorer material values indexed by piece type; index 0 means nothing captured
+MATERIAL_VALUES = np.array([0, 1, 3, 3, 5, 9, 0], dtype=np.int64)
+
+def plane_index(piece_type, color):
+    return (0 if color == chess.WHITE else 6) + piece_type - 1
+
+def _build_weights(player_color):
+    """
+    Per-square weights of the linear terms of evaluate_board_state, seen
+    from player_color. Returns (static, activity, development) arrays,
+    each shaped (12, 64).
+    """
+    static = np.zeros((NUM_PLANES, 64), dtype=np.int64)
+    development = np.zeros((NUM_PLANES, 64), dtype=np.int64)
+    activity = np.zeros((NUM_PLANES, 64), dtype=np.int64)
+
+    for color in chess.COLORS:
+        sign = 1 if color == player_color else -1
+        for piece_type in chess.PIECE_TYPES:
+            plane = plane_index(piece_type, color)
+
+            # 1. Material
+            static[plane, :] += sign * PIECE_VALUES[piece_type]
+
+            # 4. Center control
+            for square in CENTER_SQUARES:
+                static[plane, square] += sign * 5
+
+            if color != player_color:
+                continue
+
+            for square in chess.SQUARES:
+                rank = chess.square_rank(square)
+                file = chess.square_file(square)
+
+                # 5. Pawn advancement
+                if piece_type == chess.PAWN:
+                    static[plane, square] += (rank if color == chess.WHITE else 7 - rank) * 10
+
+                # 6. Piece activity
+                if 2 <= file <= 5 and 2 <= rank <= 5:
+                    activity[plane, square] += 5
+
+                # 7. Development
+                if piece_type in (chess.KNIGHT, chess.BISHOP):
+                    if (color == chess.WHITE and rank > 1) or (color == chess.BLACK and rank < 6):
+                        development[plane, square] += 10
+
+    return static, activity, development
+
+_WEIGHTS = {color: _build_weights(color) for color in chess.COLORS}
+
+def _stacked(term):
+    # Columns: black perspective, white perspective
+    return np.stack([_WEIGHTS[chess.BLACK][term].ravel(), _WEIGHTS[chess.WHITE][term].ravel()], axis=1)
+
+STATIC_WEIGHTS = _stacked(0)
+ACTIVITY_WEIGHTS = _stacked(1)
+DEVELOPMENT_WEIGHTS = _stacked(2)
+
+def board_bitboards(board):
+    """
+    The 12 piece bitboards of a board as Python ints.
+    """
+    return [board.pieces_mask(piece_type, color)
+            for color in (chess.WHITE, chess.BLACK) for piece_type in chess.PIECE_TYPES]
+
+def unpack_bitboards(bitboards):
+    """
+    Expands (N, 12) uint64 bitboards into (N, 12, 64) 0/1 occupancy planes.
+    """
+    bb = np.asarray(bitboards, dtype=np.uint64)
+    return ((bb[..., None] >> _SQUARE_SHIFTS) & np.uint64(1)).astype(np.uint8)
+
+class PositionBatch:
+    """
+    N positions packed for vectorized evaluation: (N, 12) uint64 bitboards
+    plus the per-position facts that need move generation.
+    """
+    def __init__(self, bitboards, turn, mobility, in_check, fullmove_number, checkmate, draw):
+        self.bitboards = bitboards
+        self.turn = turn
+        self.mobility = mobility
+        self.in_check = in_check
+        self.fullmove_number = fullmove_number
+        self.checkmate = checkmate
+        self.draw = draw
+
+    def __len__(self):
+        return len(self.bitboards)
+
+def pack_positions(boards):
+    boards = list(boards)
+    n = len(boards)
+    bitboards = np.zeros((n, NUM_PLANES), dtype=np.uint64)
+    turn = np.zeros(n, dtype=bool)
+    mobility = np.zeros(n, dtype=np.int64)
+    in_check = np.zeros(n, dtype=bool)
+    fullmove_number = np.zeros(n, dtype=np.int64)
+    checkmate = np.zeros(n, dtype=bool)
+    draw = np.zeros(n, dtype=bool)
+
+    for i, board in enumerate(boards):
+        bitboards[i] = board_bitboards(board)
+        turn[i] = board.turn
+        mobility[i] = board.legal_moves.count()
+        in_check[i] = board.is_check()
+        fullmove_number[i] = board.fullmove_number
+        checkmate[i] = in_check[i] and mobility[i] == 0
+        draw[i] = (not in_check[i] and mobility[i] == 0) or board.is_insufficient_material()
+
+    return PositionBatch(bitboards, turn, mobility, in_check, fullmove_number, checkmate, draw)
+
+def evaluate_planes(planes, player_colors, fullmove_numbers, include_activity=True):
+    """
+    Vectorized piece-placement terms of evaluate_board_state: material,
+    center control, pawn advancement and, optionally, piece activity and
+    early-game development.
+
+    Args:
+        planes: (N, 12, 64) occupancy planes or (N, 12) uint64 bitboards
+        player_colors: Scalar or (N,) array of perspectives (True = White)
+        fullmove_numbers: Scalar or (N,) array, development counts up to move 10
+        include_activity: Include the activity and development terms
+
+    Returns:
+        (N,) int64 array of scores
+    """
+    planes = np.asarray(planes)
+    if planes.ndim == 2:
+        planes = unpack_bitboards(planes)
+    n = planes.shape[0]
+    flat = planes.reshape(n, NUM_PLANES * 64).astype(np.int64)
+    column = np.broadcast_to(np.asarray(player_colors, dtype=np.int64), (n,))
+    rows = np.arange(n)
+
+    scores = (flat @ STATIC_WEIGHTS)[rows, column]
+    if include_activity:
+        scores = scores + (flat @ ACTIVITY_WEIGHTS)[rows, column]
+        early = np.broadcast_to(np.asarray(fullmove_numbers), (n,)) <= 10
+        scores = scores + np.where(early, (flat @ DEVELOPMENT_WEIGHTS)[rows, column], 0)
+    return scores
+
+def evaluate_batch(batch, player_colors, include_activity=True):
+    """
+    Scores every position in a PositionBatch like evaluate_board_state.
+    """
+    n = len(batch)
+    player_colors = np.broadcast_to(np.asarray(player_colors, dtype=bool), (n,))
+    scores = evaluate_planes(batch.bitboards, player_colors, batch.fullmove_number, include_activity)
+    scores = scores + 10 * batch.mobility - 50 * batch.in_check
+
+    mate_scores = np.where(batch.turn == player_colors, -10000, 10000)
+    scores = np.where(batch.draw, 0, scores)
+    scores = np.where(batch.checkmate, mate_scores, scores)
+    return scores
+
+def evaluate_board_states(boards, player_color, include_activity=True):
+    """
+    Batched evaluate_board_state: scores all boards in one vectorized pass.
+    Pass include_activity=False for the shorter QAOA variant.
+    """
+    boards = list(boards)
+    if not boards:
+        return np.zeros(0, dtype=np.int64)
+    return evaluate_batch(pack_positions(boards), player_color, include_activity)
+
+def material_move_scores(board, moves=None, values=MATERIAL_VALUES):
+    """
+    Material balance for the side to move after each move, in one pass.
+
+    The balance of the current position is computed once; each move only
+    adds the value of the piece it captures (en passant included) and its
+    promotion gain, so no move is played and the board is never rescanned.
+
+    Args:
+        board: Position to score
+        moves: Moves to score, all legal moves by default
+        values: Material values indexed by piece type (0 = no piece)
+
+    Returns:
+        (N,) int64 array aligned with moves
+    """
+    moves = list(board.legal_moves) if moves is None else list(moves)
+    n = len(moves)
+    captured = np.zeros(n, dtype=np.int64)
+    promoted = np.zeros(n, dtype=np.int64)
+    opponents = board.occupied_co[not board.turn]
+    for i, move in enumerate(moves):
+        if opponents & chess.BB_SQUARES[move.to_square]:
+            captured[i] = board.piece_type_at(move.to_square)
+        elif board.is_en_passant(move):
+            captured[i] = chess.PAWN
+        if move.promotion:
+            promoted[i] = move.promotion
+
+    base = 0
+    for piece_type in chess.PIECE_TYPES:
+        pieces = board.pieces_mask(piece_type, board.turn), board.pieces_mask(piece_type, not board.turn)
+        base += int(values[piece_type]) * (chess.popcount(pieces[0]) - chess.popcount(pieces[1]))
+
+    promotion_gain = np.where(promoted > 0, values[promoted] - values[chess.PAWN], 0)
+    return base + values[captured] + promotion_gain
@@ -1,5 +1,5 @@
 import chess
-import networkx as nx
+from chess_logic.move_graph import build_move_graph
 
 def get_board_from_fen(fen_string):
     try:
@@ -38,59 +38,14 @@ def get_board_info(board):
     }
     return info
 
-def generate_move_graph(board, depth=2):
+def generate_move_graph(board, depth=2, workers=None, max_nodes=None, max_bytes=None):
     """
     Generate a graph of future board positions for quantum walk.
     Returns adjacency list, FEN mappings, and move tree.
+
+    Thin adapter over build_move_graph; new code should use the MoveGraph
+    directly instead of the dictionary views. workers > 1 expands the root
+    moves in a process pool; max_nodes/max_bytes cap the graph size.
     """
-    G = nx.DiGraph()
-    fen_to_idx = {}
-    idx_to_fen = {}
-    move_tree = {}
-    node_counter = 0
-    
-    def add_node(fen):
-        nonlocal node_counter
-        if fen not in fen_to_idx:
-            fen_to_idx[fen] = node_counter
-            idx_to_fen[node_counter] = fen
-            node_counter += 1
-        return fen_to_idx[fen]
-    
-    def build_graph(current_board, current_depth, parent_move=None):
-        current_fen = current_board.fen()
-        current_idx = add_node(current_fen)
-        
-        if current_depth == 0:
-            return current_idx
-        
-        legal_moves = list(current_board.legal_moves)
-        if not legal_moves:
-            return current_idx
-        
-        children = []
-        for move in legal_moves:
-            current_board.push(move)
-            child_fen = current_board.fen()
-            child_idx = add_node(child_fen)
-            
-            G.add_edge(current_idx, child_idx)
-            children.append((move, child_idx))
-            
-            if current_depth > 1:
-                build_graph(current_board, current_depth - 1, move)
-            
-            current_board.pop()
-        
-        if parent_move is not None:
-            move_tree[parent_move.uci()] = children
-        
-        return current_idx
-    
-    start_idx = build_graph(board.copy(), depth)
-    
-    adj_list = {}
-    for node in G.nodes():
-        adj_list[node] = list(G.successors(node))
-    
-    return adj_list, fen_to_idx, idx_to_fen, move_tree 
\ No newline at end of file
+    graph = build_move_graph(board, depth, workers=workers, max_nodes=max_nodes, max_bytes=max_bytes)
+    return graph.adj_list, graph.fen_to_idx, graph.idx_to_fen, graph.move_tree
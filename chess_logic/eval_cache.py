@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import chess
+from chess_logic.zobrist import zobrist_hash
+
+# Bump when selector output changes so stale results are dropped on open
+SCHEMA_VERSION = 1
+
+DEFAULT_CACHE_PATH = os.environ.get("QUANTUM_CHESS_CACHE", ".quantum_chess_cache.sqlite")
+DEFAULT_MAX_ENTRIES = 100000
+
+# Inserts between size checks, and the share of max_entries evicted at once
+EVICT_EVERY = 64
+EVICT_FRACTION = 0.1
+
+# Hits whose last-used times are kept in memory before being written
+TOUCH_BATCH = 256
+
+def _signed(h):
+    # SQLite integers are signed 64-bit
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+class EvalCache:
+    """
+    Persistent cache of move selections in an SQLite database, keyed by
+    position (Zobrist hash), method and parameters.
+
+    The database runs in WAL mode, so any number of processes can read
+    while one writes. Each thread gets its own connection. Entries carry a
+    last-used time, and once the table grows past max_entries the least
+    recently used tenth is evicted. Hits only read: their last-used times
+    are collected in memory and written with the next put(), every
+    TOUCH_BATCH hits, or on close(). The cache is best-effort: a locked or
+    unwritable database, even when opening it, is treated as a miss, never
+    as an error.
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._touched = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        try:
+            self._create()
+        except sqlite3.Error:
+            pass
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create(self):
+        conn = self._connection()
+        with self._lock:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS evals")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS evals (
+                    hash INTEGER NOT NULL,
+                    method TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    epd TEXT NOT NULL,
+                    move TEXT,
+                    prob_map TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (hash, method, params)
+                ) WITHOUT ROWID""")
+            conn.execute("CREATE INDEX IF NOT EXISTS evals_last_used ON evals (last_used)")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def key(board, method, params=None):
+        return (_signed(zobrist_hash(board)), method, json.dumps(params or {}, sort_keys=True))
+
+    def get(self, board, method, params=None):
+        """
+        Cached (move, prob_map) for board, or None.
+        """
+        key = self.key(board, method, params)
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT epd, move, prob_map FROM evals WHERE hash=? AND method=? AND params=?",
+                               key).fetchone()
+            # Guard against hash collisions
+            if row is not None and row[0] != board.epd():
+                row = None
+        except sqlite3.Error:
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+            flush = len(self._touched) >= TOUCH_BATCH
+        if flush:
+            self.flush()
+        move = chess.Move.from_uci(row[1]) if row[1] else None
+        return move, json.loads(row[2])
+
+    def put(self, board, method, params, move, prob_map):
+        key = self.key(board, method, params)
+        prob_map = {uci: float(p) for uci, p in prob_map.items()}
+        try:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO evals VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         key + (board.epd(), move.uci() if move else None, json.dumps(prob_map), time.time()))
+            with self._lock:
+                self._puts += 1
+                check = self._puts % EVICT_EVERY == 0
+            if check:
+                self.evict()
+            else:
+                self.flush()
+        except sqlite3.Error:
+            pass
+
+    def flush(self):
+        """
+        Writes the last-used times of pending hits in one transaction. They
+        stay pending if the database is locked.
+        """
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany("UPDATE evals SET last_used=? WHERE hash=? AND method=? AND params=?",
+                                 [(used,) + key for key, used in touched.items()])
+        except sqlite3.Error:
+            with self._lock:
+                for key, used in touched.items():
+                    self._touched.setdefault(key, used)
+
+    def evict(self):
+        """
+        Drops the least recently used entries once there are more than
+        max_entries, leaving room for EVICT_FRACTION of them.
+        """
+        self.flush()
+        conn = self._connection()
+        size = len(self)
+        if size <= self.max_entries:
+            return 0
+        excess = size - int(self.max_entries * (1 - EVICT_FRACTION))
+        conn.execute("DELETE FROM evals WHERE (hash, method, params) IN "
+                     "(SELECT hash, method, params FROM evals ORDER BY last_used LIMIT ?)", (excess,))
+        return excess
+
+    def __len__(self):
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self), 'max_entries': self.max_entries}
+
+    def clear(self):
+        self._connection().execute("DELETE FROM evals")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._touched = {}
+
+    def close(self):
+        self.flush()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
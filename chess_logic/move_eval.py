@@ -9,125 +9,118 @@ PIECE_VALUES = {
     chess.KING: 0
 }
 
+BOARD_PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330, chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+
+# Precomputed square masks for the bitboard evaluation terms
+CENTER_MASK = chess.BB_E4 | chess.BB_E5 | chess.BB_D4 | chess.BB_D5
+ACTIVITY_MASK = (chess.BB_FILE_C | chess.BB_FILE_D | chess.BB_FILE_E | chess.BB_FILE_F) & \
+    (chess.BB_RANK_3 | chess.BB_RANK_4 | chess.BB_RANK_5 | chess.BB_RANK_6)
+DEVELOPED_MASK = {
+    chess.WHITE: ~(chess.BB_RANK_1 | chess.BB_RANK_2) & chess.BB_ALL,
+    chess.BLACK: ~(chess.BB_RANK_7 | chess.BB_RANK_8) & chess.BB_ALL,
+}
+
+popcount = chess.popcount
+
+def material_balance(board, color, values=PIECE_VALUES):
+    """
+    Material of color minus material of the opponent, from piece bitboards.
+    """
+    own = board.occupied_co[color]
+    opp = board.occupied_co[not color]
+    balance = 0
+    for piece_type, pieces in ((chess.PAWN, board.pawns), (chess.KNIGHT, board.knights),
+                               (chess.BISHOP, board.bishops), (chess.ROOK, board.rooks),
+                               (chess.QUEEN, board.queens)):
+        value = values[piece_type]
+        balance += value * (popcount(pieces & own) - popcount(pieces & opp))
+    return balance
+
+def pawn_advancement(board, color):
+    """
+    Sum of the ranks advanced by color's pawns, counted from its own side.
+    """
+    pawns = board.pawns & board.occupied_co[color]
+    total = 0
+    for rank in range(1, 7):
+        count = popcount(pawns & chess.BB_RANKS[rank])
+        if count:
+            total += count * (rank if color == chess.WHITE else 7 - rank)
+    return total
+
 def evaluate_move(board, move):
-    board_copy = board.copy()
+    board_copy = board.copy(stack=False)
     board_copy.push(move)
-    
-    material_score = 0
-    
-    for square in chess.SQUARES:
-        piece = board_copy.piece_at(square)
-        if piece:
-            value = PIECE_VALUES[piece.piece_type]
-            if piece.color == chess.WHITE:
-                material_score += value
-            else:
-                material_score -= value
-    
+
+    material_score = material_balance(board_copy, chess.WHITE)
+
     if board.turn == chess.BLACK:
         material_score = -material_score
-    
+
     return material_score
 
 def get_move_quality_score(board, move):
     board_copy = board.copy()
     board_copy.push(move)
-    
+
     base_score = evaluate_move(board, move)
-    
+
     bonus = 0
-    
+
     if board_copy.is_checkmate():
         bonus += 1000
     elif board_copy.is_check():
         bonus += 50
-    
+
     if board_copy.is_capture(board_copy.peek()):
         bonus += 10
-    
+
     return base_score + bonus
 
-def evaluate_board_state(board, player_color):
+def evaluate_board_state(board, player_color, include_activity=True):
     """
     Calculates a comprehensive static score for a board position.
     A positive score favors the player whose turn it is.
+
+    Every term is computed from piece bitboards with popcounts, and legal
+    moves are generated once for mobility, checkmate and stalemate.
+    include_activity=False drops the piece activity and development terms.
     """
-    if board.is_checkmate():
+    in_check = board.is_check()
+    mobility = board.legal_moves.count()
+    if mobility == 0 and in_check:
         return -10000 if board.turn == player_color else 10000
-    if board.is_stalemate() or board.is_insufficient_material():
+    if mobility == 0 or board.is_insufficient_material():
         return 0
 
+    own = board.occupied_co[player_color]
+    opp = board.occupied_co[not player_color]
+
     # 1. Material Advantage
-    piece_values = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330, chess.ROOK: 500, chess.QUEEN: 900}
-    score = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            value = piece_values.get(piece.piece_type, 0)
-            if piece.color == player_color:
-                score += value
-            else:
-                score -= value
-    
+    score = material_balance(board, player_color, BOARD_PIECE_VALUES)
+
     # 2. Mobility: Number of legal moves
-    mobility = len(list(board.legal_moves))
     score += 10 * mobility
 
     # 3. King safety
-    if board.is_check():
+    if in_check:
         score -= 50
-    
+
     # 4. Center control (simplified)
-    center_squares = [chess.E4, chess.E5, chess.D4, chess.D5]
-    center_control = 0
-    for square in center_squares:
-        if board.piece_at(square):
-            piece = board.piece_at(square)
-            if piece.color == player_color:
-                center_control += 5
-            else:
-                center_control -= 5
-    score += center_control
-
-    # 5. Pawn structure (simplified)
-    pawn_structure = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.PAWN:
-            if piece.color == player_color:
-                # Bonus for advanced pawns
-                rank = chess.square_rank(square)
-                if player_color == chess.WHITE:
-                    pawn_structure += rank * 10
-                else:
-                    pawn_structure += (7 - rank) * 10
-    score += pawn_structure
-
-    # 6. Piece activity
-    piece_activity = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.color == player_color:
-            # Bonus for pieces in the center
-            file = chess.square_file(square)
-            rank = chess.square_rank(square)
-            if 2 <= file <= 5 and 2 <= rank <= 5:
-                piece_activity += 5
-    score += piece_activity
-
-    # 7. Development (for early game)
-    development = 0
+    score += 5 * (popcount(CENTER_MASK & own) - popcount(CENTER_MASK & opp))
+
+    # 5. Pawn structure (simplified): bonus for advanced pawns
+    score += 10 * pawn_advancement(board, player_color)
+
+    if not include_activity:
+        return score
+
+    # 6. Piece activity: bonus for pieces in the center
+    score += 5 * popcount(own & ACTIVITY_MASK)
+
+    # 7. Development (for early game): bonus for developed minor pieces
     if board.fullmove_number <= 10:
-        # Bonus for developed pieces
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece and piece.color == player_color:
-                if piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-                    rank = chess.square_rank(square)
-                    if piece.color == chess.WHITE and rank > 1:
-                        development += 10
-                    elif piece.color == chess.BLACK and rank < 6:
-                        development += 10
-    score += development
-
-    return score 
\ No newline at end of file
+        minors = (board.knights | board.bishops) & own
+        score += 10 * popcount(minors & DEVELOPED_MASK[player_color])
+
+    return score
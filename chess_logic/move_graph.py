@@ -0,0 +1,455 @@
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import chess
+import numpy as np
+from chess_logic.zobrist import ZobristBoard, TranspositionTable, FenToIndex, IndexToFen, zobrist_hash
+
+NO_MOVE = 0
+
+# Approximate memory per node and per edge while a graph is built: the
+# transposition table, builder arrays and the packed MoveGraph together
+NODE_BYTES = 300
+EDGE_BYTES = 16
+
+class SearchTimeout(Exception):
+    """
+    Raised by MoveGraphBuilder.search() when its deadline has passed.
+    """
+
+def encode_move(move):
+    """
+    Packs a move into 15 bits: to-square, from-square << 6, promotion << 12.
+    """
+    promotion = move.promotion - 1 if move.promotion else 0
+    return move.to_square | (move.from_square << 6) | (promotion << 12)
+
+def decode_move(code):
+    code = int(code)
+    promotion = (code >> 12) & 0x7
+    return chess.Move((code >> 6) & 0x3F, code & 0x3F, promotion + 1 if promotion else None)
+
+class MoveGraph:
+    """
+    Move graph stored in NumPy arrays.
+
+    Edges use CSR layout: the successors of node i are
+    targets[offsets[i]:offsets[i + 1]], reached by the moves in move_codes
+    over the same slice. Node 0 is the root position. Every node keeps the
+    parent and move that first reached it so boards and FEN strings can be
+    rebuilt on demand. truncated is set when construction stopped at a node
+    or memory budget before reaching the requested depth.
+    """
+    def __init__(self, root_fen, hashes, parents, parent_moves, plies, expanded,
+                 offsets, targets, move_codes, chess960=False, truncated=False):
+        self.root_fen = root_fen
+        self.chess960 = chess960
+        self.truncated = truncated
+        self.hashes = hashes
+        self.parents = parents
+        self.parent_moves = parent_moves
+        self.plies = plies
+        self.expanded = expanded
+        self.offsets = offsets
+        self.targets = targets
+        self.move_codes = move_codes
+        self._hash_order = np.argsort(hashes, kind='stable')
+        self._sorted_hashes = hashes[self._hash_order]
+        self._fens = {}
+        self._adj_list = None
+        self.cache = {}
+
+    def __len__(self):
+        return self.num_nodes
+
+    @property
+    def num_nodes(self):
+        return len(self.hashes)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        arrays = (self.hashes, self.parents, self.parent_moves, self.plies, self.expanded,
+                  self.offsets, self.targets, self.move_codes, self._hash_order, self._sorted_hashes)
+        return sum(a.nbytes for a in arrays)
+
+    @property
+    def max_ply(self):
+        return int(self.plies.max()) if self.num_nodes else 0
+
+    def successors(self, idx):
+        return self.targets[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def out_degree(self, idx):
+        return int(self.offsets[idx + 1] - self.offsets[idx])
+
+    def out_degrees(self):
+        return np.diff(self.offsets)
+
+    def moves_from(self, idx):
+        """
+        List of (chess.Move, child index) pairs leaving node idx.
+        """
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        return [(decode_move(code), int(child))
+                for code, child in zip(self.move_codes[start:end], self.targets[start:end])]
+
+    def root_children(self):
+        """
+        Dictionary mapping root move UCI strings to child node indices.
+        """
+        return {move.uci(): child for move, child in self.moves_from(0)}
+
+    def index_of_hash(self, h):
+        pos = int(np.searchsorted(self._sorted_hashes, np.uint64(h)))
+        if pos < len(self._sorted_hashes) and int(self._sorted_hashes[pos]) == h:
+            return int(self._hash_order[pos])
+        return None
+
+    def index_of(self, board):
+        """
+        Node index of a board position, or None if it is not in the graph.
+        """
+        h = board.zobrist if isinstance(board, ZobristBoard) else zobrist_hash(board)
+        return self.index_of_hash(h)
+
+    def path(self, idx):
+        moves = []
+        while self.parents[idx] != -1:
+            moves.append(decode_move(self.parent_moves[idx]))
+            idx = self.parents[idx]
+        moves.reverse()
+        return moves
+
+    def board(self, idx):
+        board = ZobristBoard(self.root_fen, chess960=self.chess960)
+        for move in self.path(idx):
+            board.push(move)
+        return board
+
+    def fen(self, idx):
+        fen = self._fens.get(idx)
+        if fen is None:
+            fen = self.board(idx).fen()
+            self._fens[idx] = fen
+        return fen
+
+    @property
+    def fen_to_idx(self):
+        return FenToIndex(self)
+
+    @property
+    def idx_to_fen(self):
+        return IndexToFen(self)
+
+    @property
+    def adj_list(self):
+        """
+        Dictionary adjacency list for callers that predate the CSR layout.
+        """
+        if self._adj_list is None:
+            if self.num_edges == 0:
+                self._adj_list = {}
+            else:
+                self._adj_list = {idx: self.successors(idx).tolist() for idx in range(self.num_nodes)}
+        return self._adj_list
+
+    @property
+    def move_tree(self):
+        """
+        Dictionary mapping the move that reached an expanded node to its
+        (move, child index) pairs, as returned by generate_move_graph.
+        """
+        tree = {}
+        for idx in np.flatnonzero(self.expanded):
+            if idx != 0 and self.out_degree(idx) > 0:
+                tree[decode_move(self.parent_moves[idx]).uci()] = self.moves_from(idx)
+        return tree
+
+class MoveGraphBuilder:
+    """
+    Incrementally collects nodes and edges, then packs them into a MoveGraph.
+    """
+    def __init__(self, root_board):
+        root = ZobristBoard.from_board(root_board)
+        self.table = TranspositionTable(root)
+        self.parent_moves = array('H')
+        self.plies = array('h')
+        self.expanded = bytearray()
+        self.edge_src = array('i')
+        self.edge_dst = array('i')
+        self.edge_moves = array('H')
+        self.searched_depth = {}
+        self.reused_nodes = 0
+        self.truncated = False
+        self.add_node(root.zobrist)
+
+    @classmethod
+    def from_graph(cls, graph, root, depth, root_board=None):
+        """
+        Seeds a builder with the part of graph reachable from node root within
+        depth plies, re-indexed so that root becomes node 0. Nodes that were
+        already expanded keep their edges; call extend() to search the rest.
+        """
+        builder = cls(root_board if root_board is not None else graph.board(root))
+        new_index = {root: 0}
+        order = [root]
+        for old in order:
+            idx = new_index[old]
+            ply = builder.plies[idx]
+            if ply >= depth or not graph.expanded[old]:
+                continue
+            start, end = graph.offsets[old], graph.offsets[old + 1]
+            for code, child in zip(graph.move_codes[start:end], graph.targets[start:end]):
+                child = int(child)
+                move = decode_move(code)
+                if child not in new_index:
+                    new_index[child] = builder.add_node(int(graph.hashes[child]), idx, move, ply + 1)
+                    order.append(child)
+                builder.add_edge(idx, new_index[child], move)
+            builder.expanded[idx] = 1
+            builder.searched_depth[idx] = depth - ply
+        builder.reused_nodes = len(order)
+        return builder
+
+    @property
+    def root_board(self):
+        return ZobristBoard(self.table.root_fen, chess960=self.table.chess960)
+
+    @property
+    def num_nodes(self):
+        return len(self.table)
+
+    @property
+    def num_edges(self):
+        return len(self.edge_dst)
+
+    @property
+    def estimated_nbytes(self):
+        return self.num_nodes * NODE_BYTES + self.num_edges * EDGE_BYTES
+
+    def add_node(self, h, parent=-1, move=None, ply=0):
+        idx = self.table.add(h, parent, move)
+        if idx == len(self.plies):
+            self.parent_moves.append(encode_move(move) if move else NO_MOVE)
+            self.plies.append(ply)
+            self.expanded.append(0)
+        elif ply < self.plies[idx]:
+            self.plies[idx] = ply
+        return idx
+
+    def add_edge(self, src, dst, move):
+        self.edge_src.append(src)
+        self.edge_dst.append(dst)
+        self.edge_moves.append(encode_move(move))
+
+    def expand(self, idx, board, moves=None):
+        """
+        Adds every legal move from node idx (whose position is board) and
+        returns the (move, child index) pairs. Edges are only recorded the
+        first time a node is expanded.
+        """
+        first = not self.expanded[idx]
+        self.expanded[idx] = 1
+        ply = self.plies[idx] + 1
+        children = []
+        for move in (board.legal_moves if moves is None else moves):
+            board.push(move)
+            child = self.add_node(board.zobrist, idx, move, ply)
+            board.pop()
+            if first:
+                self.add_edge(idx, child, move)
+            children.append((move, child))
+        return children
+
+    def search(self, idx, board, depth, deadline=None):
+        """
+        Depth-first expansion of node idx (whose position is board) to depth
+        plies. Transpositions are only re-searched when reached with more
+        remaining depth than before. With a deadline (a time.perf_counter()
+        value) SearchTimeout is raised once it has passed, leaving the
+        builder part-way through the search.
+        """
+        if depth == 0:
+            return
+        if self.searched_depth.get(idx, 0) >= depth:
+            return
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SearchTimeout()
+        self.searched_depth[idx] = depth
+
+        for move, child in self.expand(idx, board):
+            if depth > 1:
+                board.push(move)
+                try:
+                    self.search(child, board, depth - 1, deadline)
+                finally:
+                    board.pop()
+
+    def extend(self, depth, deadline=None):
+        """
+        Searches every node above ply depth that has not been expanded yet.
+        """
+        frontier = [idx for idx in range(self.num_nodes)
+                    if self.plies[idx] < depth and not self.expanded[idx]]
+        for idx in frontier:
+            if not self.expanded[idx]:
+                self.search(idx, self.table.board(idx), depth - self.plies[idx], deadline)
+
+    def extend_breadth_first(self, depth, max_nodes=None, max_bytes=None, deadline=None, clock=time.perf_counter):
+        """
+        Like extend(), but expands nodes shallowest first and stops before
+        any expansion that would take the graph past max_nodes nodes or
+        an estimated max_bytes of memory. Returns False and sets truncated
+        when a budget stopped the search, leaving every ply above the
+        last one complete. deadline is measured on clock.
+        """
+        levels = [[] for _ in range(depth)]
+        for idx in range(self.num_nodes):
+            if self.plies[idx] < depth and not self.expanded[idx]:
+                levels[self.plies[idx]].append(idx)
+
+        for ply in range(depth):
+            for idx in levels[ply]:
+                if self.expanded[idx]:
+                    continue
+                if deadline is not None and clock() > deadline:
+                    raise SearchTimeout()
+                board = self.table.board(idx)
+                moves = list(board.legal_moves)
+                # Children can be transpositions, so this bounds the growth from above
+                if max_nodes is not None and self.num_nodes + len(moves) > max_nodes:
+                    self.truncated = True
+                    return False
+                if max_bytes is not None and \
+                        self.estimated_nbytes + len(moves) * (NODE_BYTES + EDGE_BYTES) > max_bytes:
+                    self.truncated = True
+                    return False
+                self.searched_depth[idx] = depth - ply
+                for _, child in self.expand(idx, board, moves):
+                    if ply + 1 < depth and self.plies[child] == ply + 1 and not self.expanded[child]:
+                        levels[ply + 1].append(child)
+        return True
+
+    def merge(self, graph, root):
+        """
+        Adds a MoveGraph whose node 0 is this builder's node root. Positions
+        are matched by hash, so transpositions between merged graphs share
+        one node; nodes that are already expanded here keep their edges.
+        """
+        base_ply = self.plies[root]
+        mapping = [root] * graph.num_nodes
+        index = self.table.index
+        hashes, parents = graph.hashes.tolist(), graph.parents.tolist()
+        parent_moves, plies = graph.parent_moves.tolist(), graph.plies.tolist()
+        for idx in range(1, graph.num_nodes):
+            h, ply = hashes[idx], base_ply + plies[idx]
+            node = index.get(h)
+            if node is None:
+                node = self.add_node(h, mapping[parents[idx]], decode_move(parent_moves[idx]), ply)
+            elif ply < self.plies[node]:
+                self.plies[node] = ply
+            mapping[idx] = node
+        for idx in np.flatnonzero(graph.expanded):
+            node = mapping[idx]
+            if self.expanded[node]:
+                continue
+            self.expanded[node] = 1
+            start, end = graph.offsets[idx], graph.offsets[idx + 1]
+            for code, child in zip(graph.move_codes[start:end].tolist(), graph.targets[start:end].tolist()):
+                self.edge_src.append(node)
+                self.edge_dst.append(mapping[child])
+                self.edge_moves.append(code)
+
+    def build(self):
+        n = self.num_nodes
+        src = np.frombuffer(self.edge_src, dtype=np.int32) if self.num_edges else np.zeros(0, np.int32)
+        order = np.argsort(src, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        targets = np.array(self.edge_dst, dtype=np.int32)[order]
+        move_codes = np.array(self.edge_moves, dtype=np.uint16)[order]
+        return MoveGraph(
+            self.table.root_fen,
+            np.array(self.table.hashes, dtype=np.uint64),
+            np.array(self.table.parents, dtype=np.int32),
+            np.array(self.parent_moves, dtype=np.uint16),
+            np.array(self.plies, dtype=np.int16),
+            np.frombuffer(bytes(self.expanded), dtype=np.bool_).copy(),
+            offsets,
+            targets,
+            move_codes,
+            chess960=self.table.chess960,
+            truncated=self.truncated,
+        )
+
+def build_move_graph(board, depth=2, workers=None, executor=None, max_nodes=None, max_bytes=None):
+    """
+    Build a MoveGraph of every position reachable from board within depth plies.
+    With workers > 1 (or an executor) the root moves are expanded in
+    parallel, see build_move_graph_parallel.
+
+    max_nodes and max_bytes cap the graph size: positions are then
+    expanded breadth-first (serially) until the next expansion would
+    exceed either budget, and the graph is marked truncated.
+    """
+    if max_nodes is not None or max_bytes is not None:
+        builder = MoveGraphBuilder(board)
+        builder.extend_breadth_first(depth, max_nodes, max_bytes)
+        return builder.build()
+    if depth >= 2 and (executor is not None or (workers and workers > 1)):
+        return build_move_graph_parallel(board, depth, workers, executor)
+    builder = MoveGraphBuilder(board)
+    builder.extend(depth)
+    return builder.build()
+
+def _build_root_move_subgraph(root_fen, chess960, move_uci, depth):
+    board = chess.Board(root_fen, chess960=chess960)
+    board.push_uci(move_uci)
+    return build_move_graph(board, depth)
+
+def build_move_graph_parallel(board, depth=3, workers=None, executor=None):
+    """
+    Build a MoveGraph with each root move's subtree expanded in its own
+    process, then merge the partial graphs by hash.
+
+    Args:
+        board: Root position
+        depth: Depth in plies, counted from board
+        workers: Process count for a temporary ProcessPoolExecutor
+        executor: Existing executor to reuse instead (not shut down here)
+    """
+    builder = MoveGraphBuilder(board)
+    children = builder.expand(0, builder.root_board)
+    builder.searched_depth[0] = depth
+    if depth < 2:
+        return builder.build()
+
+    root_fen, chess960 = builder.table.root_fen, builder.table.chess960
+    moves = [move.uci() for move, _ in children]
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=workers)
+    try:
+        subgraphs = pool.map(_build_root_move_subgraph, [root_fen] * len(moves), [chess960] * len(moves),
+                             moves, [depth - 1] * len(moves))
+        for (_, child), subgraph in zip(children, subgraphs):
+            builder.merge(subgraph, child)
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return builder.build()
+
+def reroot_move_graph(graph, board, depth=2):
+    """
+    Build a MoveGraph rooted at board, reusing the subtree of graph below that
+    position and only searching the missing frontier. Returns the new graph
+    and the number of nodes taken over from the old one.
+    """
+    root = graph.index_of(board) if graph is not None else None
+    if root is None:
+        return build_move_graph(board, depth), 0
+    builder = MoveGraphBuilder.from_graph(graph, root, depth, board)
+    builder.extend(depth)
+    return builder.build(), builder.reused_nodes
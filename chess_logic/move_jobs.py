@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from quantum.grover_move_selector import quantum_move_selector
+
+def job_key(board, method_type, context=None, sampling_backend='exact'):
+    # The context object itself is part of the key: searches with different
+    # contexts (or none) are different jobs
+    return (board.fen(), method_type, sampling_backend, context)
+
+def _select_move(board, method_type, context, sampling_backend, cache=None, book=None):
+    legal_moves = list(board.legal_moves)
+    result = quantum_move_selector(board, legal_moves, method_type, context=context,
+                                   sampling_backend=sampling_backend, cache=cache, book=book)
+    if isinstance(result, tuple):
+        return result
+    return result, {}
+
+class MoveJobs:
+    """
+    Background move searches shared by every session of the app.
+
+    Jobs are keyed by (FEN, method, sampling backend, context), so asking
+    for a search that is already running, or finished recently, returns the
+    same future instead of starting over. Up to maxsize finished jobs are
+    kept.
+    An EvalCache passed as cache and an OpeningBook passed as book are
+    consulted by every search.
+    """
+    def __init__(self, max_workers=2, maxsize=64, cache=None, book=None):
+        self.maxsize = maxsize
+        self.cache = cache
+        self.book = book
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="move-search")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, board, method_type, context=None, sampling_backend='exact'):
+        """
+        Future resolving to (move, prob_map) for board, started now unless
+        the same search is already running or finished without error.
+        """
+        key = job_key(board, method_type, context, sampling_backend)
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._jobs.move_to_end(key)
+                return future
+            future = self._executor.submit(_select_move, board.copy(), method_type, context, sampling_backend,
+                                           self.cache, self.book)
+            self._jobs[key] = future
+            self._evict()
+            return future
+
+    def get(self, board, method_type, context=None, sampling_backend='exact'):
+        with self._lock:
+            return self._jobs.get(job_key(board, method_type, context, sampling_backend))
+
+    def _evict(self):
+        finished = [key for key, future in self._jobs.items() if future.done()]
+        while len(self._jobs) > self.maxsize and finished:
+            del self._jobs[finished.pop(0)]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,171 @@
+"""
+Opening book in the Polyglot format: a sorted file of 16-byte records
+(position hash, move, weight, learn), looked up by binary search over a
+memory-mapped file, so opening it costs nothing and a probe takes
+microseconds.
+
+    python -m chess_logic.opening_book games.pgn [more.pgn ...] -o book.bin [--max-plies 20]
+
+Positions are keyed by the same Zobrist hash as the rest of the package
+(chess_logic.zobrist), which is the Polyglot hash.
+"""
+import argparse
+import os
+import struct
+import chess
+import chess.pgn
+import chess.polyglot
+from chess_logic.zobrist import zobrist_hash
+
+DEFAULT_BOOK_PATH = os.environ.get(
+    "QUANTUM_CHESS_BOOK", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "opening_book.bin"))
+DEFAULT_MAX_PLIES = 20
+
+RECORD = struct.Struct(">QHHI")
+MAX_WEIGHT = 0xFFFF
+
+# Weight of a move for the side that played it, by game result
+RESULT_WEIGHTS = {'win': 2, 'draw': 1, 'loss': 0, 'unknown': 1}
+
+def encode_polyglot_move(board, move):
+    """
+    16-bit Polyglot move: to file/rank, from file/rank, promotion piece.
+    Castling is stored as the king capturing its own rook.
+    """
+    to_square = move.to_square
+    if board.is_castling(move) and not board.chess960:
+        rank = chess.square_rank(move.from_square)
+        to_square = chess.square(7 if board.is_kingside_castling(move) else 0, rank)
+    promotion = move.promotion - 1 if move.promotion else 0
+    return to_square | (move.from_square << 6) | (promotion << 12)
+
+def _result_weight(result, turn):
+    if result == "1/2-1/2":
+        return RESULT_WEIGHTS['draw']
+    if result not in ("1-0", "0-1"):
+        return RESULT_WEIGHTS['unknown']
+    won = (result == "1-0") == (turn == chess.WHITE)
+    return RESULT_WEIGHTS['win' if won else 'loss']
+
+def collect_book_moves(games, max_plies=DEFAULT_MAX_PLIES):
+    """
+    Sums result weights of every (position hash, Polyglot move) played in
+    the first max_plies plies of games.
+    """
+    weights = {}
+    for game in games:
+        result = game.headers.get("Result", "*")
+        board = game.board()
+        for ply, move in enumerate(game.mainline_moves()):
+            if ply >= max_plies:
+                break
+            key = (zobrist_hash(board), encode_polyglot_move(board, move))
+            weights[key] = weights.get(key, 0) + _result_weight(result, board.turn)
+            board.push(move)
+    return weights
+
+def read_pgn_games(paths):
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            while True:
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                yield game
+
+def write_book(weights, path, min_weight=1):
+    """
+    Writes the collected weights as a sorted Polyglot file. Weights of each
+    position are scaled down together if any exceeds 16 bits; moves below
+    min_weight are left out. Returns the number of records written.
+    """
+    by_key = {}
+    for (key, move), weight in weights.items():
+        by_key.setdefault(key, []).append((move, weight))
+
+    count = 0
+    with open(path, "wb") as f:
+        for key in sorted(by_key):
+            moves = by_key[key]
+            top = max(weight for _, weight in moves)
+            scale = MAX_WEIGHT / top if top > MAX_WEIGHT else 1
+            for move, weight in sorted(moves, key=lambda m: -m[1]):
+                weight = int(weight * scale)
+                if weight < min_weight:
+                    continue
+                f.write(RECORD.pack(key, move, weight, 0))
+                count += 1
+    return count
+
+def build_book(pgn_paths, path, max_plies=DEFAULT_MAX_PLIES, min_weight=1):
+    """
+    Compiles the games in pgn_paths into an opening book at path.
+    """
+    weights = collect_book_moves(read_pgn_games(pgn_paths), max_plies)
+    return write_book(weights, path, min_weight)
+
+class OpeningBook:
+    """
+    Memory-mapped Polyglot book. Opening only maps the file; every probe is
+    a binary search over the mapped records.
+    """
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self._reader = chess.polyglot.open_reader(path)
+
+    def __len__(self):
+        return len(self._reader)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def weights(self, board, legal_moves=None):
+        """
+        Dictionary of book moves for board and their weights, restricted to
+        legal_moves if given.
+        """
+        weights = {}
+        for entry in self._reader.find_all(board):
+            if legal_moves is None or entry.move in legal_moves:
+                weights[entry.move] = weights.get(entry.move, 0) + entry.weight
+        return weights
+
+    def probe(self, board, legal_moves=None):
+        """
+        (move, prob_map) with the highest-weighted book move and the weight
+        share of every book move, or None when the position is not in the book.
+        """
+        weights = self.weights(board, legal_moves)
+        if not weights:
+            return None
+        total = sum(weights.values())
+        move = max(weights, key=weights.get)
+        return move, {m.uci(): w / total for m, w in weights.items()}
+
+    def close(self):
+        self._reader.close()
+
+def open_book(path=DEFAULT_BOOK_PATH):
+    """
+    OpeningBook at path, or None if there is no book file.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pgn", nargs="+", help="PGN files to compile")
+    parser.add_argument("-o", "--output", default=DEFAULT_BOOK_PATH)
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--min-weight", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    count = build_book(args.pgn, args.output, args.max_plies, args.min_weight)
+    print(f"Wrote {count} book entries to {args.output}")
+
+if __name__ == "__main__":
+    main()
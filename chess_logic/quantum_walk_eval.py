@@ -1,13 +1,107 @@
-import networkx as nx
+import time
 import chess
 import numpy as np
-from chess_logic.move_eval import get_move_quality_score
-from quantum.quantum_walk import evaluate_position_with_true_qwalk, generate_move_graph
+from chess_logic.move_eval import get_move_quality_score, material_balance, PIECE_VALUES
+from chess_logic.move_graph import MoveGraphBuilder, SearchTimeout, build_move_graph
+from chess_logic.board_utils import generate_move_graph
+from quantum.quantum_walk import evaluate_position_with_true_qwalk
+
+# Upper bound on iterative deepening; the time budget normally stops it first
+MAX_SEARCH_DEPTH = 16
+
+# Default cap on move-graph size, roughly 60 MB while it is built
+MAX_GRAPH_NODES = 200000
 
 class QuantumWalkEvaluator:
-    def __init__(self, max_depth=3, max_breadth=10):
+    def __init__(self, max_depth=3, max_breadth=10, max_nodes=MAX_GRAPH_NODES, max_bytes=None,
+                 clock=time.perf_counter):
         self.max_depth = max_depth
         self.max_breadth = max_breadth
+        self.max_nodes = max_nodes
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.last_search = {}
+    
+    def select_move(self, board, time_budget_ms=1000, max_depth=MAX_SEARCH_DEPTH):
+        """
+        Anytime move selection: deepens the move graph one ply at a time
+        and scores each completed depth with the true quantum walk, until
+        the time budget runs out.
+        
+        Depth 1 always completes. Before each deeper iteration its cost is
+        predicted from the last one (build time per new node times the
+        nodes the branching factor will add, plus scoring time per node),
+        and deepening stops once the prediction no longer fits in the
+        budget or the graph would outgrow max_nodes/max_bytes. A build that
+        overruns anyway is abandoned at the deadline, and a built depth is
+        only scored if its predicted scoring time still fits. The best move
+        of the last scored depth is returned. Details of the search are left in
+        self.last_search; 'timed_out' means the deadline actually passed.
+        """
+        clock = self.clock
+        start = clock()
+        deadline = start + time_budget_ms / 1000.0
+        legal_moves = list(board.legal_moves)
+        self.last_search = {'depth': 0, 'nodes': 0, 'elapsed_ms': 0.0, 'timed_out': False, 'truncated': False}
+        if not legal_moves:
+            return None
+        
+        builder = MoveGraphBuilder(board)
+        best_move = legal_moves[0]
+        added = 1
+        branching = 1.0
+        build_per_node = 0.0
+        score_per_node = 0.0
+        
+        for depth in range(1, max_depth + 1):
+            if depth > 1:
+                # Skip an iteration that would not finish in time anyway
+                predicted_nodes = added * branching
+                if self.max_nodes is not None and builder.num_nodes + predicted_nodes > self.max_nodes:
+                    self.last_search['truncated'] = True
+                    break
+                predicted_time = (predicted_nodes * build_per_node
+                                  + (builder.num_nodes + predicted_nodes) * score_per_node)
+                if clock() + predicted_time > deadline:
+                    break
+            
+            previous_nodes = builder.num_nodes
+            build_start = clock()
+            try:
+                complete = builder.extend_breadth_first(depth, self.max_nodes, self.max_bytes,
+                                                        deadline if depth > 1 else None, clock)
+            except SearchTimeout:
+                break
+            build_end = clock()
+            if not complete:
+                # Keep the last complete depth; depth 1 is scored even if partial
+                self.last_search['truncated'] = True
+                if depth > 1:
+                    break
+            
+            graph = builder.build()
+            if depth > 1 and clock() + graph.num_nodes * score_per_node > deadline:
+                break
+            score_start = clock()
+            move_scores = evaluate_position_with_true_qwalk(board, depth, graph=graph)
+            if move_scores:
+                best_uci = max(move_scores, key=move_scores.get)
+                best_move = chess.Move.from_uci(best_uci)
+            self.last_search.update(depth=depth, nodes=graph.num_nodes)
+            score_per_node = (clock() - score_start) / graph.num_nodes
+            
+            new_nodes = graph.num_nodes - previous_nodes
+            if new_nodes == 0 or self.last_search['truncated']:
+                # Every line ends before this depth, or the budget is spent
+                break
+            build_per_node = (build_end - build_start) / new_nodes
+            branching = new_nodes / added
+            added = new_nodes
+        
+        now = clock()
+        self.last_search['timed_out'] = now > deadline
+        self.last_search['elapsed_ms'] = (now - start) * 1000
+        return best_move
     
     def quantum_walk_score(self, board, depth=None):
         """
@@ -17,7 +111,8 @@ class QuantumWalkEvaluator:
             depth = self.max_depth
         
         # Use the new true quantum walk evaluation
-        move_scores = evaluate_position_with_true_qwalk(board, depth)
+        graph = build_move_graph(board, depth, max_nodes=self.max_nodes, max_bytes=self.max_bytes)
+        move_scores = evaluate_position_with_true_qwalk(board, depth, graph=graph)
         
         if not move_scores:
             return None
@@ -33,20 +128,9 @@ class QuantumWalkEvaluator:
         return None
     
     def evaluate_position_quality(self, board):
-        material_score = 0
-        mobility_score = 0
-        safety_score = 0
-        
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                value = self.get_piece_value(piece.piece_type)
-                if piece.color == chess.WHITE:
-                    material_score += value
-                else:
-                    material_score -= value
+        material_score = material_balance(board, chess.WHITE, PIECE_VALUES)
         
-        mobility_score = len(list(board.legal_moves))
+        mobility_score = board.legal_moves.count()
         if board.turn == chess.BLACK:
             mobility_score = -mobility_score
         
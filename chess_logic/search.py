@@ -0,0 +1,162 @@
+import chess
+from chess_logic.move_eval import evaluate_board_state, get_move_quality_score, PIECE_VALUES
+from chess_logic.zobrist import ZobristBoard
+
+# evaluate_board_state scores a mated side to move as -10000
+MATE_SCORE = 10000
+INFINITY = 10**9
+
+DEFAULT_DEPTH = 3
+DEFAULT_MAX_NODES = 50000
+
+class NodeBudgetExceeded(Exception):
+    pass
+
+def relative_eval(board, color):
+    """
+    evaluate_board_state from White's side, negated for Black, so the two
+    sides' scores always sum to zero as negamax assumes. Scoring each side
+    from its own point of view does not: the mobility, check and activity
+    terms differ between the sides.
+    """
+    score = evaluate_board_state(board, chess.WHITE)
+    return score if color == chess.WHITE else -score
+
+def side_to_move_eval(board):
+    return relative_eval(board, board.turn)
+
+def quick_move_score(board, move):
+    """
+    Material won by a capture or promotion, plus a bonus for checks.
+    """
+    score = 0
+    if board.is_capture(move):
+        captured = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+        score += PIECE_VALUES[captured]
+    if move.promotion:
+        score += PIECE_VALUES[move.promotion] - PIECE_VALUES[chess.PAWN]
+    if board.gives_check(move):
+        score += 0.5
+    return score
+
+class AlphaBetaSearch:
+    """
+    Negamax alpha-beta search with principal variation search.
+
+    Moves are ordered with the stored principal-variation move first, then
+    by get_move_quality_score, so captures and checks are tried early. The
+    first move at each node gets the full window and the rest a null
+    window, re-searched only when they fail high inside (alpha, beta).
+    Iterative deepening fills the PV table (best move per position hash)
+    so each depth starts from the previous depth's best line.
+    """
+    def __init__(self, max_nodes=DEFAULT_MAX_NODES, evaluate=side_to_move_eval):
+        self.max_nodes = max_nodes
+        self.evaluate = evaluate
+        self.pv_table = {}
+        self.nodes = 0
+        self.completed_depth = 0
+
+    def ordered_moves(self, board, moves, depth):
+        """
+        PV move first, then by get_move_quality_score. One ply above the
+        leaves a cheaper capture/promotion/check key is used instead, since
+        scoring every move there would cost more than the cutoffs save.
+        """
+        if depth > 1:
+            key = lambda move: get_move_quality_score(board, move)
+        else:
+            key = lambda move: quick_move_score(board, move)
+        moves = sorted(moves, key=key, reverse=True)
+        pv_move = self.pv_table.get(board.zobrist)
+        if pv_move in moves:
+            moves.remove(pv_move)
+            moves.insert(0, pv_move)
+        return moves
+
+    def negamax(self, board, depth, alpha, beta, ply, root_moves=None):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise NodeBudgetExceeded()
+
+        if depth == 0:
+            score = self.evaluate(board)
+            if abs(score) >= MATE_SCORE:
+                score = MATE_SCORE - ply if score > 0 else -(MATE_SCORE - ply)
+            return score
+
+        moves = root_moves if root_moves is not None else list(board.legal_moves)
+        if not moves:
+            return -(MATE_SCORE - ply) if board.is_check() else 0
+
+        best_score = -INFINITY
+        best_move = None
+        for i, move in enumerate(self.ordered_moves(board, moves, depth)):
+            board.push(move)
+            try:
+                if i == 0:
+                    score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    score = -self.negamax(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if alpha < score < beta:
+                        score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        self.pv_table[board.zobrist] = best_move
+        return best_score
+
+    def search(self, board, depth=DEFAULT_DEPTH, root_moves=None):
+        """
+        Iteratively deepens to depth plies and returns (best_move, score)
+        from the last depth that finished within the node budget. Depth 1
+        always finishes.
+        """
+        board = ZobristBoard.from_board(board)
+        moves = list(root_moves) if root_moves is not None else list(board.legal_moves)
+        if not moves:
+            return None, 0
+
+        best_move, best_score = moves[0], -INFINITY
+        for current in range(1, depth + 1):
+            budget = self.max_nodes
+            if current == 1:
+                self.max_nodes = None
+            try:
+                score = self.negamax(board, current, -INFINITY, INFINITY, 0, moves)
+            except NodeBudgetExceeded:
+                break
+            finally:
+                self.max_nodes = budget
+            best_move, best_score = self.pv_table[board.zobrist], score
+            self.completed_depth = current
+        return best_move, best_score
+
+    def principal_variation(self, board, depth=DEFAULT_DEPTH):
+        """
+        The line of best moves stored in the PV table, starting at board.
+        """
+        board = ZobristBoard.from_board(board)
+        line = []
+        for _ in range(depth):
+            move = self.pv_table.get(board.zobrist)
+            if move is None or move not in board.legal_moves:
+                break
+            line.append(move)
+            board.push(move)
+        return line
+
+def alphabeta_move(board, legal_moves=None, depth=DEFAULT_DEPTH, max_nodes=DEFAULT_MAX_NODES):
+    """
+    Best move by alpha-beta search, restricted to legal_moves if given.
+    """
+    move, _ = AlphaBetaSearch(max_nodes=max_nodes).search(board, depth, legal_moves)
+    return move
@@ -0,0 +1,42 @@
+import threading
+from chess_logic.move_graph import reroot_move_graph
+
+class SearchContext:
+    """
+    Per-game search state that keeps the move graph alive between AI turns.
+
+    graph_for() re-roots the previous graph at the new position and only
+    searches the frontier that is missing, instead of rebuilding the tree.
+    The saving is the new root's subtree in the old graph: all of it when
+    the same position is searched again (e.g. with another method), little
+    when the new root sat at the old graph's last ply, as it does two
+    plies later in play with depth=2.
+    """
+    def __init__(self, depth=2):
+        self.depth = depth
+        self.graph = None
+        self.graph_depth = 0
+        self.reused_nodes = 0
+        self._lock = threading.Lock()
+
+    def graph_for(self, board, depth=None):
+        """
+        MoveGraph rooted at board and searched depth plies deep.
+        """
+        if depth is None:
+            depth = self.depth
+        
+        with self._lock:
+            if self.graph is not None and self.graph_depth == depth and self.graph.index_of(board) == 0:
+                self.reused_nodes = self.graph.num_nodes
+                return self.graph
+            
+            self.graph, self.reused_nodes = reroot_move_graph(self.graph, board, depth)
+            self.graph_depth = depth
+            return self.graph
+
+    def reset(self):
+        with self._lock:
+            self.graph = None
+            self.graph_depth = 0
+            self.reused_nodes = 0
@@ -0,0 +1,307 @@
+import operator
+from collections.abc import Mapping
+import chess
+import chess.polyglot
+
+# Polyglot keys, so hashes match chess.polyglot.zobrist_hash() and opening books
+ZOBRIST_KEYS = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+TURN_KEY = ZOBRIST_KEYS[780]
+
+_hasher = chess.polyglot.ZobristHasher(ZOBRIST_KEYS)
+
+_CASTLING_SQUARES = [(chess.BB_H1, 768), (chess.BB_A1, 769), (chess.BB_H8, 770), (chess.BB_A8, 771)]
+
+def _build_castling_keys():
+    keys = {}
+    for bits in range(16):
+        mask = 0
+        key = 0
+        for i, (bb, key_idx) in enumerate(_CASTLING_SQUARES):
+            if bits & (1 << i):
+                mask |= bb
+                key ^= ZOBRIST_KEYS[key_idx]
+        keys[mask] = key
+    return keys
+
+_CASTLING_KEYS = _build_castling_keys()
+_CORNERS = chess.BB_A1 | chess.BB_H1 | chess.BB_A8 | chess.BB_H8
+
+def piece_key(piece_type, color, square):
+    return ZOBRIST_KEYS[64 * ((piece_type - 1) * 2 + int(color)) + square]
+
+def zobrist_hash(board):
+    """
+    Full 64-bit Zobrist hash of a position (Polyglot compatible).
+    """
+    return _hasher(board)
+
+def castling_key(board):
+    if board.chess960:
+        return _hasher.hash_castling(board)
+    return _CASTLING_KEYS[board.clean_castling_rights() & _CORNERS]
+
+def ep_key(board):
+    return _hasher.hash_ep_square(board)
+
+def piece_delta(board, move):
+    """
+    XOR delta of the piece placement caused by pushing a pseudo-legal move.
+    Must be called before the move is pushed.
+    """
+    if not move:
+        return 0
+
+    color = board.turn
+    from_square = move.from_square
+    to_square = move.to_square
+    piece_type = board.piece_type_at(from_square)
+
+    if board.is_castling(move):
+        rank = chess.square_rank(from_square)
+        kingside = board.is_kingside_castling(move)
+        if board.piece_type_at(to_square) == chess.ROOK and board.color_at(to_square) == color:
+            rook_from = to_square
+        else:
+            rook_from = chess.square(7 if kingside else 0, rank)
+        king_to = chess.square(6 if kingside else 2, rank)
+        rook_to = chess.square(5 if kingside else 3, rank)
+        return (piece_key(chess.KING, color, from_square) ^ piece_key(chess.KING, color, king_to) ^
+                piece_key(chess.ROOK, color, rook_from) ^ piece_key(chess.ROOK, color, rook_to))
+
+    delta = piece_key(piece_type, color, from_square)
+    delta ^= piece_key(move.promotion or piece_type, color, to_square)
+
+    if board.is_en_passant(move):
+        captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+        delta ^= piece_key(chess.PAWN, not color, captured_square)
+    else:
+        captured_type = board.piece_type_at(to_square)
+        if captured_type:
+            delta ^= piece_key(captured_type, not color, to_square)
+
+    return delta
+
+class ZobristBoard(chess.Board):
+    """
+    chess.Board that keeps its Zobrist hash up to date on push/pop.
+    The hash lives in the ``zobrist`` attribute.
+
+    push/pop update it incrementally; every other public method that
+    changes the position (set_fen, clear, set_piece_at, apply_mirror, ...)
+    recomputes it. Assigning turn, castling_rights or ep_square directly
+    bypasses this, so call rehash() afterwards.
+    """
+    def __init__(self, fen=chess.STARTING_FEN, *, chess960=False):
+        self._zobrist_stack = []
+        # Board.__init__ goes through set_fen(), reset() or clear(), which hash
+        super().__init__(fen, chess960=chess960)
+
+    @classmethod
+    def from_board(cls, board):
+        return cls(board.fen(), chess960=board.chess960)
+
+    def rehash(self):
+        """
+        Recomputes the hash from scratch. Hashes saved for pop() are only
+        kept while the move stack is.
+        """
+        if not self.move_stack:
+            self._zobrist_stack = []
+        self.zobrist = zobrist_hash(self)
+
+    def push(self, move):
+        h = self.zobrist ^ piece_delta(self, move) ^ castling_key(self) ^ ep_key(self)
+        super().push(move)
+        self._zobrist_stack.append(self.zobrist)
+        self.zobrist = h ^ castling_key(self) ^ ep_key(self) ^ TURN_KEY
+
+    def pop(self):
+        move = super().pop()
+        self.zobrist = self._zobrist_stack.pop()
+        return move
+
+    def set_fen(self, fen):
+        super().set_fen(fen)
+        self.rehash()
+
+    def reset(self):
+        super().reset()
+        self.rehash()
+
+    def reset_board(self):
+        super().reset_board()
+        self.rehash()
+
+    def clear(self):
+        super().clear()
+        self.rehash()
+
+    def clear_board(self):
+        super().clear_board()
+        self.rehash()
+
+    def set_board_fen(self, fen):
+        super().set_board_fen(fen)
+        self.rehash()
+
+    def set_piece_map(self, pieces):
+        super().set_piece_map(pieces)
+        self.rehash()
+
+    def set_piece_at(self, square, piece, promoted=False):
+        super().set_piece_at(square, piece, promoted)
+        self.rehash()
+
+    def remove_piece_at(self, square):
+        piece = super().remove_piece_at(square)
+        self.rehash()
+        return piece
+
+    def set_castling_fen(self, castling_fen):
+        super().set_castling_fen(castling_fen)
+        self.rehash()
+
+    def set_chess960_pos(self, scharnagl):
+        super().set_chess960_pos(scharnagl)
+        self.rehash()
+
+    def apply_transform(self, f):
+        super().apply_transform(f)
+        self.rehash()
+
+    def apply_mirror(self):
+        super().apply_mirror()
+        self.rehash()
+
+    def root(self):
+        board = super().root()
+        board.rehash()
+        return board
+
+    def copy(self, *, stack=True):
+        board = super().copy(stack=stack)
+        board.zobrist = self.zobrist
+        if stack:
+            n = len(board.move_stack)
+            board._zobrist_stack = self._zobrist_stack[-n:] if n else []
+        return board
+
+class TranspositionTable:
+    """
+    Maps Zobrist hashes to graph node indices.
+
+    Each node remembers the (parent, move) that first reached it, so a FEN
+    string is only built when a caller actually asks for one.
+    """
+    def __init__(self, root_board):
+        self.root_fen = root_board.fen()
+        self.chess960 = root_board.chess960
+        self.index = {}
+        self.hashes = []
+        self.parents = []
+        self.moves = []
+        self._fens = {}
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, h):
+        return h in self.index
+
+    def get(self, h, default=None):
+        return self.index.get(h, default)
+
+    def add(self, h, parent=-1, move=None):
+        """
+        Returns the node index for hash h, creating the node if needed.
+        """
+        idx = self.index.get(h)
+        if idx is None:
+            idx = len(self.hashes)
+            self.index[h] = idx
+            self.hashes.append(h)
+            self.parents.append(parent)
+            self.moves.append(move)
+        return idx
+
+    def path(self, idx):
+        moves = []
+        while self.parents[idx] != -1:
+            moves.append(self.moves[idx])
+            idx = self.parents[idx]
+        moves.reverse()
+        return moves
+
+    def board(self, idx):
+        board = ZobristBoard(self.root_fen, chess960=self.chess960)
+        for move in self.path(idx):
+            board.push(move)
+        return board
+
+    def fen(self, idx):
+        fen = self._fens.get(idx)
+        if fen is None:
+            fen = self.board(idx).fen()
+            self._fens[idx] = fen
+        return fen
+
+    def index_of(self, board):
+        """
+        Node index of a board position, or None if it is not in the table.
+        """
+        h = board.zobrist if isinstance(board, ZobristBoard) else zobrist_hash(board)
+        return self.index.get(h)
+
+    @property
+    def fen_to_idx(self):
+        return FenToIndex(self)
+
+    @property
+    def idx_to_fen(self):
+        return IndexToFen(self)
+
+class FenToIndex(Mapping):
+    """
+    Read-only FEN -> node index view over a TranspositionTable.
+    Lookups hash the FEN's position, so move counters are ignored.
+    """
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, fen):
+        try:
+            idx = self.table.index_of(chess.Board(fen, chess960=self.table.chess960))
+        except ValueError:
+            idx = None
+        if idx is None:
+            raise KeyError(fen)
+        return idx
+
+    def __iter__(self):
+        for idx in range(len(self.table)):
+            yield self.table.fen(idx)
+
+    def __len__(self):
+        return len(self.table)
+
+class IndexToFen(Mapping):
+    """
+    Read-only node index -> FEN view over a TranspositionTable.
+    """
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, idx):
+        try:
+            i = operator.index(idx)
+        except TypeError:
+            raise KeyError(idx)
+        if not 0 <= i < len(self.table):
+            raise KeyError(idx)
+        return self.table.fen(i)
+
+    def __iter__(self):
+        return iter(range(len(self.table)))
+
+    def __len__(self):
+        return len(self.table)
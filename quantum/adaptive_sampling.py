@@ -0,0 +1,55 @@
+import math
+
+# Shots per batch and the z-score the leader's margin must exceed
+ADAPTIVE_BATCH_SHOTS = 32
+CONFIDENCE_Z = 3.0
+
+def leader_separated(counts, total, z=CONFIDENCE_Z):
+    """
+    True when the most frequent outcome leads the runner-up by more than z
+    standard errors of the difference of their multinomial counts,
+    sqrt(a + b - (a - b)^2 / total), with one extra count so that a
+    single observed outcome is not taken as certain.
+    """
+    if total == 0:
+        return False
+    top = sorted(counts.values(), reverse=True)[:2]
+    a = top[0] if top else 0
+    b = top[1] if len(top) > 1 else 0
+    lead = a - b
+    return lead > z * math.sqrt(max(a + b - lead * lead / total, 0) + 1)
+
+def sample_adaptively(draw, max_shots, batch_shots=ADAPTIVE_BATCH_SHOTS, z=CONFIDENCE_Z, groups=None):
+    """
+    Draws shots in batches until the leading candidate is separated from
+    the runner-up (see leader_separated) or max_shots have been taken.
+
+    Args:
+        draw: draw(shots) returns a dictionary of counts per outcome
+        max_shots: Hard cap on the total number of shots
+        batch_shots: Shots per batch
+        z: Confidence bound for stopping
+        groups: Optional mapping from outcome to the candidate it counts
+            for; outcomes missing from it are ignored by the stopping rule
+
+    Returns:
+        (counts, shots_used) with the counts summed over all batches
+    """
+    counts = {}
+    used = 0
+    while used < max_shots:
+        shots = min(batch_shots, max_shots - used)
+        for outcome, count in draw(shots).items():
+            counts[outcome] = counts.get(outcome, 0) + count
+        used += shots
+        if groups is None:
+            candidates = counts
+        else:
+            candidates = {}
+            for outcome, count in counts.items():
+                group = groups.get(outcome)
+                if group is not None:
+                    candidates[group] = candidates.get(group, 0) + count
+        if leader_separated(candidates, used, z):
+            break
+    return counts, used
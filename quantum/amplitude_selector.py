@@ -1,37 +1,100 @@
 import numpy as np
 from math import ceil, log2
-from qiskit import QuantumCircuit, transpile
-from qiskit_aer import Aer
+from quantum.backends import run_circuit, load_qiskit, next_seed
+from quantum.selector_stats import stage, record, current_stats
+from quantum.adaptive_sampling import sample_adaptively, ADAPTIVE_BATCH_SHOTS
 
-def amplitude_sample(scores, shots=512):
+SAMPLING_BACKENDS = ('exact', 'sampled', 'aer')
+
+def score_distribution(scores):
+    """
+    Measurement distribution of the amplitude-encoded state: amplitudes are
+    sqrt(max(score, 0)), so probabilities are the clipped scores normalized.
+    """
     arr = np.array(scores, dtype=float)
     arr = np.maximum(0, arr)
     if arr.sum() == 0:
         arr = np.ones_like(arr)
-    amps = np.sqrt(arr)
-    amps = amps / np.linalg.norm(amps)
-    m = len(amps)
-    n_qubits = int(ceil(log2(m)))
-    dim = 2**n_qubits
-    
-    padded = np.zeros(dim, dtype=complex)
-    padded[:m] = amps
-    
-    qc = QuantumCircuit(n_qubits)
-    qc.initialize(padded, qc.qubits)
-    qc.measure_all()
-    
-    backend = Aer.get_backend('aer_simulator')
-    t = transpile(qc, backend)
-    result = backend.run(t, shots=shots).result()
-    counts = result.get_counts()
-    
-    hist = {}
-    for bitstr, c in counts.items():
-        idx = int(bitstr[::-1], 2)
-        if idx < m:
-            hist[idx] = hist.get(idx, 0) + c
-    
+    return arr / arr.sum()
+
+def amplitude_sample(scores, shots=512, backend='aer', seed=None, adaptive=False,
+                     batch_shots=ADAPTIVE_BATCH_SHOTS):
+    """
+    Sample move indices with probability proportional to their scores.
+
+    Args:
+        scores: Move scores; negative scores are clipped to zero
+        shots: Number of measurements for the sampled backends, or the
+            hard cap on them when adaptive
+        backend: 'exact' returns the analytic distribution without sampling,
+            'sampled' draws shots with numpy.random.multinomial and 'aer'
+            prepares and measures the state on the Qiskit Aer simulator
+        seed: Optional seed for the 'sampled' backend; inside a
+            seeded_simulator block one is taken from it by default
+        adaptive: Measure in batches of batch_shots and stop as soon as the
+            most likely move is statistically separated from the runner-up
+            (see sample_adaptively); the shots used go to the selector stats
+
+    Returns:
+        (probs, hist) dictionaries keyed by move index. For 'exact' the
+        histogram holds expected counts.
+    """
+    if backend not in SAMPLING_BACKENDS:
+        raise ValueError(f"Unknown sampling backend: {backend}")
+
+    dist = score_distribution(scores)
+    m = len(dist)
+
+    if backend == 'exact':
+        # Keep the shots of an earlier sampled stage, e.g. a qiskit walk
+        stats = current_stats()
+        if stats is not None and stats.shots is None:
+            stats.shots = 0
+        probs = {i: float(p) for i, p in enumerate(dist) if p > 0}
+        hist = {i: p * shots for i, p in probs.items()}
+        return probs, hist
+
+    if backend == 'sampled':
+        rng = np.random.default_rng(seed if seed is not None else next_seed())
+
+        def draw(n):
+            return {i: int(c) for i, c in enumerate(rng.multinomial(n, dist)) if c > 0}
+
+        with stage('simulation'):
+            if adaptive:
+                hist, shots = sample_adaptively(draw, shots, batch_shots)
+            else:
+                hist = draw(shots)
+        record(shots=shots)
+        probs = {k: v/shots for k,v in hist.items()}
+        return probs, hist
+
+    with stage('circuit'):
+        amps = np.sqrt(dist)
+        n_qubits = int(ceil(log2(m)))
+        dim = 2**n_qubits
+
+        padded = np.zeros(dim, dtype=complex)
+        padded[:m] = amps
+
+        qc = load_qiskit().QuantumCircuit(n_qubits)
+        qc.initialize(padded, qc.qubits)
+        qc.measure_all()
+
+    def draw(n):
+        batch = {}
+        for bitstr, c in run_circuit(qc, n).items():
+            idx = int(bitstr, 2)
+            if idx < m:
+                batch[idx] = batch.get(idx, 0) + c
+        return batch
+
+    if adaptive:
+        hist, used = sample_adaptively(draw, shots, batch_shots)
+        record(shots=used)
+    else:
+        hist = draw(shots)
+
     total = sum(hist.values())
     probs = {k: v/total for k,v in hist.items()}
-    return probs, hist 
\ No newline at end of file
+    return probs, hist
@@ -0,0 +1,185 @@
+import contextvars
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+import numpy as np
+from quantum.selector_stats import current_stats, stage, record
+
+DEFAULT_BACKEND = 'aer_simulator'
+
+_backends = {}
+_backends_lock = threading.Lock()
+_qiskit = None
+_qiskit_lock = threading.Lock()
+_seed_rng = contextvars.ContextVar('simulator_seed', default=None)
+
+def load_qiskit():
+    """
+    Imports Qiskit on first use and returns the pieces this package needs:
+    QuantumCircuit, Parameter, ParameterExpression and transpile.
+    Nothing imports Qiskit at module level, so classical and exact code
+    paths never pay for it.
+    """
+    global _qiskit
+    if _qiskit is not None:
+        return _qiskit
+    with _qiskit_lock:
+        if _qiskit is None:
+            from qiskit import QuantumCircuit, transpile
+            from qiskit.circuit import Parameter, ParameterExpression
+            _qiskit = SimpleNamespace(QuantumCircuit=QuantumCircuit, Parameter=Parameter,
+                                      ParameterExpression=ParameterExpression, transpile=transpile)
+        return _qiskit
+
+def qiskit_loaded():
+    return _qiskit is not None
+
+def get_backend(name=DEFAULT_BACKEND):
+    """
+    Process-wide simulator registry: each backend is constructed once.
+    """
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            from qiskit_aer import Aer
+            backend = Aer.get_backend(name)
+            _backends[name] = backend
+        return backend
+
+def _param_key(param):
+    if isinstance(param, load_qiskit().ParameterExpression):
+        return str(param)
+    if isinstance(param, np.ndarray):
+        return (param.shape, param.tobytes())
+    if isinstance(param, (list, tuple)):
+        return tuple(_param_key(p) for p in param)
+    return param
+
+def circuit_key(qc):
+    """
+    Hashable description of a circuit's structure: registers, gates, the
+    qubits and clbits they act on, and their parameters.
+    """
+    instructions = []
+    for inst in qc.data:
+        instructions.append((
+            inst.operation.name,
+            tuple(qc.find_bit(q).index for q in inst.qubits),
+            tuple(qc.find_bit(c).index for c in inst.clbits),
+            tuple(_param_key(p) for p in inst.operation.params),
+        ))
+    registers = tuple((reg.name, reg.size) for reg in qc.cregs)
+    return (qc.num_qubits, registers, tuple(instructions))
+
+class CircuitCache:
+    """
+    LRU cache of transpiled circuits keyed by backend and circuit structure.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def compile(self, qc, backend):
+        key = (backend.name, circuit_key(qc))
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = load_qiskit().transpile(qc, backend)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+circuit_cache = CircuitCache()
+
+def compile_circuit(qc, backend=None):
+    """
+    Transpile qc for backend, reusing an earlier compilation of the same
+    circuit structure when possible.
+    """
+    if backend is None:
+        backend = get_backend()
+    return circuit_cache.compile(qc, backend)
+
+@contextmanager
+def seeded_simulator(seed):
+    """
+    Makes every simulator run and sampled draw inside the block
+    reproducible: each one takes the next seed from a generator seeded
+    with seed, so repeated runs differ from each other but not between
+    executions of the block.
+    """
+    token = _seed_rng.set(np.random.default_rng(seed))
+    try:
+        yield
+    finally:
+        _seed_rng.reset(token)
+
+def next_seed():
+    """
+    The next seed from the enclosing seeded_simulator block, or None.
+    """
+    rng = _seed_rng.get()
+    return None if rng is None else int(rng.integers(2**31))
+
+def _run_options(shots):
+    seed = next_seed()
+    return {'shots': shots} if seed is None else {'shots': shots, 'seed_simulator': seed}
+
+def run_circuit(qc, shots, backend_name=DEFAULT_BACKEND):
+    """
+    Compile (cached) and run qc on a shared backend, returning the counts.
+    """
+    backend = get_backend(backend_name)
+    with stage('transpile'):
+        compiled = compile_circuit(qc, backend)
+    if current_stats() is not None:
+        record(qubits=compiled.num_qubits, circuit_depth=compiled.depth(), shots=shots)
+    with stage('simulation'):
+        return backend.run(compiled, **_run_options(shots)).result().get_counts()
+
+def run_parameter_grid(qc, bindings, shots, backend_name=DEFAULT_BACKEND):
+    """
+    Compile a parameterized circuit once (cached), bind it to every
+    parameter dictionary in bindings and run them all as one batched job.
+    Returns one counts dictionary per binding.
+
+    Parameters are matched by name, since a cached compilation may hold
+    different Parameter objects than qc.
+    """
+    backend = get_backend(backend_name)
+    with stage('transpile'):
+        compiled = compile_circuit(qc, backend)
+        by_name = {param.name: param for param in compiled.parameters}
+        bound = [compiled.assign_parameters({by_name[getattr(k, 'name', k)]: v for k, v in binding.items()})
+                 for binding in bindings]
+    if current_stats() is not None:
+        record(qubits=compiled.num_qubits, circuit_depth=compiled.depth(), shots=shots * len(bound))
+    with stage('simulation'):
+        result = backend.run(bound, **_run_options(shots)).result()
+        return [result.get_counts(i) for i in range(len(bound))]
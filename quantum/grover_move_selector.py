@@ -1,12 +1,84 @@
+import sys
 import numpy as np
 import random
 import chess
 from chess_logic.move_eval import get_move_quality_score
-from quantum.quantum_walk import quantum_walk_scores, quick_prune, evaluate_position_with_true_qwalk
+from chess_logic.search import AlphaBetaSearch, alphabeta_move
+from chess_logic.batch_eval import material_move_scores
+from quantum.quantum_walk import quantum_walk_scores, quick_prune, evaluate_position_with_true_qwalk, evaluate_position_with_ctqw
 from quantum.amplitude_selector import amplitude_sample
 from quantum.qaoa_move_selector import qaoa_move_selector
+from quantum.selector_stats import collect_stats, stage, record, record_fallback
+
+def _cached_selection(cache, board, legal_moves, method_type, top_k, context, sampling_backend, adaptive_shots,
+                      walk_engine):
+    """
+    quantum_move_selector through an EvalCache. Only searches over every
+    legal move are cached, and results from a fallback are not stored.
+    """
+    legal = list(legal_moves)
+    if len(legal) != board.legal_moves.count():
+        return quantum_move_selector(board, legal, method_type, top_k, context, sampling_backend,
+                                     adaptive_shots=adaptive_shots, walk_engine=walk_engine)
+    params = {'top_k': top_k, 'sampling_backend': sampling_backend}
+    if adaptive_shots:
+        params['adaptive_shots'] = True
+    if walk_engine != 'sparse':
+        params['walk_engine'] = walk_engine
+    hit = cache.get(board, method_type, params)
+    if hit is not None:
+        record(cache='hit')
+        return hit
+    with collect_stats(method_type) as stats:
+        move, prob_map = quantum_move_selector(board, legal, method_type, top_k, context, sampling_backend,
+                                               adaptive_shots=adaptive_shots, walk_engine=walk_engine)
+        stats.cache = 'miss'
+    if stats.fallback is None:
+        cache.put(board, method_type, params, move, prob_map)
+    return move, prob_map
+
+def quantum_move_selector(board, legal_moves, method_type='quantum_walk', top_k=8, context=None,
+                          sampling_backend=None, return_stats=False, cache=None, book=None,
+                          adaptive_shots=False, walk_engine='sparse'):
+    """
+    Select a move with the given method. Pass a SearchContext as context to
+    reuse the move graph from earlier calls in the same game.
+    sampling_backend is forwarded to amplitude_sample ('exact', 'sampled'
+    or 'aer'); it defaults to 'exact' for the classical method and 'aer'
+    otherwise, so classical play never loads Qiskit.
+    With return_stats=True the result is (move, prob_map, stats), where
+    stats is a SelectorStats with the per-stage timings of this call.
+    Pass an EvalCache as cache to reuse earlier results for the same
+    position, method and parameters before any graph or circuit work, and
+    an OpeningBook as book to play book moves without searching at all.
+    adaptive_shots makes the sampled backends stop measuring once the
+    leading move is statistically clear, with 512 shots as the cap.
+    walk_engine picks the engine of the coined walk methods ('sparse' or
+    'qiskit', see run_true_quantum_walk); the qiskit engine samples its
+    circuit, adaptively with adaptive_shots, and only fits small graphs.
+    """
+    if return_stats:
+        with collect_stats(method_type) as stats:
+            move, prob_map = quantum_move_selector(board, legal_moves, method_type, top_k, context,
+                                                   sampling_backend, cache=cache, book=book,
+                                                   adaptive_shots=adaptive_shots, walk_engine=walk_engine)
+        return move, prob_map, stats
+
+    if book is not None:
+        legal_moves = list(legal_moves)
+        with stage('evaluation'):
+            book_hit = book.probe(board, legal_moves)
+        if book_hit is not None:
+            record(book=True)
+            return book_hit
+
+    if sampling_backend is None:
+        sampling_backend = 'exact' if method_type == 'classical' else 'aer'
+
+    if cache is not None:
+        return _cached_selection(cache, board, legal_moves, method_type, top_k, context, sampling_backend,
+                                 adaptive_shots, walk_engine)
 
-def quantum_move_selector(board, legal_moves, method_type='quantum_walk', top_k=8):
     legal = list(legal_moves)
     if len(legal) == 0:
         return None, {}
@@ -14,91 +86,74 @@ def quantum_move_selector(board, legal_moves, method_type='quantum_walk', top_k=
     if len(legal) == 1:
         return legal[0], {legal[0].uci(): 1.0}
 
+    if method_type == 'alphabeta':
+        # Classical negamax alpha-beta search
+        search = AlphaBetaSearch()
+        with stage('evaluation'):
+            best_move, _ = search.search(board, root_moves=legal)
+        record(nodes=search.nodes)
+        return best_move, {best_move.uci(): 1.0}
+
     if method_type == 'qaoa':
         # Use QAOA for move selection
         try:
             return qaoa_move_selector(board, legal_moves)
         except Exception as e:
-            print(f"QAOA failed, falling back to classical: {e}")
-            scores = []
-            for m in legal:
-                board.push(m)
-                s = 0
-                for sq in board.piece_map().keys():
-                    p = board.piece_at(sq)
-                    if p:
-                        s += {1:1,2:3,3:3,4:5,5:9,6:0}.get(p.piece_type,0) * (1 if p.color==board.turn else -1)
-                scores.append(s)
-                board.pop()
+            print(f"QAOA failed, falling back to classical: {e}", file=sys.stderr)
+            record_fallback(f"QAOA: {e}")
+            with stage('evaluation'):
+                scores = material_move_scores(board, legal).tolist()
     elif method_type == 'quantum_walk':
         # Use the new true quantum walk implementation
         try:
-            move_scores = evaluate_position_with_true_qwalk(board, depth=2)
+            with stage('graph'):
+                graph = context.graph_for(board, depth=2) if context else None
+            move_scores = evaluate_position_with_true_qwalk(board, depth=2, graph=graph, engine=walk_engine,
+                                                            adaptive=adaptive_shots)
             if move_scores:
                 # Convert to list format for compatibility
                 scores = [move_scores.get(m.uci(), 0.0) for m in legal]
             else:
                 # Fallback to old quantum walk
+                record_fallback("quantum walk: empty move graph, used the heuristic walk")
                 scores_map = quantum_walk_scores(board, depth=2)
                 scores = [scores_map.get(m, 0.0) for m in legal]
         except Exception as e:
-            print(f"True quantum walk failed, falling back to classical: {e}")
-            scores = []
-            for m in legal:
-                board.push(m)
-                s = 0
-                for sq in board.piece_map().keys():
-                    p = board.piece_at(sq)
-                    if p:
-                        s += {1:1,2:3,3:3,4:5,5:9,6:0}.get(p.piece_type,0) * (1 if p.color==board.turn else -1)
-                scores.append(s)
-                board.pop()
-    elif method_type == 'true_quantum_walk':
-        # Explicitly use the new true quantum walk
+            print(f"True quantum walk failed, falling back to classical: {e}", file=sys.stderr)
+            record_fallback(f"quantum walk: {e}")
+            with stage('evaluation'):
+                scores = material_move_scores(board, legal).tolist()
+    elif method_type in ('true_quantum_walk', 'continuous_quantum_walk'):
+        # Explicitly use the coined (discrete-time) or continuous-time walk
+        evaluate = evaluate_position_with_true_qwalk if method_type == 'true_quantum_walk' else evaluate_position_with_ctqw
         try:
-            move_scores = evaluate_position_with_true_qwalk(board, depth=2)
+            with stage('graph'):
+                graph = context.graph_for(board, depth=2) if context else None
+            if method_type == 'true_quantum_walk':
+                move_scores = evaluate(board, depth=2, graph=graph, engine=walk_engine, adaptive=adaptive_shots)
+            else:
+                move_scores = evaluate(board, depth=2, graph=graph)
             if move_scores:
                 scores = [move_scores.get(m.uci(), 0.0) for m in legal]
             else:
                 # Fallback to classical
-                scores = []
-                for m in legal:
-                    board.push(m)
-                    s = 0
-                    for sq in board.piece_map().keys():
-                        p = board.piece_at(sq)
-                        if p:
-                            s += {1:1,2:3,3:3,4:5,5:9,6:0}.get(p.piece_type,0) * (1 if p.color==board.turn else -1)
-                    scores.append(s)
-                    board.pop()
+                record_fallback(f"{method_type}: empty move graph")
+                with stage('evaluation'):
+                    scores = material_move_scores(board, legal).tolist()
         except Exception as e:
-            print(f"True quantum walk failed, falling back to classical: {e}")
-            scores = []
-            for m in legal:
-                board.push(m)
-                s = 0
-                for sq in board.piece_map().keys():
-                    p = board.piece_at(sq)
-                    if p:
-                        s += {1:1,2:3,3:3,4:5,5:9,6:0}.get(p.piece_type,0) * (1 if p.color==board.turn else -1)
-                scores.append(s)
-                board.pop()
+            print(f"True quantum walk failed, falling back to classical: {e}", file=sys.stderr)
+            record_fallback(f"{method_type}: {e}")
+            with stage('evaluation'):
+                scores = material_move_scores(board, legal).tolist()
     elif method_type == 'classical':
-        scores = []
-        for m in legal:
-            board.push(m)
-            s = 0
-            for sq in board.piece_map().keys():
-                p = board.piece_at(sq)
-                if p:
-                    s += {1:1,2:3,3:3,4:5,5:9,6:0}.get(p.piece_type,0) * (1 if p.color==board.turn else -1)
-            scores.append(s)
-            board.pop()
+        with stage('evaluation'):
+            scores = material_move_scores(board, legal).tolist()
     else:
         scores = []
-        for m in legal:
-            score = get_move_quality_score(board, m)
-            scores.append(score)
+        with stage('evaluation'):
+            for m in legal:
+                score = get_move_quality_score(board, m)
+                scores.append(score)
 
     if len(scores) <= 2:
         best_idx = int(np.argmax(scores))
@@ -110,7 +165,8 @@ def quantum_move_selector(board, legal_moves, method_type='quantum_walk', top_k=
     top_moves = [legal[i] for i in top_indices]
 
     try:
-        probs, raw_counts = amplitude_sample(top_scores, shots=512)
+        probs, raw_counts = amplitude_sample(top_scores, shots=512, backend=sampling_backend,
+                                             adaptive=adaptive_shots)
         if not probs:
             best_idx_local = 0
         else:
@@ -119,55 +175,56 @@ def quantum_move_selector(board, legal_moves, method_type='quantum_walk', top_k=
         prob_map = {top_moves[i].uci(): probs.get(i,0) for i in range(len(top_moves))}
         return chosen_move, prob_map
     except Exception as e:
-        print(f"Quantum sampling failed, falling back to classical: {e}")
+        print(f"Quantum sampling failed, falling back to classical: {e}", file=sys.stderr)
+        record_fallback(f"amplitude sampling: {e}")
         best_idx = int(np.argmax(scores))
         return legal[best_idx], {legal[best_idx].uci(): 1.0}
 
-def quantum_walk_selector(board, legal_moves):
-    try:
-        return quantum_move_selector(board, legal_moves, "quantum_walk")
-    except Exception as e:
-        print(f"Quantum walk failed, falling back to classical: {e}")
-        return classical_fallback(board, legal_moves), {}
+def _guarded_selector(board, legal_moves, method_type, label, context=None, return_stats=False):
+    """
+    quantum_move_selector with a last-resort classical fallback; the
+    stats, if requested, cover the fallback too.
+    """
+    with collect_stats(method_type, enabled=return_stats) as stats:
+        try:
+            move, prob_map = quantum_move_selector(board, legal_moves, method_type, context=context)
+        except Exception as e:
+            print(f"{label} failed, falling back to classical: {e}", file=sys.stderr)
+            record_fallback(f"{label}: {e}")
+            move, prob_map = classical_fallback(board, legal_moves), {}
+    if return_stats:
+        return move, prob_map, stats
+    return move, prob_map
+
+def quantum_walk_selector(board, legal_moves, context=None, return_stats=False):
+    return _guarded_selector(board, legal_moves, "quantum_walk", "Quantum walk", context, return_stats)
 
-def true_quantum_walk_selector(board, legal_moves):
+def true_quantum_walk_selector(board, legal_moves, context=None, return_stats=False):
     """
     New selector that explicitly uses the true quantum walk implementation.
     """
-    try:
-        return quantum_move_selector(board, legal_moves, "true_quantum_walk")
-    except Exception as e:
-        print(f"True quantum walk failed, falling back to classical: {e}")
-        return classical_fallback(board, legal_moves), {}
+    return _guarded_selector(board, legal_moves, "true_quantum_walk", "True quantum walk", context, return_stats)
+
+def continuous_quantum_walk_selector(board, legal_moves, context=None, return_stats=False):
+    """
+    Selector that scores moves with a continuous-time quantum walk.
+    """
+    return _guarded_selector(board, legal_moves, "continuous_quantum_walk", "Continuous quantum walk", context, return_stats)
 
-def qaoa_selector(board, legal_moves):
+def qaoa_selector(board, legal_moves, return_stats=False):
     """
     New selector that uses QAOA for move selection.
     """
-    try:
-        return quantum_move_selector(board, legal_moves, "qaoa")
-    except Exception as e:
-        print(f"QAOA failed, falling back to classical: {e}")
-        return classical_fallback(board, legal_moves), {}
+    return _guarded_selector(board, legal_moves, "qaoa", "QAOA", return_stats=return_stats)
 
-def quantum_grover_selector(board, legal_moves):
-    try:
-        return quantum_move_selector(board, legal_moves, "grover")
-    except Exception as e:
-        print(f"Quantum grover failed, falling back to classical: {e}")
-        return classical_fallback(board, legal_moves), {}
+def quantum_grover_selector(board, legal_moves, return_stats=False):
+    return _guarded_selector(board, legal_moves, "grover", "Quantum grover", return_stats=return_stats)
 
 def classical_fallback(board, legal_moves):
+    """
+    Best move by a shallow alpha-beta search over legal_moves.
+    """
     if not legal_moves:
         return None
     
-    best_move = None
-    best_score = float('-inf')
-    
-    for move in legal_moves:
-        score = get_move_quality_score(board, move)
-        if score > best_score:
-            best_score = score
-            best_move = move
-    
-    return best_move 
\ No newline at end of file
+    return alphabeta_move(board, list(legal_moves))
@@ -1,77 +1,44 @@
+import sys
 import numpy as np
-import chess
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from chess_logic.move_eval import get_move_quality_score
+from math import ceil, log2
+from quantum.backends import run_parameter_grid, load_qiskit
+from quantum.selector_stats import stage, record, record_fallback
+from chess_logic import move_eval
+from chess_logic.search import alphabeta_move
+from chess_logic.batch_eval import evaluate_board_states
 
 def evaluate_board_state(board, player_color):
     """
     Calculates a comprehensive static score for a board position.
     A positive score favors the player whose turn it is.
+    Uses material, mobility, king safety, center control and pawn structure.
     """
-    if board.is_checkmate():
-        return -10000 if board.turn == player_color else 10000
-    if board.is_stalemate() or board.is_insufficient_material():
-        return 0
-
-    # 1. Material Advantage
-    piece_values = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330, chess.ROOK: 500, chess.QUEEN: 900}
-    score = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            value = piece_values.get(piece.piece_type, 0)
-            if piece.color == player_color:
-                score += value
-            else:
-                score -= value
-    
-    # 2. Mobility: Number of legal moves
-    mobility = len(list(board.legal_moves))
-    score += 10 * mobility
-
-    # 3. King safety
-    if board.is_check():
-        score -= 50
-    
-    # 4. Center control (simplified)
-    center_squares = [chess.E4, chess.E5, chess.D4, chess.D5]
-    center_control = 0
-    for square in center_squares:
-        if board.piece_at(square):
-            piece = board.piece_at(square)
-            if piece.color == player_color:
-                center_control += 5
-            else:
-                center_control -= 5
-    score += center_control
-
-    # 5. Pawn structure (simplified)
-    pawn_structure = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece and piece.piece_type == chess.PAWN:
-            if piece.color == player_color:
-                # Bonus for advanced pawns
-                rank = chess.square_rank(square)
-                if player_color == chess.WHITE:
-                    pawn_structure += rank * 10
-                else:
-                    pawn_structure += (7 - rank) * 10
-    score += pawn_structure
+    return move_eval.evaluate_board_state(board, player_color, include_activity=False)
 
-    return score
+DEFAULT_GAMMAS = (0.5, 1.0, 1.5)
+DEFAULT_BETAS = (0.5, 1.0, 1.5)
+QAOA_ENCODINGS = ('binary', 'one_hot')
+QAOA_SIMULATORS = ('auto', 'analytic', 'aer')
 
-def create_simple_qaoa_circuit(move_scores, gamma=1.0, beta=1.0):
+# Instructions that do not change the pre-measurement state
+_NON_UNITARY = ('measure', 'barrier')
+
+def create_parameterized_qaoa_circuit(move_scores):
     """
-    Creates a simple QAOA circuit for move selection.
+    Creates the QAOA circuit for move selection with symbolic gamma and beta,
+    so it can be compiled once and bound to every grid point.
+    Returns (circuit, gamma, beta).
     """
     num_moves = len(move_scores)
     if num_moves == 0:
-        return None
+        return None, None, None
+    
+    qk = load_qiskit()
+    gamma = qk.Parameter('gamma')
+    beta = qk.Parameter('beta')
     
     # Create quantum circuit
-    qc = QuantumCircuit(num_moves, num_moves)
+    qc = qk.QuantumCircuit(num_moves, num_moves)
     
     # Initialize in equal superposition
     for i in range(num_moves):
@@ -79,7 +46,7 @@ def create_simple_qaoa_circuit(move_scores, gamma=1.0, beta=1.0):
     
     # Apply cost Hamiltonian (phase separator)
     for i in range(num_moves):
-        qc.rz(gamma * move_scores[i], i)
+        qc.rz(gamma * float(move_scores[i]), i)
     
     # Apply mixing Hamiltonian
     for i in range(num_moves):
@@ -88,12 +55,187 @@ def create_simple_qaoa_circuit(move_scores, gamma=1.0, beta=1.0):
     # Measure
     qc.measure_all()
     
-    return qc
+    return qc, gamma, beta
+
+def create_simple_qaoa_circuit(move_scores, gamma=1.0, beta=1.0):
+    """
+    Creates a simple QAOA circuit for move selection.
+    """
+    qc, gamma_param, beta_param = create_parameterized_qaoa_circuit(move_scores)
+    if qc is None:
+        return None
+    return qc.assign_parameters({gamma_param: gamma, beta_param: beta})
+
+def walsh_coefficients(values):
+    """
+    Coefficients a_S of the Z-basis expansion
+    values[x] = sum over S of a_S * (-1) ** popcount(x & S),
+    computed with a fast Walsh-Hadamard transform. len(values) must be a
+    power of two.
+    """
+    coeffs = np.array(values, dtype=float)
+    size = len(coeffs)
+    h = 1
+    while h < size:
+        pairs = coeffs.reshape(-1, 2, h)
+        coeffs = np.stack([pairs[:, 0] + pairs[:, 1], pairs[:, 0] - pairs[:, 1]], axis=1).reshape(size)
+        h *= 2
+    return coeffs / size
 
-def select_move_with_qaoa(board, shots=1024):
+def binary_cost_values(move_scores, num_qubits):
+    """
+    Scores rescaled to [0, 1] and padded to 2**num_qubits entries. Basis
+    states past the last move get the worst cost.
+    """
+    scores = np.array(move_scores, dtype=float)
+    span = scores.max() - scores.min()
+    values = np.zeros(2 ** num_qubits)
+    values[:len(scores)] = (scores - scores.min()) / span if span > 0 else 1.0
+    return values
+
+def create_binary_qaoa_circuit(move_scores):
+    """
+    Creates a QAOA circuit that encodes the move index in binary on
+    ceil(log2(n)) qubits, with symbolic gamma and beta.
+
+    The cost Hamiltonian is the Walsh-Hadamard expansion of the scores:
+    each non-zero Z-parity term becomes a CNOT ladder around one RZ.
+    Returns (circuit, gamma, beta).
+    """
+    num_moves = len(move_scores)
+    if num_moves == 0:
+        return None, None, None
+    
+    num_qubits = max(1, int(ceil(log2(num_moves))))
+    qk = load_qiskit()
+    gamma = qk.Parameter('gamma')
+    beta = qk.Parameter('beta')
+    
+    qc = qk.QuantumCircuit(num_qubits)
+    
+    # Initialize in equal superposition
+    for i in range(num_qubits):
+        qc.h(i)
+    
+    # Apply cost Hamiltonian (phase separator): exp(-i gamma a_S Z_S)
+    coeffs = walsh_coefficients(binary_cost_values(move_scores, num_qubits))
+    for subset in range(1, len(coeffs)):
+        if abs(coeffs[subset]) < 1e-9:
+            continue
+        qubits = [q for q in range(num_qubits) if subset >> q & 1]
+        for a, b in zip(qubits, qubits[1:]):
+            qc.cx(a, b)
+        qc.rz(2 * float(coeffs[subset]) * gamma, qubits[-1])
+        for a, b in reversed(list(zip(qubits, qubits[1:]))):
+            qc.cx(a, b)
+    
+    # Apply mixing Hamiltonian
+    for i in range(num_qubits):
+        qc.rx(beta, i)
+    
+    qc.measure_all()
+    
+    return qc, gamma, beta
+
+def is_product_circuit(qc):
+    """
+    True if no gate in qc acts on more than one qubit, so its output
+    distribution factorizes per qubit.
+    """
+    return all(len(inst.qubits) == 1 for inst in qc.data if inst.operation.name not in _NON_UNITARY)
+
+def product_state_marginals(qc):
+    """
+    Probability of measuring 1 on each qubit of a bound circuit made only
+    of single-qubit gates, computed by applying each gate's 2x2 matrix to
+    its qubit's own state vector.
+    """
+    states = np.zeros((qc.num_qubits, 2), dtype=complex)
+    states[:, 0] = 1
+    for inst in qc.data:
+        if inst.operation.name in _NON_UNITARY:
+            continue
+        if len(inst.qubits) != 1:
+            raise ValueError(f"Entangling gate {inst.operation.name} in a product-state circuit")
+        q = qc.find_bit(inst.qubits[0]).index
+        states[q] = inst.operation.to_matrix() @ states[q]
+    return np.abs(states[:, 1]) ** 2
+
+def one_hot_move_distribution(marginals):
+    """
+    Exact distribution of bitstring.rfind('1') for independent qubits.
+
+    Qubit q is printed at position n - 1 - q, so rfind('1') names move
+    n - 1 - q when q is the lowest qubit measured as 1:
+    P(move n - 1 - q) = p_q * prod over j < q of (1 - p_j).
+    Returns {move index: probability}; the all-zero outcome names no move.
+    """
+    marginals = np.asarray(marginals, dtype=float)
+    n = len(marginals)
+    none_before = np.concatenate(([1.0], np.cumprod(1 - marginals)[:-1]))
+    probs = marginals * none_before
+    return {n - 1 - q: float(p) for q, p in enumerate(probs) if p > 0}
+
+def binary_move_distribution(marginals, num_moves):
+    """
+    Exact distribution of int(bitstring, 2) for independent qubits, where
+    qubit q holds bit q of the move index. Indices past the last move are
+    dropped.
+    """
+    probs = np.ones(1)
+    for p in marginals:
+        probs = np.concatenate((probs * (1 - p), probs * p))
+    return {i: float(p) for i, p in enumerate(probs[:num_moves]) if p > 0}
+
+def _move_histogram(counts, num_moves, encoding):
+    """
+    Maps measured bitstrings to move indices, dropping outcomes that do
+    not name a move.
+    """
+    hist = {}
+    for bitstring, count in counts.items():
+        if encoding == 'binary':
+            move_index = int(bitstring, 2)
+        else:
+            move_index = bitstring.rfind('1')
+            if move_index == -1:
+                continue
+        if move_index < num_moves:
+            hist[move_index] = hist.get(move_index, 0) + count
+    return hist
+
+def select_move_with_qaoa(board, shots=1024, gamma_values=DEFAULT_GAMMAS, beta_values=DEFAULT_BETAS,
+                          encoding='binary', top_k=None, simulator='auto'):
     """
     Selects the best move using a simplified QAOA approach.
+    
+    The circuit is built once with symbolic gamma/beta and every point of the
+    gamma_values x beta_values grid is submitted in a single batched job.
+    The grid point with the highest expected move score wins, and its most
+    frequent move is played.
+    
+    Args:
+        board: Position to move in
+        shots: Measurements per grid point
+        gamma_values, beta_values: QAOA angle grid
+        encoding: 'binary' stores the move index on ceil(log2(n)) qubits;
+            'one_hot' uses one qubit per move
+        top_k: If set, only the top_k moves by static score are encoded
+        simulator: 'analytic' computes exact outcome probabilities for
+            circuits without entangling gates, which only the one_hot
+            encoding builds; 'aer' samples shots on the Aer simulator and
+            'auto' picks analytic whenever the circuit allows it
+    
+    Returns:
+        (best_move, prob_map) with probabilities keyed by move UCI
     """
+    if encoding not in QAOA_ENCODINGS:
+        raise ValueError(f"Unknown QAOA encoding: {encoding}")
+    if simulator not in QAOA_SIMULATORS:
+        raise ValueError(f"Unknown QAOA simulator: {simulator}")
+    if simulator == 'analytic' and encoding != 'one_hot':
+        raise ValueError(f"The analytic QAOA simulator needs the one_hot encoding, not {encoding}")
+    
     legal_moves = list(board.legal_moves)
     if not legal_moves:
         return None, {}
@@ -101,13 +243,21 @@ def select_move_with_qaoa(board, shots=1024):
     if len(legal_moves) == 1:
         return legal_moves[0], {legal_moves[0].uci(): 1.0}
 
-    # 1. Evaluate the outcome of each legal move
-    move_scores = []
-    for move in legal_moves:
-        temp_board = board.copy()
-        temp_board.push(move)
-        score = evaluate_board_state(temp_board, board.turn)
-        move_scores.append(score)
+    # 1. Evaluate the outcome of each legal move in one batch
+    with stage('evaluation'):
+        children = []
+        for move in legal_moves:
+            temp_board = board.copy(stack=False)
+            temp_board.push(move)
+            children.append(temp_board)
+        move_scores = evaluate_board_states(children, board.turn, include_activity=False)
+
+    # Keep the strongest candidates only
+    if top_k and len(legal_moves) > top_k:
+        keep = np.argsort(-move_scores, kind='stable')[:top_k]
+        legal_moves = [legal_moves[i] for i in keep]
+        move_scores = move_scores[keep]
+    move_scores = move_scores.tolist()
 
     # Normalize scores to be positive
     min_score = min(move_scores)
@@ -116,52 +266,55 @@ def select_move_with_qaoa(board, shots=1024):
 
     # 2. Create and run QAOA circuit
     try:
-        # Try different parameter combinations
-        best_result = None
-        best_prob = 0
+        with stage('circuit'):
+            if encoding == 'binary':
+                qc, gamma, beta = create_binary_qaoa_circuit(move_scores)
+            else:
+                qc, gamma, beta = create_parameterized_qaoa_circuit(move_scores)
+            grid = [{gamma: g, beta: b} for g in gamma_values for b in beta_values]
+            analytic = simulator == 'analytic' or (simulator == 'auto' and is_product_circuit(qc))
+        if analytic:
+            record(qubits=qc.num_qubits, circuit_depth=qc.depth(), shots=0)
+            with stage('simulation'):
+                marginals = [product_state_marginals(qc.assign_parameters(point)) for point in grid]
+                if encoding == 'binary':
+                    hists = [binary_move_distribution(p, len(legal_moves)) for p in marginals]
+                else:
+                    hists = [one_hot_move_distribution(p) for p in marginals]
+        else:
+            all_counts = run_parameter_grid(qc, grid, shots, 'qasm_simulator')
+            with stage('postprocess'):
+                hists = [_move_histogram(counts, len(legal_moves), encoding) for counts in all_counts]
         
-        for gamma in [0.5, 1.0, 1.5]:
-            for beta in [0.5, 1.0, 1.5]:
-                qc = create_simple_qaoa_circuit(move_scores, gamma, beta)
-                if qc is None:
+        # Pick the grid point with the highest expected score
+        best_hist = None
+        best_expectation = float('-inf')
+        with stage('postprocess'):
+            for hist in hists:
+                total = sum(hist.values())
+                if total == 0:
                     continue
-                
-                # Execute circuit
-                backend = Aer.get_backend('qasm_simulator')
-                job = backend.run(qc, shots=shots)
-                counts = job.result().get_counts()
-                
-                # Find the bitstring with highest probability
-                for bitstring, count in counts.items():
-                    prob = count / shots
-                    if prob > best_prob:
-                        best_prob = prob
-                        best_result = bitstring
+                expectation = sum(move_scores[i] * c for i, c in hist.items()) / total
+                if expectation > best_expectation:
+                    best_expectation = expectation
+                    best_hist = hist
         
-        if best_result:
-            # Find the move corresponding to the best bitstring
-            best_move_index = best_result.rfind('1')
-            if best_move_index != -1 and best_move_index < len(legal_moves):
-                best_move = legal_moves[best_move_index]
-                
-                # Create probability map
-                prob_map = {}
-                for bitstring, count in counts.items():
-                    move_index = bitstring.rfind('1')
-                    if move_index != -1 and move_index < len(legal_moves):
-                        move_uci = legal_moves[move_index].uci()
-                        prob_map[move_uci] = count / shots
-                
-                return best_move, prob_map
+        if best_hist:
+            total = sum(best_hist.values())
+            best_move = legal_moves[max(best_hist, key=best_hist.get)]
+            prob_map = {legal_moves[i].uci(): c / total for i, c in best_hist.items()}
+            return best_move, prob_map
         
         # Fallback: return move with highest score
+        record_fallback("QAOA: no valid measurement outcomes")
         best_index = np.argmax(move_scores)
         best_move = legal_moves[best_index]
         prob_map = {best_move.uci(): 1.0}
         return best_move, prob_map
         
     except Exception as e:
-        print(f"QAOA failed, falling back to classical: {e}")
+        print(f"QAOA failed, falling back to classical: {e}", file=sys.stderr)
+        record_fallback(f"QAOA: {e}")
         # Fallback to classical selection
         best_index = np.argmax(move_scores)
         best_move = legal_moves[best_index]
@@ -175,15 +328,8 @@ def qaoa_move_selector(board, legal_moves):
     try:
         return select_move_with_qaoa(board)
     except Exception as e:
-        print(f"QAOA move selector failed, falling back to classical: {e}")
-        # Fallback to simple evaluation
-        best_move = None
-        best_score = float('-inf')
-        
-        for move in legal_moves:
-            score = get_move_quality_score(board, move)
-            if score > best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move, {best_move.uci(): 1.0} if best_move else (None, {}) 
\ No newline at end of file
+        print(f"QAOA move selector failed, falling back to classical: {e}", file=sys.stderr)
+        record_fallback(f"QAOA move selector: {e}")
+        # Fallback to alpha-beta search
+        best_move = alphabeta_move(board, list(legal_moves)) if legal_moves else None
+        return (best_move, {best_move.uci(): 1.0}) if best_move else (None, {})
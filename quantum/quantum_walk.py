@@ -1,24 +1,18 @@
-import networkx as nx
 import chess
 import math
 import copy
 import numpy as np
-from qiskit import QuantumCircuit
-from qiskit_aer import Aer
-from qiskit.circuit.library import MCMT
-from qiskit.quantum_info import Operator
-from qiskit.circuit import Parameter
+from quantum.backends import run_circuit, load_qiskit
+from quantum.sparse_walk import coined_walk, continuous_walk
+from quantum.selector_stats import stage, record
+from quantum.adaptive_sampling import sample_adaptively
+from chess_logic.move_graph import build_move_graph
+from chess_logic.move_eval import material_balance
 
 PIECE_VALUES = {chess.PAWN:1, chess.KNIGHT:3, chess.BISHOP:3, chess.ROOK:5, chess.QUEEN:9, chess.KING:0}
 
 def material_value(board):
-    val = 0
-    for sq in chess.SQUARES:
-        p = board.piece_at(sq)
-        if p:
-            v = PIECE_VALUES.get(p.piece_type, 0)
-            val += v if p.color == board.turn else -v
-    return val
+    return material_balance(board, board.turn, PIECE_VALUES)
 
 def position_heuristic(board):
     mat = material_value(board)
@@ -27,49 +21,39 @@ def position_heuristic(board):
     score = mat + 0.01 * mobility - 0.5 * king_in_check
     return score
 
-def build_subtree(board, depth):
-    G = nx.DiGraph()
-    start = board.fen()
-    def rec(b, d):
-        node = b.fen()
-        if d == 0:
-            return
-        for mv in list(b.legal_moves):
-            b.push(mv)
-            child = b.fen()
-            G.add_edge(node, child)
-            rec(b, d-1)
-            b.pop()
-    rec(board.copy(), depth)
-    return G
+def build_subtree(board, depth, max_nodes=None, max_bytes=None):
+    return build_move_graph(board, depth, max_nodes=max_nodes, max_bytes=max_bytes)
 
 def quantum_walk_scores(board, depth=2):
     scores = {}
-    base_board = board.copy()
-    start = base_board.fen()
-    G = build_subtree(base_board, depth)
+    with stage('graph'):
+        G = build_subtree(board, depth)
+    record(nodes=G.num_nodes, edges=G.num_edges)
+    heuristics = {}
     
-    for mv in list(base_board.legal_moves):
-        base_board.push(mv)
-        node = base_board.fen()
-        nodes = [node]
-        
-        for _ in range(depth-1):
-            next_nodes = []
+    def node_heuristic(n):
+        if n not in heuristics:
+            heuristics[n] = position_heuristic(G.board(n))
+        return heuristics[n]
+    
+    with stage('evaluation'):
+        for mv, child in G.moves_from(0):
+            nodes = [child]
+            
+            for _ in range(depth-1):
+                next_nodes = []
+                for n in nodes:
+                    next_nodes.extend(G.successors(n).tolist())
+                nodes = next_nodes if next_nodes else nodes
+            
+            agg = 0.0
+            count = 0
             for n in nodes:
-                next_nodes.extend(list(G.successors(n)))
-            nodes = next_nodes if next_nodes else nodes
-        
-        agg = 0.0
-        count = 0
-        for n in nodes:
-            b = chess.Board(n)
-            h = position_heuristic(b)
-            deg = max(1, G.out_degree(n))
-            agg += h * math.sqrt(deg)
-            count += 1
-        base_board.pop()
-        scores[mv] = (agg / count) if count>0 else position_heuristic(chess.Board(node))
+                h = node_heuristic(n)
+                deg = max(1, G.out_degree(n))
+                agg += h * math.sqrt(deg)
+                count += 1
+            scores[mv] = (agg / count) if count>0 else node_heuristic(child)
     
     return scores
 
@@ -84,221 +68,216 @@ def quick_prune(board, moves):
         pruned.append(m)
     return pruned
 
-def generate_move_graph(board, depth=2):
+WALK_ENGINES = ('sparse', 'qiskit')
+
+# Largest arc space the Qiskit demo engine will turn into a circuit
+QISKIT_MAX_ARCS = 64
+
+def _qiskit_walk_counts(walk, start_node_idx, steps, shots, adaptive=False, groups=None):
     """
-    Generate a graph of future board positions for quantum walk.
-    Returns adjacency list, FEN mappings, and move tree.
+    Runs the same coined walk as a circuit: the arc register is prepared in
+    the initial state and the one-step unitary is applied steps times.
+    Adaptive runs measure in batches until the leading group of nodes is
+    separated (see sample_adaptively); counts are rescaled to shots.
     """
-    G = nx.DiGraph()
-    fen_to_idx = {}
-    idx_to_fen = {}
-    move_tree = {}
-    node_counter = 0
+    if walk.num_arcs > QISKIT_MAX_ARCS:
+        raise ValueError(f"Graph too large for the qiskit engine: {walk.num_arcs} arcs > {QISKIT_MAX_ARCS}")
     
-    def add_node(fen):
-        nonlocal node_counter
-        if fen not in fen_to_idx:
-            fen_to_idx[fen] = node_counter
-            idx_to_fen[node_counter] = fen
-            node_counter += 1
-        return fen_to_idx[fen]
+    n_qubits = max(1, int(np.ceil(np.log2(walk.num_arcs))))
+    dim = 2**n_qubits
     
-    def build_graph(current_board, current_depth, parent_move=None):
-        current_fen = current_board.fen()
-        current_idx = add_node(current_fen)
-        
-        if current_depth == 0:
-            return current_idx
+    with stage('circuit'):
+        step = np.eye(dim)
+        step[:walk.num_arcs, :walk.num_arcs] = walk.unitary()
+        initial = np.zeros(dim)
+        initial[:walk.num_arcs] = walk.initial_state(start_node_idx)
         
-        legal_moves = list(current_board.legal_moves)
-        if not legal_moves:
-            return current_idx
-        
-        children = []
-        for move in legal_moves:
-            current_board.push(move)
-            child_fen = current_board.fen()
-            child_idx = add_node(child_fen)
-            
-            G.add_edge(current_idx, child_idx)
-            children.append((move, child_idx))
-            
-            if current_depth > 1:
-                build_graph(current_board, current_depth - 1, move)
-            
-            current_board.pop()
-        
-        if parent_move is not None:
-            move_tree[parent_move.uci()] = children
-        
-        return current_idx
+        qc = load_qiskit().QuantumCircuit(n_qubits)
+        qc.initialize(initial, qc.qubits)
+        for _ in range(steps):
+            qc.unitary(step, qc.qubits)
+        qc.measure_all()
     
-    start_idx = build_graph(board.copy(), depth)
-    
-    adj_list = {}
-    for node in G.nodes():
-        adj_list[node] = list(G.successors(node))
-    
-    return adj_list, fen_to_idx, idx_to_fen, move_tree
-
-def coin_operator(qc, coin_qubit):
-    """
-    Apply Hadamard gate to coin qubit for unbiased coin.
-    """
-    qc.h(coin_qubit)
-
-def shift_operator_simple(qc, graph, position_qubits, coin_qubit, num_nodes):
-    """
-    Simplified shift operator for quantum walk.
-    This is a basic implementation that works for small graphs.
-    """
-    n_position_qubits = len(position_qubits)
+    def draw(n):
+        # Measured arcs report the walker at their source node
+        results = {}
+        for bitstring, count in run_circuit(qc, n, 'qasm_simulator').items():
+            arc = int(bitstring, 2)
+            if arc < walk.num_arcs:
+                node_idx = int(walk.sources[arc])
+                results[node_idx] = results.get(node_idx, 0) + count
+        return results
     
-    for node_idx in range(num_nodes):
-        if node_idx >= 2**n_position_qubits:
-            break
-            
-        neighbors = graph.get(node_idx, [])
-        if len(neighbors) == 0:
-            continue
-        
-        # Convert node index to binary control state
-        control_state = format(node_idx, f'0{n_position_qubits}b')
-        
-        # For simplicity, we'll implement a basic controlled operation
-        # that swaps between the current node and its first neighbor
-        if len(neighbors) > 0:
-            target_node = neighbors[0]
-            
-            # Create multi-controlled X gates to transform the state
-            # This is a simplified approach - in practice, you'd need more sophisticated
-            # state transformation logic
-            
-            # For now, we'll use a placeholder that represents the intent
-            # In a full implementation, you'd need to carefully construct
-            # the state transformation based on the graph structure
-            
-            # This is a conceptual representation - the actual implementation
-            # would require careful construction of multi-controlled gates
-            pass
+    if not adaptive:
+        return draw(shots)
+    results, used = sample_adaptively(draw, shots, groups=groups)
+    record(shots=used)
+    return {node_idx: count * shots / used for node_idx, count in results.items()}
 
-def run_true_quantum_walk(graph, start_node_idx, steps=3):
+def run_true_quantum_walk(graph, start_node_idx, steps=3, engine='sparse', shots=2048, adaptive=False,
+                          groups=None):
     """
-    Runs a true quantum walk on the given graph using Qiskit.
+    Runs a coined quantum walk (Grover coin, flip-flop shift) on the
+    undirected version of the given graph.
     
     Args:
-        graph: Adjacency list where keys and values are integer indices
+        graph: MoveGraph, or adjacency list where keys and values are integer indices
         start_node_idx: Starting node index
         steps: Number of walk steps to perform
+        engine: 'sparse' evolves the arc state with sparse matrix-vector
+            products and returns exact expected counts; 'qiskit' builds
+            the walk unitary into a circuit and samples it (small graphs only)
+        shots: Number of measurements the counts are scaled to
+        adaptive: For the qiskit engine, stop measuring once the leading
+            node (or group of nodes, see groups) is separated from the
+            runner-up; shots is then the hard cap
+        groups: Optional mapping from node index to the candidate it
+            counts for in the adaptive stopping rule
     
     Returns:
         Dictionary mapping final node indices to measurement counts
     """
-    num_nodes = len(graph)
+    if engine not in WALK_ENGINES:
+        raise ValueError(f"Unknown walk engine: {engine}")
+    
+    num_nodes = graph.num_nodes if hasattr(graph, 'offsets') else len(graph)
     if num_nodes == 0:
         return {}
     
-    n_position_qubits = int(np.ceil(np.log2(max(num_nodes, 1))))
-    position_qubits = list(range(n_position_qubits))
-    coin_qubit = n_position_qubits
+    if engine == 'qiskit':
+        with stage('circuit'):
+            walk = coined_walk(graph)
+        return _qiskit_walk_counts(walk, start_node_idx, steps, shots, adaptive, groups)
     
-    # Create quantum circuit
-    qc = QuantumCircuit(n_position_qubits + 1, n_position_qubits)
+    record(shots=0)
+    with stage('simulation'):
+        probs = coined_walk(graph).run(start_node_idx, steps)
+    return {int(i): float(probs[i]) * shots for i in np.flatnonzero(probs > 1e-12)}
+
+def root_move_of_nodes(graph):
+    """
+    For every node, the root child whose subtree (following first-parent
+    pointers) contains it; -1 for the root itself.
+    """
+    parents = graph.parents.astype(np.int64)
+    owner = np.arange(graph.num_nodes, dtype=np.int64)
+    while True:
+        up = parents[owner]
+        climb = up > 0
+        if not climb.any():
+            break
+        owner[climb] = up[climb]
+    owner[0] = -1
+    return owner
+
+def subtree_totals(graph, node_values):
+    """
+    Sums per-node values over the subtree of each first-level move.
+    Returns a dictionary keyed by root child index.
+    """
+    owner = root_move_of_nodes(graph)
+    mask = owner >= 0
+    totals = np.bincount(owner[mask], weights=np.asarray(node_values)[mask], minlength=graph.num_nodes)
+    return {child: float(totals[child]) for child in graph.root_children().values()}
+
+def evaluate_position_with_true_qwalk(board, depth=2, graph=None, engine='sparse', adaptive=False):
+    """
+    Evaluate position using true quantum walk.
     
-    # Initialize walker position
-    start_binary = format(start_node_idx, f'0{n_position_qubits}b')
-    for i, bit in enumerate(reversed(start_binary)):
-        if bit == '1':
-            qc.x(i)
-    qc.barrier()
+    Args:
+        board: Chess board position
+        depth: Depth of exploration
+        graph: Optional MoveGraph already rooted at board (e.g. from a
+            SearchContext); built from scratch when omitted
+        engine: Walk engine, see run_true_quantum_walk
+        adaptive: Sample the qiskit engine adaptively, stopping once one
+            root move's subtree clearly leads
     
-    # Perform walk steps
-    for step in range(steps):
-        # Apply coin operator
-        coin_operator(qc, coin_qubit)
-        qc.barrier()
-        
-        # Apply shift operator (simplified version)
-        # In a full implementation, this would use the complex shift_operator_simple
-        # For now, we'll use a basic approach that represents the quantum walk concept
-        
-        # For demonstration, we'll add some basic quantum operations
-        # that represent the quantum walk process
-        for i in range(n_position_qubits):
-            qc.h(i)
-        qc.barrier()
-        
-        # Apply controlled operations based on coin state
-        for i in range(n_position_qubits):
-            qc.cx(coin_qubit, i)
-        qc.barrier()
+    Returns:
+        Dictionary mapping move UCI strings to scores
+    """
+    if graph is None:
+        with stage('graph'):
+            graph = build_move_graph(board, depth)
+    record(nodes=graph.num_nodes, edges=graph.num_edges)
     
-    # Measure position register
-    qc.measure(position_qubits, list(range(n_position_qubits)))
+    if graph.num_edges == 0:
+        return {}
     
-    # Execute circuit
-    backend = Aer.get_backend('qasm_simulator')
-    job = backend.run(qc, shots=2048)
-    counts = job.result().get_counts()
+    # Run the quantum walk from the root node
+    groups = None
+    if adaptive:
+        owner = root_move_of_nodes(graph)
+        groups = {idx: int(root) for idx, root in enumerate(owner) if root >= 0}
+    final_counts = run_true_quantum_walk(graph, 0, steps=depth, engine=engine, adaptive=adaptive, groups=groups)
     
-    # Convert binary counts back to integer node indices
-    results = {}
-    for bitstring, count in counts.items():
-        node_idx = int(bitstring, 2)
-        if node_idx < num_nodes:  # Only include valid nodes
-            results[node_idx] = count
+    # Sum the walk's counts over the subtree below each first-level move
+    with stage('postprocess'):
+        node_counts = np.zeros(graph.num_nodes)
+        for node_idx, count in final_counts.items():
+            node_counts[node_idx] = count
+        subtree_counts = subtree_totals(graph, node_counts)
     
-    return results
+    # Calculate scores for the first-level moves
+    move_scores = {}
+    legal_moves = list(board.legal_moves)
+    children = graph.root_children()
+    
+    with stage('evaluation'):
+        for move in legal_moves:
+            move_uci = move.uci()
+            score = subtree_counts.get(children.get(move_uci), 0)
+            
+            # Add heuristic score for positions not reached by quantum walk
+            board.push(move)
+            heuristic_score = position_heuristic(board)
+            board.pop()
+            
+            # Combine quantum and heuristic scores
+            move_scores[move_uci] = score + heuristic_score * 0.1
+    
+    return move_scores
+
 
-def evaluate_position_with_true_qwalk(board, depth=2):
+CTQW_TIMES = (0.5, 1.0, 1.5, 2.0)
+
+def evaluate_position_with_ctqw(board, depth=2, graph=None, times=CTQW_TIMES, hamiltonian='laplacian', shots=2048):
     """
-    Evaluate position using true quantum walk.
+    Evaluate position using a continuous-time quantum walk exp(-iHt) from
+    the root of the move graph.
     
     Args:
         board: Chess board position
         depth: Depth of exploration
+        graph: Optional MoveGraph already rooted at board
+        times: Walk times; their node probabilities are averaged
+        hamiltonian: 'laplacian' or 'adjacency'
+        shots: Scale of the walk score, matching the sampled walks' counts
     
     Returns:
         Dictionary mapping move UCI strings to scores
     """
-    # Generate graph and mappings
-    adj_list, fen_to_idx, idx_to_fen, move_tree = generate_move_graph(board, depth)
+    if graph is None:
+        with stage('graph'):
+            graph = build_move_graph(board, depth)
+    record(nodes=graph.num_nodes, edges=graph.num_edges)
     
-    if not adj_list:
+    if graph.num_edges == 0:
         return {}
     
-    start_fen = board.fen()
-    start_idx = fen_to_idx.get(start_fen, 0)
+    record(shots=0)
+    with stage('simulation'):
+        probs = continuous_walk(graph, hamiltonian).probabilities(0, times).mean(axis=0)
+    with stage('postprocess'):
+        totals = subtree_totals(graph, probs * shots)
     
-    # Run the quantum walk
-    final_counts = run_true_quantum_walk(adj_list, start_idx, steps=depth)
-    
-    # Calculate scores for the first-level moves
     move_scores = {}
-    legal_moves = list(board.legal_moves)
-    
-    for move in legal_moves:
-        move_uci = move.uci()
-        score = 0
-        
-        # Find all descendant leaf nodes for this move
-        board.push(move)
-        move_fen = board.fen()
-        board.pop()
-        
-        # Calculate score based on quantum walk results
-        # This is a simplified scoring - in practice, you'd trace the full tree
-        if move_fen in fen_to_idx:
-            move_idx = fen_to_idx[move_fen]
-            if move_idx in final_counts:
-                score += final_counts[move_idx]
-        
-        # Add heuristic score for positions not reached by quantum walk
-        board.push(move)
-        heuristic_score = position_heuristic(board)
-        board.pop()
-        
-        # Combine quantum and heuristic scores
-        move_scores[move_uci] = score + heuristic_score * 0.1
+    with stage('evaluation'):
+        for move_uci, child in graph.root_children().items():
+            move = chess.Move.from_uci(move_uci)
+            board.push(move)
+            heuristic_score = position_heuristic(board)
+            board.pop()
+            move_scores[move_uci] = totals[child] + heuristic_score * 0.1
     
-    return move_scores 
\ No newline at end of file
+    return move_scores
@@ -0,0 +1,113 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+# Stage names in the order they normally run
+STAGES = ('graph', 'evaluation', 'circuit', 'transpile', 'simulation', 'postprocess')
+
+_active = contextvars.ContextVar('selector_stats', default=None)
+
+class SelectorStats:
+    """
+    What one move selection spent its time on.
+
+    stages holds wall time in milliseconds per stage (see STAGES); stages
+    do not nest, so the rest of total_ms is bookkeeping outside them.
+    nodes/edges describe the move graph, qubits/circuit_depth the last
+    compiled circuit and shots the total measurements taken. fallback is
+    the reason a classical fallback fired, or None; cache is 'hit' or
+    'miss' when an EvalCache was consulted, and book is True when the move
+    came from the opening book.
+    """
+    def __init__(self, method=None):
+        self.method = method
+        self.stages = {}
+        self.nodes = None
+        self.edges = None
+        self.qubits = None
+        self.circuit_depth = None
+        self.shots = None
+        self.fallback = None
+        self.cache = None
+        self.book = False
+        self.total_ms = 0.0
+
+    def add_stage(self, name, ms):
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'total_ms': self.total_ms,
+            'stages_ms': {name: self.stages[name] for name in sorted(self.stages, key=_stage_order)},
+            'nodes': self.nodes,
+            'edges': self.edges,
+            'qubits': self.qubits,
+            'circuit_depth': self.circuit_depth,
+            'shots': self.shots,
+            'fallback': self.fallback,
+            'cache': self.cache,
+            'book': self.book,
+        }
+
+def _stage_order(name):
+    return STAGES.index(name) if name in STAGES else len(STAGES)
+
+def current_stats():
+    """
+    The SelectorStats being collected in this context, or None.
+    """
+    return _active.get()
+
+@contextmanager
+def collect_stats(method=None, enabled=True):
+    """
+    Collects stats for everything run inside the block and yields the
+    SelectorStats (None when not enabled). Nested blocks reuse the outer
+    collector, so a wrapper and the selector it calls share one object.
+    """
+    outer = _active.get()
+    if not enabled or outer is not None:
+        yield outer if enabled else None
+        return
+    stats = SelectorStats(method)
+    token = _active.set(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.total_ms = (time.perf_counter() - start) * 1000
+        _active.reset(token)
+
+@contextmanager
+def stage(name):
+    """
+    Adds the block's wall time to stage name when stats are being collected.
+    """
+    stats = _active.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_stage(name, (time.perf_counter() - start) * 1000)
+
+def record(**values):
+    """
+    Sets counters (nodes, edges, qubits, circuit_depth, shots, cache, book)
+    on the active stats, if any.
+    """
+    stats = _active.get()
+    if stats is not None:
+        for key, value in values.items():
+            setattr(stats, key, value)
+
+def record_fallback(reason):
+    """
+    Notes that a fallback fired; the first reason is kept.
+    """
+    stats = _active.get()
+    if stats is not None and stats.fallback is None:
+        stats.fallback = reason
@@ -0,0 +1,232 @@
+import numpy as np
+
+def _sparse():
+    # scipy is only imported once a walk is actually run
+    from scipy import sparse
+    return sparse
+
+def adjacency_matrix(graph):
+    """
+    Symmetric 0/1 adjacency matrix (scipy CSR, sorted indices, no self
+    loops) of a MoveGraph or of a dictionary adjacency list.
+    """
+    if hasattr(graph, 'offsets'):
+        n = graph.num_nodes
+        rows = np.repeat(np.arange(n, dtype=np.int64), graph.out_degrees())
+        cols = graph.targets.astype(np.int64)
+    else:
+        n = len(graph)
+        rows = np.array([u for u, nbrs in graph.items() for _ in nbrs], dtype=np.int64)
+        cols = np.array([v for nbrs in graph.values() for v in nbrs], dtype=np.int64)
+        if len(rows):
+            n = max(n, int(rows.max()) + 1, int(cols.max()) + 1)
+    sparse = _sparse()
+    keep = rows != cols
+    rows, cols = rows[keep], cols[keep]
+    data = np.ones(2 * len(rows))
+    adj = sparse.csr_matrix((data, (np.concatenate((rows, cols)), np.concatenate((cols, rows)))), shape=(n, n))
+    adj.data[:] = 1.0
+    adj.sort_indices()
+    return adj
+
+class CoinedWalk:
+    """
+    Discrete-time coined quantum walk on an undirected graph, emulated with
+    sparse linear algebra.
+
+    The state lives on arcs: one amplitude per directed edge u -> v, stored
+    in the CSR order of the adjacency matrix, so the walker's position is
+    the arc's source. One step applies the Grover coin at every node
+    (2/d * J - I on its d outgoing arcs) and then the flip-flop shift
+    u -> v  =>  v -> u. Both operators are real, so amplitudes stay real.
+    """
+    def __init__(self, graph):
+        sparse = _sparse()
+        self.adjacency = adjacency_matrix(graph)
+        n = self.adjacency.shape[0]
+        num_arcs = self.adjacency.nnz
+        self.num_nodes = n
+        self.num_arcs = num_arcs
+        self.degrees = np.diff(self.adjacency.indptr)
+        self.sources = np.repeat(np.arange(n), self.degrees)
+
+        # Node-by-arc incidence: row u sums the arcs leaving u
+        self.incidence = sparse.csr_matrix(
+            (np.ones(num_arcs), np.arange(num_arcs), self.adjacency.indptr.copy()),
+            shape=(n, num_arcs))
+        self.inv_degree = np.divide(1.0, self.degrees, out=np.zeros(n), where=self.degrees > 0)
+
+        # Flip-flop shift as a permutation matrix: arc (u, v) -> arc (v, u)
+        arc_ids = sparse.csr_matrix((np.arange(num_arcs, dtype=float), self.adjacency.indices, self.adjacency.indptr),
+                                    shape=(n, n))
+        reverse = arc_ids.T.tocsr()
+        reverse.sort_indices()
+        self.reverse_arc = reverse.data.astype(np.int64)
+        self.shift = sparse.csr_matrix((np.ones(num_arcs), (self.reverse_arc, np.arange(num_arcs))),
+                                       shape=(num_arcs, num_arcs))
+
+    @property
+    def nbytes(self):
+        matrices = (self.adjacency, self.incidence, self.shift)
+        arrays = (self.degrees, self.sources, self.inv_degree, self.reverse_arc)
+        return sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in matrices) + \
+            sum(a.nbytes for a in arrays)
+
+    def initial_state(self, start):
+        """
+        Walker at start with equal amplitude on each of its outgoing arcs.
+        """
+        state = np.zeros(self.num_arcs)
+        begin, end = self.adjacency.indptr[start], self.adjacency.indptr[start + 1]
+        if end > begin:
+            state[begin:end] = 1.0 / np.sqrt(end - begin)
+        return state
+
+    def coin(self, state):
+        means = (self.incidence @ state) * self.inv_degree
+        return 2 * (self.incidence.T @ means) - state
+
+    def step(self, state):
+        return self.shift @ self.coin(state)
+
+    def node_probabilities(self, state):
+        return self.incidence @ (state * state)
+
+    def run(self, start, steps):
+        """
+        Exact node probabilities after steps walk steps from start.
+        """
+        if self.degrees[start] == 0:
+            probs = np.zeros(self.num_nodes)
+            probs[start] = 1.0
+            return probs
+        state = self.initial_state(start)
+        for _ in range(steps):
+            state = self.step(state)
+        return self.node_probabilities(state)
+
+    def unitary(self):
+        """
+        Dense one-step operator shift @ coin, for small demo circuits.
+        """
+        identity = np.eye(self.num_arcs)
+        return np.column_stack([self.step(column) for column in identity])
+
+def coined_walk(graph):
+    """
+    CoinedWalk for graph, cached on MoveGraph instances.
+    """
+    cache = getattr(graph, 'cache', None)
+    if cache is None:
+        return CoinedWalk(graph)
+    walk = cache.get('coined_walk')
+    if walk is None:
+        walk = CoinedWalk(graph)
+        cache['coined_walk'] = walk
+    return walk
+
+HAMILTONIANS = ('laplacian', 'adjacency')
+
+def walk_hamiltonian(graph, kind='laplacian'):
+    """
+    Sparse Hamiltonian of the undirected graph: the Laplacian D - A or the
+    adjacency matrix A.
+    """
+    if kind not in HAMILTONIANS:
+        raise ValueError(f"Unknown walk Hamiltonian: {kind}")
+    adj = adjacency_matrix(graph)
+    if kind == 'adjacency':
+        return adj
+    sparse = _sparse()
+    degrees = np.asarray(adj.sum(axis=1)).ravel()
+    return (sparse.diags(degrees) - adj).tocsr()
+
+def lanczos(matrix, start_vector, dim):
+    """
+    Lanczos tridiagonalization with full reorthogonalization.
+    Returns (ritz_values, ritz_vectors) of the Krylov space spanned by
+    start_vector, matrix @ start_vector, ..., with ritz_vectors shaped
+    (n, k) for k <= dim.
+    """
+    n = len(start_vector)
+    dim = min(dim, n)
+    basis = np.zeros((dim, n))
+    alpha = np.zeros(dim)
+    beta = np.zeros(dim)
+    basis[0] = start_vector / np.linalg.norm(start_vector)
+    size = dim
+    for j in range(dim):
+        w = matrix @ basis[j]
+        alpha[j] = basis[j] @ w
+        w -= basis[:j + 1].T @ (basis[:j + 1] @ w)
+        if j + 1 == dim:
+            break
+        beta[j] = np.linalg.norm(w)
+        if beta[j] < 1e-12:
+            size = j + 1
+            break
+        basis[j + 1] = w / beta[j]
+    tridiagonal = np.diag(alpha[:size]) + np.diag(beta[:size - 1], 1) + np.diag(beta[:size - 1], -1)
+    values, vectors = np.linalg.eigh(tridiagonal)
+    return values, basis[:size].T @ vectors
+
+# Largest graph given a dense eigendecomposition; past a few hundred nodes
+# its O(n^3) cost loses to a Lanczos decomposition per start node
+DENSE_LIMIT = 256
+
+class ContinuousWalk:
+    """
+    Continuous-time quantum walk |psi(t)> = exp(-iHt)|start> on a graph.
+
+    Graphs up to dense_limit nodes use one dense eigendecomposition of H,
+    shared by every start node and time. Larger graphs use a Lanczos
+    (Krylov) decomposition per start node with krylov_dim vectors. Either
+    way each extra time point costs a single matrix-vector product.
+    """
+    def __init__(self, graph, hamiltonian='laplacian', dense_limit=DENSE_LIMIT, krylov_dim=120):
+        self.hamiltonian = walk_hamiltonian(graph, hamiltonian)
+        self.num_nodes = self.hamiltonian.shape[0]
+        self.dense = self.num_nodes <= dense_limit
+        self.krylov_dim = krylov_dim
+        self._eigh = None
+        self._krylov = {}
+
+    def spectrum(self, start):
+        """
+        (energies, basis, coefficients) with
+        psi(t) = basis @ (exp(-i energies t) * coefficients).
+        """
+        if self.dense:
+            if self._eigh is None:
+                self._eigh = np.linalg.eigh(self.hamiltonian.toarray())
+            values, vectors = self._eigh
+            return values, vectors, vectors[start]
+        if start not in self._krylov:
+            start_vector = np.zeros(self.num_nodes)
+            start_vector[start] = 1.0
+            values, vectors = lanczos(self.hamiltonian, start_vector, self.krylov_dim)
+            self._krylov[start] = (values, vectors, vectors[start])
+        return self._krylov[start]
+
+    def probabilities(self, start, times):
+        """
+        Node probabilities at each time, shaped (len(times), num_nodes).
+        """
+        values, basis, coeffs = self.spectrum(start)
+        phases = np.exp(-1j * np.outer(values, np.atleast_1d(times))) * coeffs[:, None]
+        amplitudes = basis @ phases
+        return (np.abs(amplitudes) ** 2).T
+
+def continuous_walk(graph, hamiltonian='laplacian'):
+    """
+    ContinuousWalk for graph, cached on MoveGraph instances.
+    """
+    cache = getattr(graph, 'cache', None)
+    if cache is None:
+        return ContinuousWalk(graph, hamiltonian)
+    key = ('continuous_walk', hamiltonian)
+    walk = cache.get(key)
+    if walk is None:
+        walk = ContinuousWalk(graph, hamiltonian)
+        cache[key] = walk
+    return walk
@@ -0,0 +1,81 @@
+import sys
+import os
+import chess
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantum.adaptive_sampling import leader_separated, sample_adaptively, ADAPTIVE_BATCH_SHOTS
+from quantum.amplitude_selector import amplitude_sample
+from quantum.selector_stats import collect_stats
+from quantum.backends import seeded_simulator
+from quantum.grover_move_selector import quantum_move_selector
+
+def _multinomial_draw(dist, seed=0):
+    rng = np.random.default_rng(seed)
+    def draw(n):
+        return {i: int(c) for i, c in enumerate(rng.multinomial(n, dist)) if c > 0}
+    return draw
+
+def test_stopping_rule():
+    print("Testing stopping rule")
+    print("=" * 50)
+
+    assert not leader_separated({}, 0)
+    assert not leader_separated({0: 1}, 1)
+    assert leader_separated({0: 30, 1: 2}, 32)
+    assert not leader_separated({0: 17, 1: 15}, 32)
+    print("✅ Clear leads stop sampling, near ties and single shots do not")
+
+    counts, used = sample_adaptively(_multinomial_draw([0.9, 0.05, 0.05]), 1024)
+    assert used == ADAPTIVE_BATCH_SHOTS and sum(counts.values()) == used
+    print(f"✅ Skewed distribution stopped after {used} of 1024 shots")
+
+    counts, used = sample_adaptively(_multinomial_draw([0.25] * 4), 512)
+    assert used == 512 and sum(counts.values()) == 512
+    print("✅ Uniform distribution runs to the shot cap")
+
+    # Outcomes 0 and 1 both count for candidate 'a'
+    groups = {0: 'a', 1: 'a', 2: 'b', 3: 'b'}
+    counts, used = sample_adaptively(_multinomial_draw([0.45, 0.45, 0.05, 0.05]), 1024, groups=groups)
+    assert used < 1024
+    print(f"✅ Grouped outcomes separate after {used} shots")
+
+def test_amplitude_sample():
+    print("\nTesting adaptive amplitude sampling")
+    print("=" * 50)
+
+    with collect_stats('sampled') as stats:
+        probs, hist = amplitude_sample([100, 1, 1, 1], shots=512, backend='sampled', seed=1, adaptive=True)
+    assert stats.shots < 512 and sum(hist.values()) == stats.shots
+    assert max(probs, key=probs.get) == 0
+    assert abs(sum(probs.values()) - 1) < 1e-9
+    print(f"✅ Clear-cut scores used {stats.shots} of 512 shots")
+
+    with collect_stats('sampled') as stats:
+        probs, hist = amplitude_sample([1, 1, 1, 1], shots=512, backend='sampled', seed=1, adaptive=True)
+    assert stats.shots == 512
+    print("✅ Tied scores stay within the cap")
+
+    with collect_stats('sampled') as stats:
+        probs, hist = amplitude_sample([100, 1, 1, 1], shots=512, backend='sampled', seed=1)
+    assert stats.shots == 512
+    print("✅ Fixed shot count unchanged when not adaptive")
+
+def test_selector_walk():
+    print("\nTesting adaptive sampling through the selector")
+    print("=" * 50)
+
+    # Small enough for the qiskit walk engine; one king move clearly leads
+    board = chess.Board("k7/8/K7/8/8/8/8/8 w - - 0 1")
+    with seeded_simulator(1):
+        move, prob_map, stats = quantum_move_selector(board, list(board.legal_moves), 'true_quantum_walk',
+                                                      sampling_backend='exact', return_stats=True,
+                                                      adaptive_shots=True, walk_engine='qiskit')
+    assert move in board.legal_moves and stats.fallback is None
+    assert stats.qubits is not None and stats.shots < 2048
+    print(f"✅ Qiskit walk stopped after {stats.shots} of 2048 shots")
+
+if __name__ == "__main__":
+    test_stopping_rule()
+    test_amplitude_sample()
+    test_selector_walk()
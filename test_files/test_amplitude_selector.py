@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from quantum.amplitude_selector import amplitude_sample
+from quantum.grover_move_selector import quantum_move_selector
+
+SCORES = [1, 2, 3, 4, 5, 0, 10, 20]
+
+def test_sampling_backends():
+    print("Testing amplitude_sample backends")
+    print("=" * 50)
+
+    exact, expected = amplitude_sample(SCORES, backend="exact")
+    assert abs(sum(exact.values()) - 1.0) < 1e-9
+    assert abs(exact[7] - 20 / 45) < 1e-9
+    assert 5 not in exact
+    print(f"✅ Exact backend: {len(exact)} nonzero probabilities")
+
+    for backend in ("sampled", "aer"):
+        probs, hist = amplitude_sample(SCORES, shots=4096, backend=backend, seed=3)
+        assert sum(hist.values()) == 4096
+        assert max(probs, key=probs.get) == 7
+        for idx, p in exact.items():
+            assert abs(probs.get(idx, 0) - p) < 0.05, (backend, idx)
+        print(f"✅ {backend} backend agrees with the exact distribution")
+
+    try:
+        amplitude_sample(SCORES, backend="bogus")
+        assert False, "expected ValueError"
+    except ValueError:
+        print("✅ Unknown backend rejected")
+
+def test_selector_exact_backend():
+    print("\nTesting quantum_move_selector with the exact backend")
+    print("=" * 50)
+
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    move, prob_map = quantum_move_selector(board, list(board.legal_moves), "grover", sampling_backend="exact")
+    assert move.uci() == max(prob_map, key=prob_map.get)
+    print(f"✅ Selected {board.san(move)} with p={prob_map[move.uci()]:.3f}")
+
+if __name__ == "__main__":
+    test_sampling_backends()
+    test_selector_exact_backend()
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from quantum.backends import get_backend, CircuitCache, circuit_key, run_circuit, run_parameter_grid, seeded_simulator
+
+def make_circuit(angle):
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.rz(angle, 0)
+    qc.cx(0, 1)
+    qc.measure_all()
+    return qc
+
+def test_backend_registry():
+    print("Testing shared backend registry")
+    print("=" * 50)
+
+    assert get_backend() is get_backend()
+    assert get_backend("qasm_simulator") is get_backend("qasm_simulator")
+    print("✅ Backends are constructed once per process")
+
+def test_circuit_cache():
+    print("\nTesting compiled-circuit cache")
+    print("=" * 50)
+
+    assert circuit_key(make_circuit(0.5)) == circuit_key(make_circuit(0.5))
+    assert circuit_key(make_circuit(0.5)) != circuit_key(make_circuit(0.7))
+
+    cache = CircuitCache(maxsize=2)
+    backend = get_backend()
+    first = cache.compile(make_circuit(0.1), backend)
+    assert cache.compile(make_circuit(0.1), backend) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    print("✅ Identical circuit structure hits the cache")
+
+    cache.compile(make_circuit(0.2), backend)
+    cache.compile(make_circuit(0.3), backend)
+    assert len(cache) == 2
+    cache.compile(make_circuit(0.1), backend)
+    assert cache.stats()["misses"] == 4
+    print(f"✅ LRU eviction at maxsize: {cache.stats()}")
+
+    counts = run_circuit(make_circuit(0.1), shots=256)
+    assert sum(counts.values()) == 256
+    print("✅ run_circuit executes on the shared backend")
+
+def make_parameterized_circuit():
+    theta = Parameter("theta")
+    qc = QuantumCircuit(1)
+    qc.rx(theta, 0)
+    qc.measure_all()
+    return qc, theta
+
+def test_parameter_grid():
+    print("\nTesting batched parameter grid execution")
+    print("=" * 50)
+
+    qc, theta = make_parameterized_circuit()
+    results = run_parameter_grid(qc, [{theta: 0.0}, {theta: 3.141592653589793}], shots=128)
+    assert results[0] == {"0": 128}
+    assert results[1] == {"1": 128}
+    print("✅ One job returns counts for every binding in order")
+
+    # A fresh circuit hits the cache but carries new Parameter objects
+    qc, theta = make_parameterized_circuit()
+    results = run_parameter_grid(qc, [{theta: 0.0}], shots=64)
+    assert results == [{"0": 64}]
+    print("✅ Bindings match cached compilations by parameter name")
+
+def test_seeded_simulator():
+    print("\nTesting seeded simulator runs")
+    print("=" * 50)
+
+    def runs():
+        with seeded_simulator(7):
+            return [run_circuit(make_circuit(0.4), shots=64) for _ in range(3)]
+
+    first = runs()
+    assert runs() == first
+    assert len({tuple(sorted(c.items())) for c in first}) > 1
+    print("✅ Seeded blocks repeat exactly, runs inside them still differ")
+
+if __name__ == "__main__":
+    test_backend_registry()
+    test_circuit_cache()
+    test_parameter_grid()
+    test_seeded_simulator()
@@ -0,0 +1,97 @@
+import io
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from chess_logic.batch_analysis import analyze_stream, parse_position
+
+POSITIONS = [
+    "# comment lines and blank lines are skipped",
+    chess.STARTING_FEN,
+    "",
+    'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - bm Bb5; id "ruy lopez";',
+    "not a position",
+    "8/8/4k3/8/2K5/8/3P4/8 w - - 0 1",
+    "7k/6Q1/6K1/8/8/8/8/8 b - - 0 1",
+]
+
+class CountingLines:
+    """
+    Line iterator that records how far reading ran ahead of the output.
+    """
+    def __init__(self, lines, output):
+        self.lines = lines
+        self.output = output
+        self.read = 0
+        self.max_ahead = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.read += 1
+            written = self.output.getvalue().count("\n")
+            self.max_ahead = max(self.max_ahead, self.read - written)
+            yield line
+
+def run(lines, **kwargs):
+    output = io.StringIO()
+    count = analyze_stream(lines, output, **kwargs)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(results) == count
+    return sorted(results, key=lambda r: r['index'])
+
+def test_parse_position():
+    print("Testing FEN and EPD parsing")
+    print("=" * 50)
+
+    board, ops = parse_position(chess.STARTING_FEN)
+    assert board == chess.Board() and ops == {}
+    board, ops = parse_position(POSITIONS[3])
+    assert ops['id'] == "ruy lopez" and board.fullmove_number == 1
+    print("✅ Full FENs and EPD lines with operations are accepted")
+
+def test_analyze_stream():
+    print("\nTesting streamed batch analysis")
+    print("=" * 50)
+
+    results = run(POSITIONS, method_type='classical')
+    assert [r['index'] for r in results] == list(range(5))
+    assert results[1]['id'] == "ruy lopez" and results[1]['bm'] == ["f1b5"]
+    assert 'error' in results[2]
+    assert results[4]['move'] is None
+    for r in (results[0], results[1], results[3]):
+        assert chess.Move.from_uci(r['move']) in chess.Board(r['fen']).legal_moves
+        assert r['stats']['method'] == 'classical' and r['stats']['total_ms'] > 0
+    print("✅ One JSON line per position, with errors and terminal positions reported")
+
+    parallel = run(POSITIONS, method_type='classical', workers=2)
+    assert [r.get('move') for r in parallel] == [r.get('move') for r in results]
+    print("✅ A worker pool gives the same moves as the serial run")
+
+    output = io.StringIO()
+    lines = CountingLines([chess.STARTING_FEN] * 40, output)
+    assert analyze_stream(lines, output, method_type='classical', workers=2, window=3) == 40
+    assert lines.max_ahead <= 4, lines.max_ahead
+    print(f"✅ Input is read at most {lines.max_ahead} positions ahead of the output")
+
+def test_fallback_output():
+    print("\nTesting that fallbacks keep stdout clean")
+    print("=" * 50)
+
+    # An unknown sampling backend makes every search fall back and print why
+    stdout = sys.stdout
+    sys.stdout = captured = io.StringIO()
+    try:
+        analyze_stream(POSITIONS, sys.stdout, method_type='classical', sampling_backend='unknown')
+    finally:
+        sys.stdout = stdout
+    results = [json.loads(line) for line in captured.getvalue().splitlines()]
+    assert len(results) == 5
+    assert results[0]['stats']['fallback'].startswith("amplitude sampling")
+    print("✅ Fallback messages go to stderr; every stdout line is JSON")
+
+if __name__ == "__main__":
+    test_parse_position()
+    test_analyze_stream()
+    test_fallback_output()
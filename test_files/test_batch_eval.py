@@ -0,0 +1,83 @@
+import chess
+import random
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.batch_eval import evaluate_board_states, evaluate_planes, pack_positions, unpack_bitboards
+from chess_logic.batch_eval import material_move_scores
+from chess_logic.move_eval import material_balance
+from chess_logic.move_eval import evaluate_board_state
+from quantum.qaoa_move_selector import evaluate_board_state as qaoa_evaluate_board_state
+
+def random_positions(count, seed=11):
+    rng = random.Random(seed)
+    boards = [
+        chess.Board(),
+        chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"),  # checkmate
+        chess.Board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"),  # stalemate
+    ]
+    while len(boards) < count:
+        board = chess.Board()
+        for ply in range(rng.randint(1, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        boards.append(board)
+    return boards
+
+def test_batch_matches_scalar():
+    print("Testing batched board evaluation")
+    print("=" * 50)
+
+    boards = random_positions(200)
+    for color in chess.COLORS:
+        batch = evaluate_board_states(boards, color).tolist()
+        assert batch == [evaluate_board_state(b, color) for b in boards]
+
+        batch = evaluate_board_states(boards, color, include_activity=False).tolist()
+        assert batch == [qaoa_evaluate_board_state(b, color) for b in boards]
+    print(f"✅ {len(boards)} positions match evaluate_board_state for both colors and variants")
+
+def test_plane_and_bitboard_inputs():
+    print("\nTesting (N, 12, 64) and bitboard inputs")
+    print("=" * 50)
+
+    batch = pack_positions(random_positions(20, seed=3))
+    planes = unpack_bitboards(batch.bitboards)
+    assert planes.shape == (20, 12, 64)
+    from_bits = evaluate_planes(batch.bitboards, True, batch.fullmove_number)
+    from_planes = evaluate_planes(planes, True, batch.fullmove_number)
+    assert np.array_equal(from_bits, from_planes)
+    print("✅ Both packings give the same scores")
+
+def test_material_move_scores():
+    print("\nTesting capture-delta move scorer")
+    print("=" * 50)
+
+    boards = random_positions(40, seed=5)
+    # En passant and promotions (with and without capture)
+    boards.append(chess.Board("r3k2r/pPp2ppp/8/3pP3/8/8/PPP2PpP/R3K2R w KQkq d6 0 1"))
+    checked = 0
+    for board in boards:
+        moves = list(board.legal_moves)
+        scores = material_move_scores(board, moves)
+        for move, score in zip(moves, scores):
+            mover = board.turn
+            board.push(move)
+            assert score == material_balance(board, mover)
+            board.pop()
+            checked += 1
+    print(f"✅ {checked} move scores match playing the move and recounting material")
+
+    board = chess.Board("4k3/8/8/3q4/4P3/8/8/4K3 w - - 0 1")
+    scores = dict(zip(board.legal_moves, material_move_scores(board)))
+    assert max(scores, key=scores.get) == chess.Move.from_uci("e4d5")
+    print("✅ Scores favour the side to move (winning the queen ranks first)")
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_plane_and_bitboard_inputs()
+    test_material_move_scores()
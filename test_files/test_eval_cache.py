@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import chess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic import eval_cache
+from chess_logic.eval_cache import EvalCache
+from quantum.grover_move_selector import quantum_move_selector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READER = """
+import sys, chess
+from chess_logic.eval_cache import EvalCache
+board = chess.Board()
+board.push_san("e4")
+move, prob_map = EvalCache(sys.argv[1]).get(board, "classical", {"top_k": 8})
+print(move.uci(), prob_map[move.uci()])
+"""
+
+def test_eval_cache():
+    print("Testing the persistent evaluation cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "evals.sqlite")
+        cache = EvalCache(path, max_entries=1000)
+        board = chess.Board()
+        board.push_san("e4")
+
+        assert cache.get(board, "classical", {"top_k": 8}) is None
+        cache.put(board, "classical", {"top_k": 8}, chess.Move.from_uci("e7e5"), {"e7e5": 0.75, "c7c5": 0.25})
+        move, prob_map = cache.get(board, "classical", {"top_k": 8})
+        assert move == chess.Move.from_uci("e7e5") and prob_map == {"e7e5": 0.75, "c7c5": 0.25}
+        assert cache.get(board, "classical", {"top_k": 4}) is None
+        assert cache.get(board, "qaoa", {"top_k": 8}) is None
+        assert cache.get(chess.Board(), "classical", {"top_k": 8}) is None
+        print("✅ Entries are keyed by position, method and parameters")
+
+        proc = subprocess.run([sys.executable, "-c", READER, path], cwd=ROOT, capture_output=True, text=True)
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.split() == ["e7e5", "0.75"]
+        print("✅ Another process reads the entry while this one holds the database open")
+
+        cache.close()
+        reopened = EvalCache(path)
+        assert reopened.get(board, "classical", {"top_k": 8}) is not None
+        print("✅ Entries persist across reopening")
+
+def test_eviction():
+    print("\nTesting LRU eviction")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EvalCache(os.path.join(tmp, "evals.sqlite"), max_entries=50)
+        boards = []
+        board = chess.Board()
+        for move in ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7"]:
+            board.push_san(move)
+            boards.append(board.copy())
+        first = boards[0]
+        for i in range(eval_cache.EVICT_EVERY * 2):
+            cache.put(boards[i % len(boards)], "classical", {"i": i}, None, {})
+            if i % 8 == 0:
+                cache.put(first, "classical", {"keep": True}, None, {})
+                assert cache.get(first, "classical", {"keep": True}) is not None
+        assert len(cache) <= 50 + eval_cache.EVICT_EVERY
+        assert cache.get(first, "classical", {"keep": True}) is not None
+        assert cache.get(boards[0], "classical", {"i": 0}) is None
+        print(f"✅ Size stays bounded ({len(cache)} entries) and recently used entries survive")
+
+def test_hits_do_not_write():
+    print("\nTesting read-only hits")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "evals.sqlite")
+        cache = EvalCache(path)
+        board = chess.Board()
+        cache.put(board, "classical", {}, chess.Move.from_uci("e2e4"), {"e2e4": 1.0})
+        before = cache._connection().execute("SELECT last_used FROM evals").fetchone()[0]
+
+        # Another process holds the write lock; hits must still be hits
+        writer = sqlite3.connect(path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        for _ in range(3):
+            assert cache.get(board, "classical", {}) is not None
+        writer.execute("ROLLBACK")
+        writer.close()
+        assert cache.stats()["hits"] == 3
+        print("✅ Hits are served while another connection holds the write lock")
+
+        cache.close()
+        after = EvalCache(path)._connection().execute("SELECT last_used FROM evals").fetchone()[0]
+        assert after > before
+        print("✅ Last-used times are written in one batch on close")
+
+    missing = EvalCache(os.path.join(tmp, "missing", "evals.sqlite"))
+    assert missing.get(chess.Board(), "classical") is None
+    missing.put(chess.Board(), "classical", {}, None, {})
+    assert len(missing) == 0
+    print("✅ An unusable database path behaves as an empty cache")
+
+def test_selector_uses_cache():
+    print("\nTesting quantum_move_selector with a cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EvalCache(os.path.join(tmp, "evals.sqlite"))
+        board = chess.Board("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+        legal = list(board.legal_moves)
+
+        move, prob_map, stats = quantum_move_selector(board, legal, "true_quantum_walk", return_stats=True,
+                                                      sampling_backend="exact", cache=cache)
+        assert stats.cache == "miss" and "graph" in stats.stages
+        cached_move, cached_map, stats = quantum_move_selector(board, legal, "true_quantum_walk", return_stats=True,
+                                                               sampling_backend="exact", cache=cache)
+        assert stats.cache == "hit" and not stats.stages
+        assert cached_move == move and cached_map == prob_map
+        print(f"✅ The second call is served from the cache in {stats.total_ms:.2f} ms")
+
+        quantum_move_selector(board, legal[:5], "true_quantum_walk", sampling_backend="exact", cache=cache)
+        assert len(cache) == 1
+        print("✅ Searches restricted to some of the legal moves are not cached")
+
+if __name__ == "__main__":
+    test_eval_cache()
+    test_eviction()
+    test_hits_do_not_write()
+    test_selector_uses_cache()
@@ -0,0 +1,32 @@
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CLASSICAL_AND_EXACT = """
+import sys, chess
+from quantum.grover_move_selector import quantum_move_selector
+board = chess.Board()
+assert 'qiskit' not in sys.modules, 'imported by the selector module'
+quantum_move_selector(board, list(board.legal_moves), 'classical')
+quantum_move_selector(board, list(board.legal_moves), 'true_quantum_walk', sampling_backend='exact')
+quantum_move_selector(board, list(board.legal_moves), 'continuous_quantum_walk', sampling_backend='exact')
+assert 'qiskit' not in sys.modules, 'imported by a classical or exact path'
+from quantum.amplitude_selector import amplitude_sample
+amplitude_sample([1, 2, 3], backend='aer')
+assert 'qiskit' in sys.modules
+"""
+
+def test_lazy_qiskit_import():
+    print("Testing deferred Qiskit import")
+    print("=" * 50)
+
+    proc = subprocess.run([sys.executable, "-c", CLASSICAL_AND_EXACT], cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    print("✅ Classical and exact paths run without importing Qiskit")
+    print("✅ The Aer path loads Qiskit on first use")
+
+if __name__ == "__main__":
+    test_lazy_qiskit_import()
@@ -0,0 +1,119 @@
+import chess
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.move_graph import build_move_graph, encode_move, decode_move, NODE_BYTES, EDGE_BYTES
+from chess_logic.board_utils import generate_move_graph
+from quantum.quantum_walk import quantum_walk_scores
+
+def test_move_codes():
+    print("Testing uint16 move codes")
+    print("=" * 50)
+
+    for uci in ["e2e4", "e1g1", "a7a8q", "b2a1n", "h7h8r", "c7c8b"]:
+        move = chess.Move.from_uci(uci)
+        code = encode_move(move)
+        assert 0 <= code < 2**16
+        assert decode_move(code) == move
+    print("✅ Moves round-trip through 16-bit codes")
+
+def test_csr_graph():
+    print("\nTesting CSR move graph")
+    print("=" * 50)
+
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    graph = build_move_graph(board, depth=2)
+
+    assert graph.offsets.dtype.name == "int32"
+    assert graph.targets.dtype.name == "int32"
+    assert graph.move_codes.dtype.name == "uint16"
+    assert len(graph.offsets) == graph.num_nodes + 1
+    assert graph.offsets[-1] == graph.num_edges
+    print(f"✅ {graph.num_nodes} nodes, {graph.num_edges} edges in {graph.nbytes} bytes")
+
+    # Root edges are exactly the legal moves, and each child replays correctly
+    root_moves = {move for move, child in graph.moves_from(0)}
+    assert root_moves == set(board.legal_moves)
+    for move, child in graph.moves_from(0):
+        board.push(move)
+        assert graph.index_of(board) == child
+        assert graph.fen(child) == board.fen()
+        board.pop()
+    print("✅ Root children match legal moves and replay to the right FEN")
+
+    # Dictionary adapter for existing callers
+    adj_list, fen_to_idx, idx_to_fen, move_tree = generate_move_graph(board, depth=2)
+    assert len(adj_list) == graph.num_nodes
+    assert sorted(adj_list[0]) == sorted(graph.successors(0).tolist())
+    assert fen_to_idx[board.fen()] == 0
+    assert len(move_tree) > 0
+    print("✅ adj_list adapter matches CSR successors")
+
+def test_walk_scores_on_graph():
+    print("\nTesting quantum_walk_scores on MoveGraph")
+    print("=" * 50)
+
+    board = chess.Board()
+    scores = quantum_walk_scores(board, depth=2)
+    assert set(scores) == set(board.legal_moves)
+    print(f"✅ Scored {len(scores)} moves")
+
+def edge_set(graph):
+    return {(int(graph.hashes[u]), move.uci(), int(graph.hashes[v]))
+            for u in range(graph.num_nodes) for move, v in graph.moves_from(u)}
+
+def test_parallel_build():
+    print("\nTesting parallel per-root-move expansion")
+    print("=" * 50)
+
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    serial = build_move_graph(board, depth=3)
+    parallel = build_move_graph(board, depth=3, workers=2)
+
+    assert parallel.num_nodes == serial.num_nodes
+    assert len(set(parallel.hashes.tolist())) == parallel.num_nodes
+    assert edge_set(parallel) == edge_set(serial)
+    assert dict(zip(parallel.hashes.tolist(), parallel.plies.tolist())) == \
+        dict(zip(serial.hashes.tolist(), serial.plies.tolist()))
+    print(f"✅ Merged graph matches the serial build: {parallel.num_nodes} nodes, {parallel.num_edges} edges")
+
+    idx = parallel.num_nodes - 1
+    assert parallel.fen(idx) == serial.fen(serial.index_of_hash(int(parallel.hashes[idx])))
+    print("✅ Merged nodes rebuild the same positions")
+
+def test_graph_budget():
+    print("\nTesting node and memory budgets")
+    print("=" * 50)
+
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    full = build_move_graph(board, depth=3)
+    assert not full.truncated
+    # The budget check counts every child as new, so allow one node's worth of transpositions
+    assert not build_move_graph(board, depth=3, max_nodes=full.num_nodes + 218).truncated
+
+    graph = build_move_graph(board, depth=3, max_nodes=3000)
+    assert graph.truncated and graph.num_nodes <= 3000
+    # Breadth-first: the first two plies are complete before ply 3 starts
+    full_plies = dict(zip(full.hashes.tolist(), full.plies.tolist()))
+    shallow = {h for h, ply in full_plies.items() if ply <= 2}
+    assert shallow <= set(graph.hashes.tolist())
+    assert all(full_plies[h] == ply for h, ply in zip(graph.hashes.tolist(), graph.plies.tolist()))
+    print(f"✅ max_nodes=3000 stops at {graph.num_nodes} nodes with plies 1-2 complete")
+
+    budget = 500 * NODE_BYTES
+    graph = build_move_graph(board, depth=3, max_bytes=budget)
+    assert graph.truncated
+    assert graph.num_nodes * NODE_BYTES + graph.num_edges * EDGE_BYTES <= budget
+    print(f"✅ max_bytes={budget} stops at {graph.num_nodes} nodes")
+
+    adj_list, _, _, _ = generate_move_graph(board, depth=2, max_nodes=10)
+    assert len(adj_list) <= 10
+    print("✅ generate_move_graph forwards the budget")
+
+if __name__ == "__main__":
+    test_move_codes()
+    test_csr_graph()
+    test_walk_scores_on_graph()
+    test_parallel_build()
+    test_graph_budget()
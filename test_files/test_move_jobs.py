@@ -0,0 +1,46 @@
+import chess
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.move_jobs import MoveJobs
+from chess_logic.search_context import SearchContext
+
+def test_move_jobs():
+    print("Testing background move jobs")
+    print("=" * 50)
+
+    jobs = MoveJobs(max_workers=1, maxsize=2)
+    board = chess.Board()
+    board.push_san("e4")
+    context = SearchContext(depth=2)
+
+    job = jobs.submit(board, "true_quantum_walk", context=context)
+    assert jobs.submit(board, "true_quantum_walk", context=context) is job
+    print("✅ A running search is shared instead of restarted")
+
+    move, prob_map = job.result(timeout=60)
+    assert move in board.legal_moves
+    assert board.move_stack == [chess.Move.from_uci("e2e4")]
+    print(f"✅ Background search returned {board.san(move)} without touching the board")
+
+    assert jobs.submit(board, "true_quantum_walk", context=context) is job
+    assert jobs.get(board, "true_quantum_walk", context=context) is job
+    print("✅ Finished positions are reused")
+
+    other = jobs.submit(board, "true_quantum_walk", context=context, sampling_backend="sampled")
+    assert other is not job
+    assert jobs.submit(board, "true_quantum_walk") is not job
+    assert other.result(timeout=60)[0] in board.legal_moves
+    print("✅ Other sampling backends and contexts get their own search")
+
+    for san in ("e5", "Nf3"):
+        board.push_san(san)
+        jobs.submit(board, "classical").result(timeout=60)
+    assert len(jobs) == 2
+    print(f"✅ Finished jobs are evicted beyond maxsize ({len(jobs)} kept)")
+
+    jobs.shutdown()
+
+if __name__ == "__main__":
+    test_move_jobs()
@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import time
+import chess
+import chess.pgn
+import chess.polyglot
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.opening_book import OpeningBook, build_book, encode_polyglot_move, open_book, DEFAULT_BOOK_PATH
+from quantum.grover_move_selector import quantum_move_selector
+
+PGN = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O 1-0
+
+[Result "0-1"]
+
+1. e4 c5 2. Nf3 d6 0-1
+
+[Result "1/2-1/2"]
+
+1. d4 d5 2. c4 1/2-1/2
+"""
+
+def test_build_and_probe():
+    print("Testing opening book builder and lookup")
+    print("=" * 50)
+
+    board = chess.Board("r1bqkb1r/1ppp1ppp/p1n2n2/4p3/B3P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 5")
+    assert encode_polyglot_move(board, chess.Move.from_uci("e1g1")) == chess.H1 | (chess.E1 << 6)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pgn_path = os.path.join(tmp, "games.pgn")
+        book_path = os.path.join(tmp, "book.bin")
+        with open(pgn_path, "w") as f:
+            f.write(PGN)
+        # Moves that only lost (weight 0) are left out
+        assert build_book([pgn_path], book_path, max_plies=10) == 10
+        print("✅ Three games compile to 10 weighted (position, move) records")
+
+        with chess.polyglot.open_reader(book_path) as reader:
+            keys = [entry.key for entry in reader]
+            assert keys == sorted(keys)
+        print("✅ Records are sorted by key and readable by python-chess")
+
+        with OpeningBook(book_path) as book:
+            move, prob_map = book.probe(chess.Board())
+            # e4 won once (2) and lost once (0); d4 drew (1)
+            assert move == chess.Move.from_uci("e2e4")
+            assert prob_map == {"e2e4": 2 / 3, "d2d4": 1 / 3}
+
+            after_e4 = chess.Board()
+            after_e4.push_san("e4")
+            # Black won the Sicilian and lost the Ruy Lopez
+            assert book.probe(after_e4) == (chess.Move.from_uci("c7c5"), {"c7c5": 1.0})
+            print("✅ Weights follow game results from the mover's side")
+
+            # Castling is stored king-takes-rook and read back as e1g1
+            assert book.probe(board) == (chess.Move.from_uci("e1g1"), {"e1g1": 1.0})
+            print("✅ Castling round-trips through the Polyglot encoding")
+
+            assert book.probe(chess.Board(), [chess.Move.from_uci("d2d4")]) == \
+                (chess.Move.from_uci("d2d4"), {"d2d4": 1.0})
+            print("✅ Probes can be restricted to a subset of legal moves")
+
+def test_selector_book_moves():
+    print("\nTesting book moves in quantum_move_selector")
+    print("=" * 50)
+
+    book = open_book()
+    assert book is not None, f"missing {DEFAULT_BOOK_PATH}"
+    board = chess.Board()
+    for san in ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6"]:
+        board.push_san(san)
+    legal = list(board.legal_moves)
+
+    start = time.perf_counter()
+    move, prob_map, stats = quantum_move_selector(board, legal, "true_quantum_walk", return_stats=True, book=book)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert move == chess.Move.from_uci("e1g1") and stats.book and stats.nodes is None
+    print(f"✅ Bundled book answers the Ruy Lopez with O-O in {elapsed_ms:.2f} ms")
+
+    board = chess.Board("8/8/4k3/8/2K5/8/3P4/8 w - - 0 1")
+    move, prob_map, stats = quantum_move_selector(board, list(board.legal_moves), "classical",
+                                                  return_stats=True, book=book)
+    assert move in board.legal_moves and not stats.book
+    print("✅ Positions outside the book are searched as usual")
+
+if __name__ == "__main__":
+    test_build_and_probe()
+    test_selector_book_moves()
@@ -3,7 +3,11 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 from quantum.qaoa_move_selector import select_move_with_qaoa, qaoa_move_selector, evaluate_board_state
+from quantum.qaoa_move_selector import walsh_coefficients, create_binary_qaoa_circuit, create_simple_qaoa_circuit
+from quantum.qaoa_move_selector import is_product_circuit, product_state_marginals, one_hot_move_distribution
+from quantum.backends import run_circuit
 from quantum.grover_move_selector import qaoa_selector
 
 def test_qaoa_move_selector():
@@ -86,5 +90,70 @@ def test_qaoa_move_selector():
     print("✅ All QAOA tests passed! QAOA implementation is working.")
     return True
 
+def test_binary_encoding():
+    print("\nTesting binary-encoded QAOA")
+    print("=" * 50)
+    
+    values = np.array([0.3, 1.0, 0.0, 0.5, 0.25, 0.75, 0.1, 0.9])
+    coeffs = walsh_coefficients(values)
+    rebuilt = [sum(coeffs[s] * (-1) ** bin(x & s).count("1") for s in range(8)) for x in range(8)]
+    assert np.allclose(rebuilt, values)
+    print("✅ Walsh-Hadamard expansion reproduces the cost values")
+    
+    # Middlegame position with more than 32 legal moves
+    board = chess.Board("r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1B1PPP/R2QKB1R w KQ - 0 8")
+    num_moves = board.legal_moves.count()
+    qc, gamma, beta = create_binary_qaoa_circuit(list(range(num_moves)))
+    assert qc.num_qubits == 6 and qc.num_clbits == 6
+    print(f"✅ {num_moves} moves fit in {qc.num_qubits} qubits")
+    
+    best_move, prob_map = select_move_with_qaoa(board)
+    assert best_move in board.legal_moves
+    assert abs(sum(prob_map.values()) - 1.0) < 1e-9
+    print(f"✅ Binary QAOA selected {board.san(best_move)}")
+    
+    best_move, prob_map = select_move_with_qaoa(board, top_k=4)
+    assert len(prob_map) <= 4
+    print(f"✅ top_k=4 prunes the register to {len(prob_map)} candidates")
+    
+    best_move, prob_map = select_move_with_qaoa(chess.Board("7k/8/8/8/8/8/5PPP/6K1 w - - 0 1"), encoding="one_hot")
+    assert best_move is not None
+    print("✅ One-hot encoding is still available")
+
+def test_analytic_simulator():
+    print("\nTesting closed-form product-state simulator")
+    print("=" * 50)
+    
+    qc = create_simple_qaoa_circuit([3, 1, 4, 1, 5], gamma=1.0, beta=0.7)
+    assert is_product_circuit(qc)
+    assert not is_product_circuit(create_binary_qaoa_circuit([3, 1, 4, 1, 5])[0])
+    
+    exact = one_hot_move_distribution(product_state_marginals(qc))
+    shots = 50000
+    sampled = {}
+    for bitstring, count in run_circuit(qc, shots, "qasm_simulator").items():
+        index = bitstring.rfind("1")
+        if index != -1:
+            sampled[index] = sampled.get(index, 0) + count / shots
+    for index, prob in exact.items():
+        assert abs(sampled.get(index, 0) - prob) < 0.02
+    print(f"✅ Analytic rfind('1') distribution matches Aer sampling: {exact}")
+    
+    # 34 one-hot qubits, far beyond statevector simulation
+    board = chess.Board("r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1B1PPP/R2QKB1R w KQ - 0 8")
+    best_move, prob_map = select_move_with_qaoa(board, encoding="one_hot")
+    assert best_move in board.legal_moves
+    assert abs(sum(prob_map.values()) - 1.0) < 1e-9
+    print(f"✅ One-hot QAOA with {board.legal_moves.count()} moves selected {board.san(best_move)}")
+    
+    try:
+        select_move_with_qaoa(board, encoding="binary", simulator="analytic")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✅ Analytic simulation of the entangling binary encoding is rejected")
+
 if __name__ == "__main__":
-    test_qaoa_move_selector() 
\ No newline at end of file
+    test_qaoa_move_selector()
+    test_binary_encoding()
+    test_analytic_simulator() 
\ No newline at end of file
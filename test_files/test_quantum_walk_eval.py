@@ -0,0 +1,67 @@
+import chess
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.quantum_walk_eval import QuantumWalkEvaluator
+from chess_logic.move_graph import MoveGraphBuilder, SearchTimeout
+
+class FakeClock:
+    """
+    Deterministic stand-in for time.perf_counter.
+    """
+    def __init__(self, step=0.001):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+def test_time_budgeted_search():
+    print("Testing time-budgeted iterative deepening")
+    print("=" * 50)
+
+    builder = MoveGraphBuilder(chess.Board())
+    try:
+        builder.extend(4, deadline=time.perf_counter())
+        assert False, "expected SearchTimeout"
+    except SearchTimeout:
+        pass
+    print("✅ Graph expansion stops at its deadline")
+
+    board = chess.Board("r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1B1PPP/R2QKB1R w KQ - 0 8")
+
+    # Each clock reading advances 1 ms: graph builds cost 1 ms per expanded
+    # node and the outcome does not depend on the machine
+    for budget, depth in ((20, 1), (100, 2), (500, 2)):
+        evaluator = QuantumWalkEvaluator(clock=FakeClock())
+        move = evaluator.select_move(board, time_budget_ms=budget)
+        assert move in board.legal_moves
+        assert evaluator.last_search["depth"] == depth
+        assert not evaluator.last_search["timed_out"]
+        assert evaluator.last_search["elapsed_ms"] <= budget
+        print(f"✅ {budget} ms budget: {board.san(move)} at depth {depth}, "
+              f"stopped by the prediction after {evaluator.last_search['elapsed_ms']:.0f} ms")
+
+    evaluator = QuantumWalkEvaluator(clock=FakeClock())
+    move = evaluator.select_move(board, time_budget_ms=0)
+    assert move in board.legal_moves and evaluator.last_search["depth"] == 1
+    assert evaluator.last_search["timed_out"]
+    print("✅ Depth 1 completes even when the deadline has passed, which is reported")
+
+    endgame = chess.Board("7k/8/8/8/8/8/8/K7 w - - 0 1")
+    evaluator.select_move(endgame, time_budget_ms=200)
+    assert evaluator.last_search["depth"] > 3
+    print(f"✅ Low branching factor deepens to ply {evaluator.last_search['depth']}")
+
+    capped = QuantumWalkEvaluator(max_nodes=2000)
+    move = capped.select_move(board, time_budget_ms=5000)
+    assert move in board.legal_moves
+    assert capped.last_search["truncated"] and not capped.last_search["timed_out"]
+    assert capped.last_search["depth"] == 2 and capped.last_search["nodes"] <= 2000
+    print(f"✅ A 2000-node cap stops deepening at depth {capped.last_search['depth']}")
+
+if __name__ == "__main__":
+    test_time_budgeted_search()
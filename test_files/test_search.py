@@ -0,0 +1,88 @@
+import chess
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.search import AlphaBetaSearch, side_to_move_eval, relative_eval, MATE_SCORE
+from chess_logic.move_eval import evaluate_board_state
+from quantum.grover_move_selector import quantum_move_selector, classical_fallback
+
+POSITIONS = [
+    chess.STARTING_FEN,
+    "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+    "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP1B1PPP/R2QKB1R w KQ - 0 8",
+]
+
+def minimax(board, depth, ply=0):
+    """
+    Exhaustive negamax reference: returns (score, nodes visited).
+    """
+    if depth == 0:
+        score = side_to_move_eval(board)
+        if abs(score) >= MATE_SCORE:
+            score = MATE_SCORE - ply if score > 0 else -(MATE_SCORE - ply)
+        return score, 1
+    moves = list(board.legal_moves)
+    if not moves:
+        return (-(MATE_SCORE - ply) if board.is_check() else 0), 1
+    best, nodes = -10**9, 1
+    for move in moves:
+        board.push(move)
+        score, count = minimax(board, depth - 1, ply + 1)
+        board.pop()
+        best, nodes = max(best, -score), nodes + count
+    return best, nodes
+
+def test_zero_sum_eval():
+    print("Testing the search evaluation is zero-sum")
+    print("=" * 50)
+
+    asymmetric = 0
+    for fen in POSITIONS:
+        board = chess.Board(fen)
+        for move in list(board.legal_moves) + [None]:
+            if move:
+                board.push(move)
+            assert relative_eval(board, chess.WHITE) == -relative_eval(board, chess.BLACK)
+            assert side_to_move_eval(board) == relative_eval(board, board.turn)
+            if evaluate_board_state(board, chess.WHITE) != -evaluate_board_state(board, chess.BLACK):
+                asymmetric += 1
+            if move:
+                board.pop()
+    assert asymmetric > 0
+    print(f"✅ eval(side) == -eval(opponent), which per-side scoring broke in {asymmetric} positions")
+
+def test_alphabeta_search():
+    print("\nTesting alpha-beta negamax search")
+    print("=" * 50)
+
+    for fen in POSITIONS:
+        board = chess.Board(fen)
+        search = AlphaBetaSearch(max_nodes=None)
+        move, score = search.search(board, depth=2)
+        reference, nodes = minimax(board, 2)
+        assert score == reference
+        assert search.nodes < nodes
+        print(f"✅ {board.san(move)}: score {score} matches minimax with {search.nodes} vs {nodes} nodes")
+
+    board = chess.Board(POSITIONS[1])
+    search = AlphaBetaSearch()
+    move, score = search.search(board, depth=3)
+    assert move == chess.Move.from_uci("h5f7") and score == MATE_SCORE - 1
+    assert search.principal_variation(board)[0] == move
+    print("✅ Finds the mate in one and keeps it as the principal variation")
+
+    search = AlphaBetaSearch(max_nodes=200)
+    move, _ = search.search(chess.Board(POSITIONS[2]), depth=6)
+    assert move is not None and 1 <= search.completed_depth < 6
+    print(f"✅ Node budget stops after depth {search.completed_depth}")
+
+    board = chess.Board(POSITIONS[1])
+    move, prob_map = quantum_move_selector(board, list(board.legal_moves), "alphabeta")
+    assert move == chess.Move.from_uci("h5f7") and prob_map == {"h5f7": 1.0}
+    assert classical_fallback(board, list(board.legal_moves)) == move
+    print("✅ Available as method_type='alphabeta' and as the classical fallback")
+
+if __name__ == "__main__":
+    test_zero_sum_eval()
+    test_alphabeta_search()
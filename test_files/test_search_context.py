@@ -0,0 +1,67 @@
+import chess
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.move_graph import build_move_graph, reroot_move_graph
+from chess_logic.search_context import SearchContext
+from quantum.grover_move_selector import quantum_move_selector
+
+def edge_set(graph):
+    edges = set()
+    for idx in range(graph.num_nodes):
+        for move, child in graph.moves_from(idx):
+            edges.add((int(graph.hashes[idx]), move.uci(), int(graph.hashes[child])))
+    return edges
+
+def test_reroot_matches_fresh_build():
+    print("Testing move graph re-rooting")
+    print("=" * 50)
+
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+    graph = build_move_graph(board, depth=3)
+
+    board.push_san("O-O")
+    board.push_san("Nxe4")
+    rerooted, reused = reroot_move_graph(graph, board, depth=3)
+    fresh = build_move_graph(board, depth=3)
+
+    assert reused > 1
+    assert rerooted.num_nodes == fresh.num_nodes
+    assert edge_set(rerooted) == edge_set(fresh)
+    assert rerooted.fen(0) == board.fen()
+    print(f"✅ Re-rooted graph matches fresh build ({reused} of {fresh.num_nodes} nodes reused)")
+
+def test_search_context_in_game():
+    print("\nTesting SearchContext across AI turns")
+    print("=" * 50)
+
+    context = SearchContext(depth=2)
+    board = chess.Board()
+    for san in ["e4", "e5", "Nf3"]:
+        board.push_san(san)
+
+    move, prob_map = quantum_move_selector(board, list(board.legal_moves), "true_quantum_walk", context=context)
+    assert move in board.legal_moves
+    assert context.graph is not None and context.graph.index_of(board) == 0
+
+    # Searching the same position again, e.g. with another method, reuses the whole graph
+    graph = context.graph
+    quantum_move_selector(board, list(board.legal_moves), "continuous_quantum_walk", context=context)
+    assert context.graph is graph and context.reused_nodes == graph.num_nodes
+    print(f"✅ Same position searched again reused all {graph.num_nodes} nodes")
+
+    board.push(move)
+    board.push(next(iter(board.legal_moves)))
+    move, prob_map = quantum_move_selector(board, list(board.legal_moves), "true_quantum_walk", context=context)
+    assert move in board.legal_moves
+    assert context.graph.index_of(board) == 0
+    print(f"✅ Second AI turn reused {context.reused_nodes} nodes, selected {board.san(move)}")
+
+    context.reset()
+    assert context.graph is None
+    print("✅ Context reset for a new game")
+
+if __name__ == "__main__":
+    test_reroot_matches_fresh_build()
+    test_search_context_in_game()
@@ -0,0 +1,74 @@
+import sys
+import os
+import chess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantum.grover_move_selector import quantum_move_selector, true_quantum_walk_selector, qaoa_selector
+from quantum.selector_stats import SelectorStats, collect_stats, current_stats, stage, record, record_fallback
+
+def test_collector():
+    print("Testing stage recorder")
+    print("=" * 50)
+
+    # Without a collector the helpers are no-ops
+    with stage('evaluation'):
+        record(nodes=5)
+        record_fallback("ignored")
+    assert current_stats() is None
+    print("✅ Recording outside collect_stats does nothing")
+
+    with collect_stats('demo') as stats:
+        with stage('evaluation'):
+            pass
+        with stage('graph'):
+            pass
+        with collect_stats('inner') as inner:
+            assert inner is stats
+        record(nodes=3, edges=2)
+        record_fallback("first")
+        record_fallback("second")
+    assert current_stats() is None
+    summary = stats.as_dict()
+    assert list(summary['stages_ms']) == ['graph', 'evaluation']
+    assert summary['nodes'] == 3 and summary['edges'] == 2
+    assert summary['fallback'] == "first"
+    assert summary['total_ms'] >= sum(summary['stages_ms'].values())
+    print("✅ Stages, counters and the first fallback reason are recorded")
+
+    with collect_stats('off', enabled=False) as stats:
+        assert stats is None and current_stats() is None
+    print("✅ Disabled collection yields None")
+
+def test_selector_stats():
+    print("\nTesting stats returned by the selectors")
+    print("=" * 50)
+
+    board = chess.Board()
+    legal = list(board.legal_moves)
+
+    move, prob_map, stats = quantum_move_selector(board, legal, 'classical', return_stats=True)
+    assert move in legal and isinstance(stats, SelectorStats)
+    assert 'evaluation' in stats.stages and stats.shots == 0 and stats.fallback is None
+    assert len(quantum_move_selector(board, legal, 'classical')) == 2
+    print(f"✅ classical: {stats.as_dict()['stages_ms']}")
+
+    move, prob_map, stats = true_quantum_walk_selector(board, legal, return_stats=True)
+    assert move in legal
+    assert stats.method == 'true_quantum_walk'
+    assert stats.nodes == 421 and stats.edges > 0
+    assert {'graph', 'simulation', 'evaluation'} <= set(stats.stages)
+    print(f"✅ true_quantum_walk: {stats.nodes} nodes, {stats.edges} edges")
+
+    move, prob_map, stats = qaoa_selector(board, legal, return_stats=True)
+    assert move in legal
+    assert stats.qubits == 5 and stats.circuit_depth > 0
+    assert {'evaluation', 'circuit'} <= set(stats.stages)
+    print(f"✅ qaoa: {stats.qubits} qubits, depth {stats.circuit_depth}")
+
+    move, prob_map, stats = quantum_move_selector(board, legal, 'grover', return_stats=True)
+    assert stats.shots == 512 and stats.qubits is not None and 'transpile' in stats.stages
+    print(f"✅ grover: {stats.shots} shots on {stats.qubits} qubits")
+
+if __name__ == "__main__":
+    test_collector()
+    test_selector_stats()
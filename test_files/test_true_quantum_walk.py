@@ -3,8 +3,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from quantum.quantum_walk import evaluate_position_with_true_qwalk, run_true_quantum_walk, generate_move_graph
+from chess_logic.board_utils import generate_move_graph
+from quantum.quantum_walk import evaluate_position_with_true_qwalk, run_true_quantum_walk
 from quantum.grover_move_selector import true_quantum_walk_selector
+from quantum.sparse_walk import CoinedWalk, ContinuousWalk, walk_hamiltonian
+from quantum.quantum_walk import evaluate_position_with_ctqw
+from scipy.sparse.linalg import expm_multiply
+from chess_logic.move_graph import build_move_graph
+import numpy as np
 
 def test_true_quantum_walk():
     print("Testing True Quantum Walk Implementation")
@@ -73,5 +79,52 @@ def test_true_quantum_walk():
     print("✅ All tests passed! True quantum walk implementation is working.")
     return True
 
+def test_sparse_walk_engine():
+    print("\nTesting sparse coined walk engine")
+    print("=" * 50)
+    
+    graph = {0: [1, 2], 1: [3, 4], 2: [3, 0], 3: [4], 4: []}
+    walk = CoinedWalk(graph)
+    step = walk.unitary()
+    assert np.allclose(step.T @ step, np.eye(walk.num_arcs))
+    print(f"✅ Coin and shift form a unitary on {walk.num_arcs} arcs")
+    
+    exact = run_true_quantum_walk(graph, 0, steps=2)
+    assert abs(sum(exact.values()) - 2048) < 1e-6
+    sampled = run_true_quantum_walk(graph, 0, steps=2, engine="qiskit")
+    for node_idx, count in exact.items():
+        assert abs(sampled.get(node_idx, 0) - count) < 150
+    print(f"✅ Sparse engine {exact} matches the Qiskit circuit {sampled}")
+    
+    board_graph = build_move_graph(chess.Board(), depth=3)
+    counts = run_true_quantum_walk(board_graph, 0, steps=3)
+    assert abs(sum(counts.values()) - 2048) < 1e-6
+    print(f"✅ Walked a {board_graph.num_nodes}-node graph without a circuit")
+
+def test_continuous_walk():
+    print("\nTesting continuous-time quantum walk")
+    print("=" * 50)
+    
+    graph = build_move_graph(chess.Board(), depth=2)
+    times = np.linspace(0.25, 3.0, 12)
+    start = np.zeros(graph.num_nodes, dtype=complex)
+    start[0] = 1.0
+    reference = np.abs(expm_multiply(-1j * walk_hamiltonian(graph), start, start=0.25, stop=3.0,
+                                     num=12, endpoint=True)) ** 2
+    
+    assert not ContinuousWalk(graph).dense
+    dense = ContinuousWalk(graph, dense_limit=graph.num_nodes).probabilities(0, times)
+    krylov = ContinuousWalk(graph).probabilities(0, times)
+    assert np.allclose(dense, reference, atol=1e-9)
+    assert np.allclose(krylov, reference, atol=1e-9)
+    assert np.allclose(dense.sum(axis=1), 1.0)
+    print(f"✅ Dense and Lanczos decompositions match expm_multiply over {len(times)} times")
+    
+    move_scores = evaluate_position_with_ctqw(chess.Board(), graph=graph)
+    assert len(move_scores) == 20
+    print(f"✅ Scored {len(move_scores)} moves with the continuous walk")
+
 if __name__ == "__main__":
-    test_true_quantum_walk() 
\ No newline at end of file
+    test_true_quantum_walk()
+    test_sparse_walk_engine()
+    test_continuous_walk() 
\ No newline at end of file
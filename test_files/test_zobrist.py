@@ -0,0 +1,104 @@
+import chess
+import chess.polyglot
+import random
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_logic.zobrist import ZobristBoard, TranspositionTable, zobrist_hash
+from chess_logic.board_utils import generate_move_graph
+
+def test_incremental_hash():
+    print("Testing incremental Zobrist hashing")
+    print("=" * 50)
+
+    rng = random.Random(7)
+    for game in range(20):
+        board = ZobristBoard()
+        for ply in range(120):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+            assert board.zobrist == chess.polyglot.zobrist_hash(board), board.fen()
+        while board.move_stack:
+            board.pop()
+            assert board.zobrist == chess.polyglot.zobrist_hash(board), board.fen()
+    print("✅ Incremental hash matches full Polyglot hash on push and pop")
+
+    # Castling, en passant and promotion positions
+    special = [
+        ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", ["e1g1", "e8c8"]),
+        ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2", ["e5d6"]),
+        ("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1", ["a7b8q"]),
+    ]
+    for fen, ucis in special:
+        board = ZobristBoard(fen)
+        for uci in ucis:
+            board.push(chess.Move.from_uci(uci))
+            assert board.zobrist == zobrist_hash(board)
+        copy = board.copy()
+        copy.pop()
+        assert copy.zobrist == zobrist_hash(copy)
+    print("✅ Castling, en passant and promotion handled")
+
+    edits = [
+        lambda b: b.clear(),
+        lambda b: b.set_piece_at(chess.E4, chess.Piece(chess.QUEEN, chess.BLACK)),
+        lambda b: b.remove_piece_at(chess.D2),
+        lambda b: b.set_board_fen("4k3/8/8/8/8/8/8/4K2R"),
+        lambda b: b.set_castling_fen("Kq"),
+        lambda b: b.apply_mirror(),
+    ]
+    for edit in edits:
+        board = ZobristBoard()
+        board.push_san("e4")
+        edit(board)
+        assert board.zobrist == zobrist_hash(board), board.fen()
+    board = ZobristBoard()
+    board.turn = chess.BLACK
+    board.rehash()
+    assert board.zobrist == zobrist_hash(board)
+    print("✅ Direct board edits recompute the hash")
+
+def test_transposition_table():
+    print("\nTesting transposition table")
+    print("=" * 50)
+
+    board = ZobristBoard()
+    table = TranspositionTable(board)
+    root = table.add(board.zobrist)
+
+    # Two move orders reaching the same position
+    for line in (["g1f3", "g8f6", "b1c3"], ["b1c3", "g8f6", "g1f3"]):
+        b = board.copy()
+        idx = root
+        for uci in line:
+            move = chess.Move.from_uci(uci)
+            b.push(move)
+            idx = table.add(b.zobrist, idx, move)
+
+    assert len(table) == 6
+    fen = table.fen(5)
+    assert table.fen_to_idx[fen] == 5
+    assert table.idx_to_fen[0] == chess.STARTING_FEN
+    print(f"✅ Transposition shared: {len(table)} nodes, lazy FEN {fen}")
+
+def test_move_graph_lookups():
+    print("\nTesting move graph FEN views")
+    print("=" * 50)
+
+    board = chess.Board()
+    adj_list, fen_to_idx, idx_to_fen, move_tree = generate_move_graph(board, depth=3)
+    assert fen_to_idx[board.fen()] == 0
+    assert len(fen_to_idx) == len(idx_to_fen) == len(adj_list)
+    for move in board.legal_moves:
+        board.push(move)
+        assert fen_to_idx[board.fen()] in adj_list[0]
+        board.pop()
+    print(f"✅ Depth 3 graph: {len(adj_list)} nodes, root children resolved by FEN")
+
+if __name__ == "__main__":
+    test_incremental_hash()
+    test_transposition_table()
+    test_move_graph_lookups()